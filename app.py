@@ -1,6 +1,5 @@
 import streamlit as st
 import os
-import subprocess
 import json
 import time
 import uuid
@@ -17,6 +16,10 @@ import yaml
 from azure.storage.blob import BlobServiceClient
 from urllib.parse import quote
 import logging
+import block_upload
+import postprocess_transcript
+from local_convert_and_upload import file_sha256
+from pipeline import PipelineContext, PipelineJob, STAGES, run_pipeline
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s %(levelname)s:%(message)s')
@@ -29,17 +32,10 @@ CONNECTION_STRING = config["connection_string"]
 INPUT_CONTAINER_NAME = config["input_container_name"]
 OUTPUT_CONTAINER_NAME = config["output_container_name"]
 
-def run_pipeline_step(step):
-    try:
-        result = subprocess.run(["python", step], capture_output=True, text=True, check=True)
-        logging.info(f"Output from {step}:\n{result.stdout}")
-        return True, result.stdout
-    except subprocess.CalledProcessError as e:
-        logging.error(f"Error running {step}:")
-        logging.error(f"Return code: {e.returncode}")
-        logging.error(f"stdout: {e.stdout}")
-        logging.error(f"stderr: {e.stderr}")
-        return False, f"stdout: {e.stdout}\nstderr: {e.stderr}"
+@st.cache_resource
+def get_pipeline_context():
+    # Shared by every session for the lifetime of the Streamlit server
+    return PipelineContext(config)
 
 def get_binary_file_downloader_html(bin_file, file_label='File'):
     with open(bin_file, 'rb') as f:
@@ -81,16 +77,13 @@ def convert_mp4_to_wav(input_file, output_file):
 def upload_blob(blob_service_client, container_name, blob_name, upload_file_path):
     full_blob_name = f"{container_name}/{blob_name}"
     sanitized_blob_name = quote(full_blob_name, safe='')
-    container_client = blob_service_client.get_container_client(container_name)
-    try:
-        container_client.create_container()
-    except Exception as e:
-        logging.warning(f"Container {container_name} already exists or could not be created: {e}")
+    block_upload.ensure_container(blob_service_client, container_name)
 
     blob_client = blob_service_client.get_blob_client(container=container_name, blob=sanitized_blob_name)
     try:
         with open(upload_file_path, "rb") as data:
-            blob_client.upload_blob(data, overwrite=True)
+            block_upload.upload(blob_client, data, length=os.path.getsize(upload_file_path),
+                                **block_upload.upload_options(config))
         logging.info(f"Uploaded {upload_file_path} to {container_name}/{sanitized_blob_name}")
         return sanitized_blob_name
     except Exception as e:
@@ -183,15 +176,23 @@ def upload_page():
         st.success(f"File {uploaded_file.name} has been uploaded successfully.")
 
         if st.button("Process File"):
+            if file_type in ["WAV", "MP4"]:
+                # The same recording uploaded again is answered from the transcript cache
+                st.session_state.fingerprint = file_sha256(str(file_path))
+                cache = get_pipeline_context().transcript_cache
+                conversation_path = postprocess_transcript.conversation_path(config["download_folder"], unique_id)
+                if cache is not None and cache.restore(st.session_state.fingerprint, conversation_path):
+                    st.session_state.processing_complete = True
+                    set_page('transcript')
+                    st.experimental_rerun()
+
             blob_service_client = BlobServiceClient.from_connection_string(CONNECTION_STRING)
             sanitized_blob_name = upload_blob(blob_service_client, INPUT_CONTAINER_NAME, f"{unique_id}_{uploaded_file.name}", str(file_path))
-            with open("current_file_info.txt", "w") as file:
-                file.write(f"{unique_id},{sanitized_blob_name}")
             if file_type in ["WAV", "MP4"]:
                 set_page('process')
             elif file_type == "JSON":
                 with st.spinner("Processing JSON file..."):
-                    processed_json_path = process_json_file(str(file_path))
+                    processed_json_path = process_json_file(str(file_path), unique_id, sanitized_blob_name)
                     st.session_state.file_path = processed_json_path
                     st.session_state.processing_complete = True
                 set_page('json_transcript')
@@ -199,11 +200,8 @@ def upload_page():
                 set_page('text_transcript')
             st.experimental_rerun()
 
-def process_json_file(input_file_path):
+def process_json_file(input_file_path, unique_id, original_filename):
     try:
-        with open('current_file_info.txt', 'r') as file:
-            unique_id, original_filename = file.read().strip().split(',')
-
         output_file_name = f"{unique_id}_{original_filename}_speaker_conversation.json"
         output_file_path = os.path.join(os.path.dirname(input_file_path), output_file_name)
 
@@ -413,46 +411,47 @@ def process_page():
                 st.error("Failed to convert MP4 to WAV. Please try again.")
                 return
 
-        steps = [
-            ("Analysing File", "local_convert_and_upload.py"),
-            ("AI Transcription", "main_transcribe.py"),
-            ("Processing Results", "download_transcript.py"),
-            ("Saving Results", "postprocess_transcript.py")
-        ]
-
         start_progress = 0.2 if st.session_state.file_type == "MP4" else 0
 
-        all_steps_succeeded = True
-        for i, (step_name, script_name) in enumerate(steps):
+        job = PipelineJob(st.session_state.file_path, unique_id=st.session_state.unique_id)
+        completed_steps = []
+
+        def on_stage_start(step_name, job):
             status_text.markdown(f"<h3>{step_name}</h3>", unsafe_allow_html=True)
-            success, output = run_pipeline_step(script_name)
 
-            if not success:
-                st.error(f"Error in {step_name}:")
-                st.code(output)
-                all_steps_succeeded = False
-                break
+        def on_stage_complete(step_name, job):
+            completed_steps.append(step_name)
+            st.success(f"Completed: {step_name} ({job.timings[step_name]:.1f}s)")
+            progress_bar.progress(start_progress + len(completed_steps) * (1 - start_progress) / len(STAGES))
 
-            st.success(f"Completed: {step_name}")
-            with st.expander(f"View {step_name} Output"):
-                st.code(output)
+        all_steps_succeeded = True
+        try:
+            run_pipeline(get_pipeline_context(), job, on_stage_start=on_stage_start, on_stage_complete=on_stage_complete)
+        except Exception as e:
+            failed_step = job.stage
+            logging.error(f"Error in {failed_step}: {e}")
+            st.error(f"Error in {failed_step}:")
+            st.code(str(e))
+            all_steps_succeeded = False
 
-            progress_bar.progress(start_progress + (i + 1) * (1 - start_progress) / len(steps))
+        with st.expander("View Stage Timings"):
+            st.code("\n".join(f"{name}: {seconds:.2f}s" for name, seconds in job.timings.items()))
 
         if all_steps_succeeded:
             status_text.markdown("<h2>Pipeline completed successfully! 🎉</h2>", unsafe_allow_html=True)
             progress_bar.progress(100)
             st.session_state.processing_complete = True
 
-            # Ensure unique_id is set in session state
-            if 'unique_id' not in st.session_state or not st.session_state.unique_id:
-                with open('current_file_info.txt', 'r') as file:
-                    unique_id, _ = file.read().strip().split(',')
-                st.session_state.unique_id = unique_id
+            st.session_state.unique_id = job.unique_id
 
-            # Ensure file_path is set in session state
-            if 'file_path' not in st.session_state or not st.session_state.file_path:
-                st.session_state.file_path = os.path.join(config['local_wav_folder'], f"{unique_id}_mono_{st.session_state.file_name}")
+            # An MP4 upload is cached under its own fingerprint too, not only the converted WAV's
+            cache = get_pipeline_context().transcript_cache
+            fingerprint = st.session_state.get('fingerprint')
+            if cache is not None and fingerprint and fingerprint != job.fingerprint():
+                try:
+                    cache.put(fingerprint, job.conversation_path, transcription_id=job.transcription_id)
+                except OSError as e:
+                    logging.warning(f"Could not cache the transcript of {job.unique_id}: {e}")
 
             time.sleep(2)
             set_page('transcript')
@@ -465,8 +464,7 @@ def process_page():
         st.subheader("Debug Information")
         st.code(f"""
         Current working directory: {os.getcwd()}
-        Content of current_file_info.txt: {open('current_file_info.txt', 'r').read() if os.path.exists('current_file_info.txt') else 'File not found'}
-        Content of transcription_ids.txt: {open('transcription_ids.txt', 'r').read() if os.path.exists('transcription_ids.txt') else 'File not found'}
+        Job: unique_id={job.unique_id}, blob_name={job.blob_name}, transcription_id={job.transcription_id}
         Files in input folder: {os.listdir(config['local_wav_folder']) if os.path.exists(config['local_wav_folder']) else 'Folder not found'}
         Files in output folder: {os.listdir(config['download_folder']) if os.path.exists(config['download_folder']) else 'Folder not found'}
         Session state: {st.session_state}
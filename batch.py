@@ -0,0 +1,321 @@
+import contextlib
+import functools
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from azure.core.exceptions import ResourceNotFoundError
+
+import download_transcript
+import main_transcribe
+from block_upload import forget_container
+from ledger import JobClaimedError
+from local_convert_and_upload import CONVERTED_CONTAINER_NAME
+from pipeline import (
+    PipelineJob,
+    STAGES,
+    cache_result,
+    convert_and_upload_stage,
+    postprocess_stage,
+    restore_from_cache,
+    run_pipeline,
+    run_stage,
+)
+
+
+def resumable_batch_id(jobs):
+    """The batch id of the earlier container batch every one of `jobs` belongs to, or None."""
+    container_names = {job.container_name for job in jobs}
+    if len(container_names) != 1:
+        return None
+    container_name = container_names.pop()
+    prefix = f"{CONVERTED_CONTAINER_NAME}-"
+    if container_name is None or not container_name.startswith(prefix):
+        return None
+    return container_name[len(prefix):]
+
+
+def delete_batch_container(blob_service_client, container_name):
+    """
+    Delete a container batch's `container_name` and the recordings uploaded to it.
+
+    A failure is only logged: the transcripts are already downloaded, and a leftover container
+    costs storage but nothing else.
+    """
+    try:
+        blob_service_client.delete_container(container_name)
+        logging.info(f"Deleted container {container_name}")
+    except ResourceNotFoundError:
+        pass
+    except Exception as e:
+        logging.warning(f"Container {container_name} could not be deleted: {e}")
+        return
+    forget_container(blob_service_client, container_name)
+
+
+class BatchScheduler:
+    """
+    Push many recordings through the pipeline at once.
+
+    Each job runs its stages on a worker thread, so uploads, downloads and status checks of
+    different recordings overlap. Two limits keep that bounded:
+
+    - `conversion_workers`: size of the process pool for pydub conversions (formats the
+      streaming converter cannot read; PCM WAV is converted inline as it uploads).
+    - `max_transcriptions`: how many Speech API transcriptions may be in flight at once.
+
+    Both default to the `conversion_workers` / `max_concurrent_transcriptions` config keys.
+    Jobs are tracked in `self.jobs`, keyed by their unique_id, and in the context's job ledger.
+    """
+
+    def __init__(self, context, conversion_workers=None, max_transcriptions=None, max_jobs=None):
+        config = context.config
+        self.context = context
+        self.conversion_workers = conversion_workers or config.get("conversion_workers") or os.cpu_count()
+        self.max_transcriptions = max_transcriptions or config.get("max_concurrent_transcriptions", 10)
+        # Enough job threads to keep every conversion worker and transcription slot busy
+        self.max_jobs = max_jobs or config.get("max_concurrent_jobs") or (self.conversion_workers + self.max_transcriptions)
+        self.jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, input_file_path, unique_id=None):
+        """
+        Queue `input_file_path` for the next `run()` and return its job.
+
+        If the ledger holds an unfinished job for the file from an earlier run, that job is
+        resumed, keeping its unique_id, uploaded blob and transcription, instead of starting over.
+        """
+        ledger = self.context.ledger
+        record = ledger.unfinished(input_file_path) if unique_id is None else None
+        if record is not None:
+            job = PipelineJob.from_record(record)
+            logging.info(f"Resuming job {job.unique_id} for {input_file_path}, completed: {job.completed_stages}")
+        else:
+            job = PipelineJob(input_file_path, unique_id=unique_id or str(uuid.uuid4()))
+            ledger.add(job.unique_id, input_file_path=input_file_path)
+        with self._lock:
+            self.jobs[job.unique_id] = job
+        return job
+
+    def pending_jobs(self):
+        with self._lock:
+            return [job for job in self.jobs.values() if job.status == "Pending"]
+
+    @contextlib.contextmanager
+    def _executors(self):
+        """Attach the conversion pool and transcription slots to the context for one batch."""
+        with ProcessPoolExecutor(max_workers=self.conversion_workers) as conversion_executor, \
+                ThreadPoolExecutor(max_workers=self.max_jobs, thread_name_prefix="pipeline-job") as job_executor:
+            self.context.conversion_executor = conversion_executor
+            self.context.transcription_slots = threading.BoundedSemaphore(self.max_transcriptions)
+            try:
+                yield job_executor
+            finally:
+                self.context.conversion_executor = None
+                self.context.transcription_slots = None
+
+    def _wait_for(self, futures, on_job_done=None, finished=False):
+        """
+        Collect `futures` (future -> job) as they complete and return the jobs that succeeded.
+
+        Failed jobs are always reported to `on_job_done`; successful ones only when `finished`.
+        """
+        succeeded = []
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                future.result()
+                succeeded.append(job)
+            except Exception as e:
+                logging.error(f"Job {job.unique_id} failed in {job.stage}: {e}")
+                if on_job_done:
+                    on_job_done(job)
+                continue
+            if finished:
+                logging.info(f"Job {job.unique_id} succeeded")
+                if on_job_done:
+                    on_job_done(job)
+        return succeeded
+
+    def run(self, on_stage_start=None, on_stage_complete=None, on_job_done=None):
+        """
+        Run every pending job to completion and return `self.jobs`.
+
+        A failing job is marked "Failed" with its error and does not stop the others.
+        `on_job_done(job)` is called from the scheduling thread as each job finishes.
+        """
+        jobs = self.pending_jobs()
+        if not jobs:
+            return self.jobs
+
+        logging.info(
+            f"Running {len(jobs)} jobs with {self.conversion_workers} conversion workers, "
+            f"{self.max_transcriptions} transcription slots and {self.max_jobs} job threads"
+        )
+        with self._executors() as job_executor:
+            futures = {
+                job_executor.submit(run_pipeline, self.context, job,
+                                    on_stage_start=on_stage_start,
+                                    on_stage_complete=on_stage_complete): job
+                for job in jobs
+            }
+            self._wait_for(futures, on_job_done, finished=True)
+
+        return self.jobs
+
+    def run_container_batch(self, batch_id=None, on_stage_start=None, on_stage_complete=None, on_job_done=None):
+        """
+        Run every pending job through a single container-level transcription and return `self.jobs`.
+
+        The recordings are uploaded to their own `convertedinput-<batch_id>` container, since the
+        Speech API transcribes everything in a content container and cannot filter by prefix.
+        One transcription is created for that container, and its results are fanned back out to
+        the jobs by unique_id before each job is postprocessed.
+
+        When every job was part of the same earlier, interrupted batch, that batch is resumed: its
+        container is reused, recordings already uploaded there are not uploaded again, and its
+        transcription is re-attached to rather than created again.
+
+        Once every job's results are downloaded, the batch container is deleted, unless the
+        `container_batch_keep_container` config key is set. It is kept while any job still lacks
+        its transcript, so that a rerun can resume the batch.
+        """
+        jobs = self.pending_jobs()
+        if not jobs:
+            return self.jobs
+
+        config = self.context.config
+        ledger = self.context.ledger
+        batch_id = batch_id or resumable_batch_id(jobs) or uuid.uuid4().hex[:12]
+        container_name = f"{CONVERTED_CONTAINER_NAME}-{batch_id}"
+        upload_name, transcribe_name, download_name, postprocess_name = [name for name, _ in STAGES]
+        logging.info(f"Running {len(jobs)} jobs as container batch {batch_id} in {container_name}")
+
+        claimed = []
+        for job in jobs:
+            try:
+                ledger.claim(job.unique_id)
+            except JobClaimedError as e:
+                job.status = "Failed"
+                job.error = str(e)
+                if on_job_done:
+                    on_job_done(job)
+                continue
+            job.status = "Running"
+            if restore_from_cache(self.context, job, on_stage_complete=on_stage_complete):
+                ledger.finish(job.unique_id)
+                job.status = "Succeeded"
+                if on_job_done:
+                    on_job_done(job)
+                continue
+            claimed.append(job)
+        jobs = claimed
+        if not jobs:
+            return self.jobs
+
+        with self._executors() as job_executor:
+            upload = functools.partial(convert_and_upload_stage, container_name=container_name)
+            jobs = self._wait_for({
+                job_executor.submit(run_stage, self.context, job, upload_name, upload,
+                                    on_stage_start, on_stage_complete): job
+                for job in jobs
+            }, on_job_done)
+
+        if not jobs:
+            return self.jobs
+
+        def record_transcription_id(transcription_id):
+            for job in jobs:
+                ledger.update(job.unique_id, transcription_id=transcription_id)
+
+        # Set when every job was recorded against the same transcription by an earlier run
+        earlier_transcription_ids = {job.transcription_id for job in jobs}
+
+        def transcribe_batch():
+            transcription_id = main_transcribe.transcribe_container(
+                config, container_name, api=self.context.transcriptions_api,
+                max_retries=config.get("container_batch_max_status_checks", 720),
+                wait_for_transcription=functools.partial(
+                    self.context.wait_for_transcription,
+                    audio_duration=sum(job.audio_duration or 0 for job in jobs),
+                ),
+                on_created=record_transcription_id,
+                transcription_id=earlier_transcription_ids.pop() if len(earlier_transcription_ids) == 1 else None,
+            )
+            for job in jobs:
+                job.transcription_id = transcription_id
+
+        def download_batch():
+            transcript_paths = download_transcript.download_container_results(
+                config, jobs[0].transcription_id,
+                {job.blob_name: job.unique_id for job in jobs},
+                blob_service_client=self.context.blob_service_client,
+            )
+            for job in jobs:
+                job.transcript_path = transcript_paths.get(job.unique_id)
+
+        for name, batch_stage in ((transcribe_name, transcribe_batch), (download_name, download_batch)):
+            jobs = self._run_batch_stage(jobs, name, batch_stage, on_stage_start, on_stage_complete, on_job_done)
+
+        for job in jobs:
+            if job.transcript_path is None:
+                job.status = "Failed"
+                job.error = f"No transcript found in container batch {batch_id}"
+                ledger.fail(job.unique_id, download_name, job.error)
+                if on_job_done:
+                    on_job_done(job)
+        if jobs and all(job.status != "Failed" for job in jobs):
+            if config.get("container_batch_keep_container", False):
+                logging.info(f"Keeping container {container_name} (container_batch_keep_container)")
+            else:
+                delete_batch_container(self.context.blob_service_client, container_name)
+        jobs = [job for job in jobs if job.status != "Failed"]
+
+        for job in jobs:
+            try:
+                run_stage(self.context, job, postprocess_name, postprocess_stage, on_stage_start, on_stage_complete)
+                ledger.finish(job.unique_id)
+                job.status = "Succeeded"
+                cache_result(self.context, job)
+                logging.info(f"Job {job.unique_id} succeeded")
+            except Exception as e:
+                logging.error(f"Job {job.unique_id} failed in {job.stage}: {e}")
+            if on_job_done:
+                on_job_done(job)
+
+        return self.jobs
+
+    def _run_batch_stage(self, jobs, name, batch_stage, on_stage_start=None, on_stage_complete=None, on_job_done=None):
+        """Run `batch_stage()` once on behalf of all `jobs`, which share its timing and outcome."""
+        ledger = self.context.ledger
+        for job in jobs:
+            job.stage = name
+            ledger.start_stage(job.unique_id, name)
+            if on_stage_start:
+                on_stage_start(name, job)
+        start = time.perf_counter()
+        try:
+            batch_stage()
+        except Exception as e:
+            logging.error(f"Stage '{name}' failed for {len(jobs)} jobs: {e}")
+            for job in jobs:
+                job.status = "Failed"
+                job.error = str(e)
+                job.timings[name] = time.perf_counter() - start
+                ledger.fail(job.unique_id, name, job.error, job.timings[name])
+                if on_job_done:
+                    on_job_done(job)
+            return []
+        elapsed = time.perf_counter() - start
+        logging.info(f"Stage '{name}' for {len(jobs)} jobs took {elapsed:.2f}s")
+        for job in jobs:
+            job.timings[name] = elapsed
+            if name not in job.completed_stages:
+                job.completed_stages.append(name)
+            ledger.complete_stage(job.unique_id, name, elapsed, **job.ledger_fields())
+            if on_stage_complete:
+                on_stage_complete(name, job)
+        return jobs
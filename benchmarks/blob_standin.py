@@ -0,0 +1,240 @@
+"""
+A small in-memory stand-in for the Azure Blob service, for benchmarks and local experiments.
+
+It speaks just enough of the Blob REST API for the SDK calls this project makes: create
+container, put blob, stage block / get block list / commit block list, get blob (with ranges),
+get properties (with metadata), list blobs and delete blob. Authentication is not checked. Each request can be
+slowed down by a fixed latency and a per-connection bandwidth cap to mimic a real network.
+
+    with BlobStandIn(latency=0.02, bandwidth=50 * 1024 * 1024) as standin:
+        client = BlobServiceClient.from_connection_string(standin.connection_string)
+"""
+import base64
+import hashlib
+import threading
+import time
+import uuid
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+from xml.etree import ElementTree
+
+ACCOUNT_NAME = "devstoreaccount1"
+# The well-known development storage key; the stand-in never checks signatures
+ACCOUNT_KEY = "Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw=="
+
+
+class _Blob:
+
+    def __init__(self, data, metadata=None):
+        self.data = data
+        self.metadata = metadata or {}
+        self.etag = f'"0x{uuid.uuid4().hex[:16].upper()}"'
+        self.content_md5 = base64.b64encode(hashlib.md5(data).digest()).decode("ascii")
+        self.last_modified = formatdate(usegmt=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _parse(self):
+        url = urlparse(self.path)
+        parts = [unquote(part) for part in url.path.lstrip("/").split("/", 2)]
+        container = parts[1] if len(parts) > 1 else None
+        blob = parts[2] if len(parts) > 2 else None
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        return container, blob, query
+
+    def _body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def _delay(self, size):
+        standin = self.server.standin
+        time.sleep(standin.latency + (size / standin.bandwidth if standin.bandwidth else 0))
+
+    def _respond(self, status, body=b"", headers=None, error_code=None):
+        self.send_response(status)
+        self.send_header("x-ms-request-id", str(uuid.uuid4()))
+        self.send_header("x-ms-version", "2021-08-06")
+        if error_code:
+            self.send_header("x-ms-error-code", error_code)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _blob_headers(self, blob):
+        return {"ETag": blob.etag, "Last-Modified": blob.last_modified, "Content-MD5": blob.content_md5}
+
+    def _metadata(self):
+        return {name: value for name, value in self.headers.items() if name.lower().startswith("x-ms-meta-")}
+
+    def do_PUT(self):
+        standin = self.server.standin
+        container, blob_name, query = self._parse()
+        body = self._body()
+        self._delay(len(body))
+        standin.requests[query.get("comp") or query.get("restype") or "blob"] += 1
+
+        with standin.lock:
+            if blob_name is None:
+                if container in standin.containers:
+                    return self._respond(409, error_code="ContainerAlreadyExists")
+                standin.containers[container] = {}
+                standin.staged[container] = {}
+                return self._respond(201, headers={"ETag": '"0x1"', "Last-Modified": formatdate(usegmt=True)})
+            if container not in standin.containers:
+                return self._respond(404, error_code="ContainerNotFound")
+
+            blobs = standin.containers[container]
+            staged = standin.staged[container].setdefault(blob_name, {})
+            if query.get("comp") == "block":
+                if standin.fail_after_blocks is not None and standin.blocks_staged >= standin.fail_after_blocks:
+                    return self._respond(500, error_code="InternalError")
+                standin.blocks_staged += 1
+                staged[query["blockid"]] = body
+                return self._respond(201, headers={"Content-MD5": base64.b64encode(hashlib.md5(body).digest()).decode()})
+            if query.get("comp") == "blocklist":
+                block_ids = [element.text for element in ElementTree.fromstring(body)]
+                if any(block_id not in staged for block_id in block_ids):
+                    return self._respond(400, error_code="InvalidBlockList")
+                blob = blobs[blob_name] = _Blob(b"".join(staged[block_id] for block_id in block_ids), self._metadata())
+                standin.staged[container].pop(blob_name, None)
+                return self._respond(201, headers=self._blob_headers(blob))
+            blob = blobs[blob_name] = _Blob(body, self._metadata())
+            return self._respond(201, headers=self._blob_headers(blob))
+
+    def do_GET(self):
+        standin = self.server.standin
+        container, blob_name, query = self._parse()
+        standin.requests["get_" + (query.get("comp") or "blob")] += 1
+
+        with standin.lock:
+            if container not in standin.containers:
+                self._delay(0)
+                return self._respond(404, error_code="ContainerNotFound")
+            blobs = standin.containers[container]
+
+            if blob_name is None and query.get("comp") == "list":
+                prefix = query.get("prefix", "")
+                items = "".join(
+                    f"<Blob><Name>{name}</Name><Properties><Content-Length>{len(blob.data)}</Content-Length>"
+                    f"<Etag>{blob.etag}</Etag><Last-Modified>{blob.last_modified}</Last-Modified>"
+                    f"<BlobType>BlockBlob</BlobType></Properties></Blob>"
+                    for name, blob in sorted(blobs.items()) if name.startswith(prefix)
+                )
+                body = (f'<?xml version="1.0" encoding="utf-8"?><EnumerationResults ContainerName="{container}">'
+                        f"<Prefix>{prefix}</Prefix><Blobs>{items}</Blobs><NextMarker /></EnumerationResults>").encode()
+                self._delay(len(body))
+                return self._respond(200, body, {"Content-Type": "application/xml"})
+
+            if query.get("comp") == "blocklist":
+                staged = standin.staged[container].get(blob_name)
+                if blob_name not in blobs and not staged:
+                    self._delay(0)
+                    return self._respond(404, error_code="BlobNotFound")
+                blocks = "".join(
+                    f"<Block><Name>{block_id}</Name><Size>{len(data)}</Size></Block>"
+                    for block_id, data in (staged or {}).items()
+                )
+                body = (f'<?xml version="1.0" encoding="utf-8"?><BlockList><CommittedBlocks />'
+                        f"<UncommittedBlocks>{blocks}</UncommittedBlocks></BlockList>").encode()
+                self._delay(len(body))
+                return self._respond(200, body, {"Content-Type": "application/xml"})
+
+            blob = blobs.get(blob_name)
+        if blob is None:
+            self._delay(0)
+            return self._respond(404, error_code="BlobNotFound")
+        self._send_blob(blob)
+
+    def _send_blob(self, blob):
+        data = blob.data
+        headers = dict(self._blob_headers(blob), **{"x-ms-blob-type": "BlockBlob", "Accept-Ranges": "bytes"}, **blob.metadata)
+        byte_range = self.headers.get("x-ms-range") or self.headers.get("Range")
+        status = 200
+        if byte_range:
+            start, _, end = byte_range.split("=", 1)[1].partition("-")
+            start, end = int(start), min(int(end) if end else len(data) - 1, len(data) - 1)
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+            data = data[start:end + 1]
+            status = 206
+        self._delay(len(data) if self.command != "HEAD" else 0)
+        self._respond(status, data, headers)
+
+    def do_HEAD(self):
+        standin = self.server.standin
+        container, blob_name, _ = self._parse()
+        standin.requests["head"] += 1
+        with standin.lock:
+            blob = standin.containers.get(container, {}).get(blob_name)
+        if blob is None:
+            self._delay(0)
+            return self._respond(404, error_code="BlobNotFound")
+        self._send_blob(blob)
+
+    def do_DELETE(self):
+        standin = self.server.standin
+        container, blob_name, _ = self._parse()
+        self._delay(0)
+        standin.requests["delete"] += 1
+        with standin.lock:
+            if standin.containers.get(container, {}).pop(blob_name, None) is None:
+                return self._respond(404, error_code="BlobNotFound")
+        self._respond(202)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Counter(dict):
+
+    def __missing__(self, key):
+        return 0
+
+
+class BlobStandIn:
+    """
+    In-memory blob service on a local port.
+
+    `latency` (seconds) and `bandwidth` (bytes per second per request) shape every request.
+    `fail_after_blocks` makes Put Block fail once that many blocks have been staged, to
+    simulate an interrupted upload. `requests` counts requests by kind.
+    """
+
+    def __init__(self, latency=0.0, bandwidth=None, fail_after_blocks=None, port=0):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.fail_after_blocks = fail_after_blocks
+        self.blocks_staged = 0
+        self.containers = {}
+        self.staged = {}
+        self.requests = _Counter()
+        self.lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self._server.daemon_threads = True
+        self._server.standin = self
+        self._thread = None
+
+    @property
+    def connection_string(self):
+        port = self._server.server_address[1]
+        return (f"DefaultEndpointsProtocol=http;AccountName={ACCOUNT_NAME};AccountKey={ACCOUNT_KEY};"
+                f"BlobEndpoint=http://127.0.0.1:{port}/{ACCOUNT_NAME};")
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="blob-standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
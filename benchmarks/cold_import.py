@@ -0,0 +1,74 @@
+"""
+Cold-import cost of the generated Speech API client, each sample in a fresh interpreter: loading
+every API and model module (what `import swagger_client` did before the package became lazy)
+against importing the package and touching only what main_transcribe uses.
+
+    python benchmarks/cold_import.py --repeat 20
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+CLIENT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "python-client-generated",
+                           "python-client")
+
+TIMED = """
+import sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+print(elapsed, sum(1 for name in sys.modules if name.startswith("swagger_client")))
+"""
+
+SCENARIOS = [
+    ("every api and model", """
+import swagger_client
+for name in swagger_client.__all__:
+    getattr(swagger_client, name)
+"""),
+    ("main_transcribe's names", """
+import swagger_client
+swagger_client.ApiClient, swagger_client.Configuration, swagger_client.rest.ApiException
+swagger_client.CustomSpeechTranscriptionsApi, swagger_client.Transcription
+swagger_client.TranscriptionProperties, swagger_client.DiarizationProperties
+swagger_client.DiarizationSpeakersProperties
+"""),
+    ("import swagger_client", """
+import swagger_client
+"""),
+]
+
+
+def sample(code):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [CLIENT_PATH, os.environ.get("PYTHONPATH")])))
+    output = subprocess.run([sys.executable, "-c", TIMED.format(code=code)], env=env, check=True,
+                            capture_output=True, text=True).stdout.split()
+    return float(output[0]), int(output[1])
+
+
+def run(repeat):
+    for _, code in SCENARIOS:
+        sample(code)  # write the .pyc files, so every timed run is a cold start of a warm install
+
+    baseline = None
+    print(f"{'scenario':<26}{'median':>10}{'best':>10}{'modules':>9}")
+    for label, code in SCENARIOS:
+        samples = [sample(code) for _ in range(repeat)]
+        times = [elapsed for elapsed, _ in samples]
+        median = statistics.median(times)
+        baseline = baseline or median
+        print(f"{label:<26}{median * 1e3:>8.1f}ms{min(times) * 1e3:>8.1f}ms{samples[0][1]:>9}"
+              f"   {baseline / median:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Deserializing a page of transcriptions: the generated recursive ApiClient.__deserialize, which
+re-parses type strings and walks swagger_types for every value, against the compiled and
+memoized per-type plans ApiClient now uses. Both produce equal models.
+
+    python benchmarks/deserializer_plan.py --entries 1000 --repeat 5
+"""
+import argparse
+import datetime
+import json
+import re
+import time
+
+from speech_payloads import Response, paginated_transcriptions
+
+import six
+import swagger_client
+import swagger_client.models
+from swagger_client import ApiClient
+
+
+def generated_deserialize(data, klass):
+    """ApiClient.__deserialize as generated by swagger-codegen."""
+    if data is None:
+        return None
+
+    if type(klass) == str:
+        if klass.startswith('list['):
+            sub_kls = re.match(r'list\[(.*)\]', klass).group(1)
+            return [generated_deserialize(sub_data, sub_kls) for sub_data in data]
+
+        if klass.startswith('dict('):
+            sub_kls = re.match(r'dict\(([^,]*), (.*)\)', klass).group(2)
+            return {k: generated_deserialize(v, sub_kls) for k, v in six.iteritems(data)}
+
+        if klass in ApiClient.NATIVE_TYPES_MAPPING:
+            klass = ApiClient.NATIVE_TYPES_MAPPING[klass]
+        else:
+            klass = getattr(swagger_client.models, klass)
+
+    if klass in ApiClient.PRIMITIVE_TYPES:
+        try:
+            return klass(data)
+        except TypeError:
+            return data
+    elif klass == object:
+        return data
+    elif klass == datetime.date:
+        from dateutil.parser import parse
+        return parse(data).date()
+    elif klass == datetime.datetime:
+        from dateutil.parser import parse
+        return parse(data)
+
+    if not klass.swagger_types and 'get_real_child_model' not in klass.__dict__:
+        return data
+    kwargs = {}
+    for attr, attr_type in six.iteritems(klass.swagger_types):
+        if data is not None and klass.attribute_map[attr] in data and isinstance(data, (list, dict)):
+            kwargs[attr] = generated_deserialize(data[klass.attribute_map[attr]], attr_type)
+    return klass(**kwargs)
+
+
+def best_of(repeat, deserialize):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = deserialize()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run(entries, repeat):
+    client = ApiClient()
+    response = Response(paginated_transcriptions(entries))
+
+    generated, expected = best_of(repeat, lambda: generated_deserialize(json.loads(response.data),
+                                                                       "PaginatedTranscriptions"))
+    compiled, page = best_of(repeat, lambda: client.deserialize(response, "PaginatedTranscriptions"))
+    assert page == expected, "compiled plan deserialized a different page"
+
+    print(f"PaginatedTranscriptions, {entries} entries, best of {repeat}")
+    for label, elapsed in (("generated __deserialize", generated), ("compiled plan", compiled)):
+        print(f"{label:<24} {elapsed * 1000:8.1f} ms {elapsed / entries * 1e6:8.2f} us/transcription")
+    print(f"speedup {generated / compiled:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.entries, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
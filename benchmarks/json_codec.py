@@ -0,0 +1,111 @@
+"""
+JSON handling in the Speech API client: the generated path (decode the body to str, then
+json.loads; sanitize_for_serialization, then json.dumps) against the codecs in
+swagger_client.codec, which parse straight from the response bytes. Payloads are a page of
+transcriptions and a transcription's file listing; the request side serializes transcription
+models.
+
+    python benchmarks/json_codec.py --transcriptions 1000 --files 5000 --repeat 5
+"""
+import argparse
+import json
+import time
+
+from speech_payloads import paginated_files, paginated_transcriptions
+
+import swagger_client
+from swagger_client import codec
+
+
+class BytesResponse:
+    """A preloaded response whose body is still the bytes read off the socket."""
+
+    def __init__(self, raw_data):
+        self.raw_data = raw_data
+
+    @property
+    def data(self):
+        return self.raw_data.decode("utf8")
+
+
+class DecodedResponse:
+    """A preloaded response as the generated client kept it: the body decoded to str."""
+
+    def __init__(self, raw_data):
+        self.data = raw_data.decode("utf8")
+
+
+def best_of(repeat, function):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def codecs():
+    available = [codec.StdlibJsonCodec()]
+    if codec.orjson is not None:
+        available.append(codec.OrjsonCodec())
+    else:
+        print("orjson is not installed; only the standard library codec is measured")
+    return available
+
+
+def report(label, baseline, timings):
+    print(label)
+    print(f"  {'generated':<10} {baseline * 1000:8.2f} ms")
+    for name, elapsed in timings:
+        print(f"  {name:<10} {elapsed * 1000:8.2f} ms  {baseline / elapsed:5.1f}x")
+
+
+def run(transcriptions, files, repeat):
+    client = swagger_client.ApiClient()
+    for label, body, response_type in (
+        (f"PaginatedTranscriptions, {transcriptions} entries", paginated_transcriptions(transcriptions),
+         "PaginatedTranscriptions"),
+        (f"PaginatedFiles, {files} entries", paginated_files(files), "PaginatedFiles"),
+    ):
+        raw = json.dumps(body).encode("utf8")
+        print(f"{label}: {len(raw) / 1024:.0f} KiB")
+        report("  parse", best_of(repeat, lambda: json.loads(raw.decode("utf8"))), [
+            (json_codec.name, best_of(repeat, lambda: json_codec.loads(raw))) for json_codec in codecs()
+        ])
+
+        def deserialize_with(json_codec):
+            client.configuration.json_codec = json_codec
+            return best_of(repeat, lambda: client.deserialize(BytesResponse(raw), response_type))
+
+        client.configuration.json_codec = codec.StdlibJsonCodec()
+        generated = best_of(repeat, lambda: client.deserialize(DecodedResponse(raw), response_type))
+        report("  decode + parse + deserialize", generated, [
+            (json_codec.name, deserialize_with(json_codec)) for json_codec in codecs()
+        ])
+
+    client.configuration.json_codec = codec.StdlibJsonCodec()
+    models = client.deserialize(BytesResponse(json.dumps(paginated_transcriptions(transcriptions)).encode("utf8")),
+                                "PaginatedTranscriptions").values
+    timings = []
+    for json_codec in codecs():
+        if json_codec.serializes_models:
+            timings.append((json_codec.name, best_of(repeat, lambda: json_codec.dumps(models))))
+        else:
+            timings.append((json_codec.name, best_of(
+                repeat, lambda: json_codec.dumps(client.sanitize_for_serialization(models)).encode("utf8"))))
+    report(f"request body, {transcriptions} Transcription models",
+           best_of(repeat, lambda: json.dumps(client.sanitize_for_serialization(models))), timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transcriptions", type=int, default=1000)
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.transcriptions, args.files, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Cost of one status poll's response: a full Transcription model graph (through the generated
+recursive deserializer and through the compiled plans) against the lightweight modes of
+ApiClient.set_lightweight_response, a (self, status) record and the plain JSON dict.
+Time is per response; allocations are the memory blocks still referenced by the result.
+
+    python benchmarks/lightweight_responses.py --polls 20000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from deserializer_plan import generated_deserialize
+from speech_payloads import Response, transcription
+
+import swagger_client
+
+MODES = (
+    ("Transcription model", None),
+    ("(self, status) record", ("self", "status")),
+    ("plain dict", False),
+)
+
+
+def client_for(fields):
+    client = swagger_client.ApiClient()
+    if fields is not None:
+        client.set_lightweight_response("GET", "/transcriptions/{id}", "Transcription",
+                                        fields=fields or None)
+    return client
+
+
+def run(polls):
+    response = Response(transcription(0))
+    results = {}
+
+    start = time.perf_counter()
+    for _ in range(polls):
+        generated_deserialize(json.loads(response.data), "Transcription")
+    generated = (time.perf_counter() - start) / polls
+    print(f"{'generated __deserialize':<24} {generated * 1e6:8.2f} us/poll")
+    for label, fields in MODES:
+        client = client_for(fields)
+        response_type = client.lightweight_responses.get(("GET", "/transcriptions/{id}"), "Transcription")
+        client.deserialize(response, response_type)
+
+        start = time.perf_counter()
+        for _ in range(polls):
+            client.deserialize(response, response_type)
+        elapsed = (time.perf_counter() - start) / polls
+
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        result = client.deserialize(response, response_type)
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        stats = after.compare_to(before, "filename")
+        blocks = sum(stat.count_diff for stat in stats)
+        size = sum(stat.size_diff for stat in stats)
+        assert result.status == "Succeeded" if fields is not False else result["status"] == "Succeeded"
+        results[label] = elapsed
+        print(f"{label:<24} {elapsed * 1e6:8.2f} us/poll {blocks:6d} blocks {size / 1024:7.1f} KiB retained")
+    for baseline, elapsed in (("generated", generated), ("compiled model", results[MODES[0][0]])):
+        print(f"vs {baseline}: record {elapsed / results[MODES[1][0]]:.1f}x, "
+              f"plain dict {elapsed / results[MODES[2][0]]:.1f}x faster")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--polls", type=int, default=20000)
+    args = parser.parse_args()
+    run(args.polls)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Per-object cost of deserializing Speech API models: each model building its own
+Configuration() (as the generated code did) against models sharing Configuration.get_default().
+
+    python benchmarks/model_configuration.py --entries 1000 --repeat 5
+"""
+import argparse
+import time
+
+from speech_payloads import Response, paginated_transcriptions
+
+import swagger_client
+from swagger_client.configuration import Configuration
+
+
+def objects_per_page(page):
+    """Model instances in a deserialized PaginatedTranscriptions page."""
+    count = 1
+    for transcription in page.values:
+        count += 1 + sum(1 for nested in (transcription.links, transcription.properties, transcription.model,
+                                          transcription.properties.diarization,
+                                          transcription.properties.diarization.speakers)
+                         if nested is not None)
+    return count
+
+
+def best_of(repeat, deserialize):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        page = deserialize()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, page
+
+
+def run(entries, repeat):
+    client = swagger_client.ApiClient()
+    response = Response(paginated_transcriptions(entries))
+
+    def deserialize():
+        return client.deserialize(response, "PaginatedTranscriptions")
+
+    get_default = Configuration.get_default
+    Configuration.get_default = classmethod(lambda cls: Configuration())
+    try:
+        fresh, page = best_of(repeat, deserialize)
+    finally:
+        Configuration.get_default = get_default
+    shared, page = best_of(repeat, deserialize)
+
+    objects = objects_per_page(page)
+    print(f"PaginatedTranscriptions, {entries} entries, {objects} model objects, best of {repeat}")
+    for label, elapsed in (("Configuration() per model", fresh), ("shared Configuration", shared)):
+        print(f"{label:<28} {elapsed * 1000:8.1f} ms {elapsed / objects * 1e6:8.2f} us/object")
+    print(f"speedup {fresh / shared:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.entries, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Listing every transcription of a resource with a long history: the old main_transcribe._paginate
+driven by list() (every page requested in turn, all models kept) against swagger_client.Paginator,
+with and without prefetching the next page. Pages come from a local stand-in for the service that
+answers after --latency seconds; each item then costs --work seconds of processing, like the
+per-transcription checks of the pipeline. Reports wall time and the traced peak memory.
+
+    python benchmarks/pagination.py --transcriptions 10000 --page-size 100 --latency 0.05
+"""
+import argparse
+import time
+import tracemalloc
+from urllib.parse import parse_qsl, urlparse
+
+from speech_payloads import HOST, Response, transcription
+
+import swagger_client
+
+
+class ServiceStandIn:
+    """The transport of an ApiClient: pages of `total` transcriptions windowed by skip/top."""
+
+    total = 0
+    latency = 0.0
+
+    def __init__(self, configuration):
+        self.requests = 0
+
+    def GET(self, url, query_params=None, headers=None, _preload_content=True, _request_timeout=None):
+        params = dict(parse_qsl(urlparse(url).query))
+        params.update(query_params or [])
+        skip, top = int(params.get("skip", 0)), int(params.get("top", 100))
+        self.requests += 1
+        time.sleep(self.latency)
+        body = {"values": [transcription(index) for index in range(skip, min(skip + top, self.total))]}
+        if skip + top < self.total:
+            body["@nextLink"] = f"{HOST}/transcriptions?skip={skip + top}&top={top}"
+        return Response(body)
+
+
+class StandInApiClient(swagger_client.ApiClient):
+    rest_client_class = ServiceStandIn
+
+
+def generated_paginate(api, paginated_object):
+    """main_transcribe._paginate before swagger_client.Paginator."""
+    yield from paginated_object.values
+    typename = type(paginated_object).__name__
+    while paginated_object.next_link:
+        link = paginated_object.next_link[len(api.api_client.configuration.host):]
+        paginated_object, status, headers = api.api_client.call_api(
+            link, "GET", response_type=typename, auth_settings=["api_key"])
+        yield from paginated_object.values
+
+
+def measure(label, listing, work):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = 0
+    for _ in listing():
+        count += 1
+        if work:
+            time.sleep(work)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<32}{count:>8}{elapsed:>9.2f}s{peak / 2 ** 20:>10.1f} MiB")
+
+
+def run(transcriptions, page_size, latency, work):
+    ServiceStandIn.total = transcriptions
+    ServiceStandIn.latency = latency
+    configuration = swagger_client.Configuration()
+    configuration.host = HOST
+    api = swagger_client.CustomSpeechTranscriptionsApi(api_client=StandInApiClient(configuration))
+
+    print(f"{'listing':<32}{'items':>8}{'time':>10}{'peak':>14}")
+    measure("list(_paginate(...))", lambda: list(generated_paginate(api, api.transcriptions_list(top=page_size))),
+            work)
+    measure("Paginator, prefetch=False",
+            lambda: swagger_client.Paginator(api.transcriptions_list, page_size=page_size, prefetch=False), work)
+    measure("Paginator", lambda: swagger_client.Paginator(api.transcriptions_list, page_size=page_size), work)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transcriptions", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--work", type=float, default=0.0005)
+    args = parser.parse_args()
+    run(args.transcriptions, args.page_size, args.latency, args.work)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Speech API response bodies for the swagger_client benchmarks: pages of transcriptions and
+file listings shaped like the service's, and a stand-in for the REST response they arrive in.
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "python-client-generated",
+                                "python-client"))
+
+HOST = "https://westeurope.api.cognitive.microsoft.com/speechtotext/v3.1"
+
+
+def transcription(index):
+    transcription_id = f"{index:08x}-0000-4000-8000-000000000000"
+    return {
+        "self": f"{HOST}/transcriptions/{transcription_id}",
+        "model": {"self": f"{HOST}/models/base/4b5a8b9c-0000-4000-8000-000000000000"},
+        "links": {"files": f"{HOST}/transcriptions/{transcription_id}/files"},
+        "properties": {
+            "diarizationEnabled": True,
+            "wordLevelTimestampsEnabled": True,
+            "displayFormWordLevelTimestampsEnabled": True,
+            "channels": [0, 1],
+            "punctuationMode": "DictatedAndAutomatic",
+            "profanityFilterMode": "Masked",
+            "duration": "PT12M31.52S",
+            "diarization": {"speakers": {"minCount": 1, "maxCount": 5}},
+        },
+        "lastActionDateTime": "2024-03-01T10:15:42Z",
+        "status": "Succeeded",
+        "createdDateTime": "2024-03-01T10:12:07Z",
+        "locale": "en-US",
+        "displayName": "Simple transcription",
+        "description": "Simple transcription description",
+        "customProperties": {"unique_id": transcription_id},
+    }
+
+
+def file(index, transcription_id="0000abcd-0000-4000-8000-000000000000"):
+    file_id = f"{index:08x}-1111-4000-8000-000000000000"
+    return {
+        "self": f"{HOST}/transcriptions/{transcription_id}/files/{file_id}",
+        "name": f"contenturl_{index}.json",
+        "kind": "Transcription",
+        "properties": {"size": 48213 + index},
+        "createdDateTime": "2024-03-01T10:15:41Z",
+        "links": {"contentUrl": f"https://spsvcprodweu.blob.core.windows.net/bestor-0000/TranscriptionData/"
+                                f"{transcription_id}_{index}_0.json?skoid=0000&sktid=0000&sv=2021-08-06&sig=abc"},
+    }
+
+
+def paginated_transcriptions(count):
+    return {
+        "values": [transcription(index) for index in range(count)],
+        "@nextLink": f"{HOST}/transcriptions?skip={count}&top={count}",
+    }
+
+
+def paginated_files(count):
+    return {"values": [file(index) for index in range(count)]}
+
+
+class Response:
+    """What ApiClient.deserialize reads: a preloaded REST response."""
+
+    status = 200
+    reason = "OK"
+
+    def __init__(self, body):
+        self.data = json.dumps(body)
+
+    def getheaders(self):
+        return {"Content-Type": "application/json"}
+
+    def getheader(self, name, default=None):
+        return self.getheaders().get(name, default)
@@ -0,0 +1,216 @@
+import hashlib
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from azure.storage.blob import BlobBlock
+
+MiB = 1024 * 1024
+
+DEFAULT_BLOCK_SIZE = 8 * MiB
+DEFAULT_MAX_CONCURRENCY = 4
+# Uploads larger than this are staged block by block (and can be resumed)
+DEFAULT_BULK_THRESHOLD = 64 * MiB
+
+
+# (account url, container name) pairs known to exist, shared by every upload in the process
+_known_containers = set()
+_known_containers_lock = threading.Lock()
+
+
+class UploadVerificationError(Exception):
+    """The service's response does not match what was sent."""
+
+
+def ensure_container(blob_service_client, container_name):
+    """
+    Create `container_name` unless this process has already seen it exist.
+
+    Only the first upload to a container pays for the create_container() round trip.
+    """
+    key = (blob_service_client.url, container_name)
+    with _known_containers_lock:
+        if key in _known_containers:
+            return
+    try:
+        blob_service_client.get_container_client(container_name).create_container()
+        logging.info(f"Created container {container_name}")
+    except ResourceExistsError:
+        pass
+    except Exception as e:
+        logging.warning(f"Container {container_name} could not be created: {e}")
+        return
+    with _known_containers_lock:
+        _known_containers.add(key)
+
+
+def forget_container(blob_service_client, container_name):
+    """Drop `container_name` from the cache, e.g. after an upload found it deleted."""
+    with _known_containers_lock:
+        _known_containers.discard((blob_service_client.url, container_name))
+
+
+def _check_md5(response, md5, what):
+    """Compare the Content-MD5 the service computed for what it stored with the local digest."""
+    content_md5 = response.get("content_md5")
+    if content_md5 is not None and bytes(content_md5) != md5.digest():
+        raise UploadVerificationError(f"Content-MD5 mismatch for {what}")
+
+
+class _HashingReader:
+    """File object wrapper that hashes everything read through it."""
+
+    def __init__(self, data, md5):
+        self._data = data
+        self._md5 = md5
+
+    def read(self, size=-1):
+        chunk = self._data.read(size)
+        self._md5.update(chunk)
+        return chunk
+
+
+def _hashing(data, md5):
+    """Pass `data` (bytes, a file object or an iterable of chunks) through, hashing it on the way."""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        md5.update(data)
+        return data
+    if hasattr(data, "read"):
+        return _HashingReader(data, md5)
+    return _hashed_chunks(data, md5)
+
+
+def _hashed_chunks(chunks, md5):
+    for chunk in chunks:
+        md5.update(chunk)
+        yield chunk
+
+
+def upload_options(config):
+    """Bulk upload settings from the `upload_*` config keys, as keyword arguments for `upload()`."""
+    return {
+        "block_size": config.get("upload_block_size", DEFAULT_BLOCK_SIZE),
+        "max_concurrency": config.get("upload_max_concurrency", DEFAULT_MAX_CONCURRENCY),
+        "bulk_threshold": config.get("upload_bulk_threshold", DEFAULT_BULK_THRESHOLD),
+    }
+
+
+def iter_blocks(data, block_size):
+    """Split bytes, a file object or an iterable of byte chunks into `block_size` blocks."""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        for offset in range(0, len(data), block_size):
+            yield bytes(data[offset:offset + block_size])
+        return
+    if hasattr(data, "read"):
+        while True:
+            block = data.read(block_size)
+            if not block:
+                return
+            yield block
+    buffer = bytearray()
+    for chunk in data:
+        buffer += chunk
+        while len(buffer) >= block_size:
+            yield bytes(buffer[:block_size])
+            del buffer[:block_size]
+    if buffer:
+        yield bytes(buffer)
+
+
+def block_id(index, block):
+    """
+    Deterministic id for the `index`th block: the same data always gets the same id, so a
+    rerun can recognise blocks an interrupted upload already staged.
+    """
+    return f"{index:06d}-{hashlib.md5(block).hexdigest()}"
+
+
+def staged_blocks(blob_client):
+    """Uncommitted blocks already staged for the blob, as a block id -> size dict."""
+    try:
+        _, uncommitted = blob_client.get_block_list("uncommitted")
+    except ResourceNotFoundError:
+        return {}
+    return {block.id: block.size for block in uncommitted}
+
+
+def _stage_block(blob_client, staged_id, block):
+    response = blob_client.stage_block(staged_id, block, length=len(block))
+    _check_md5(response, hashlib.md5(block), f"block {staged_id} of {blob_client.blob_name}")
+    return response
+
+
+def upload_in_blocks(blob_client, data, block_size=DEFAULT_BLOCK_SIZE, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                     resume=True, metadata=None):
+    """
+    Upload `data` by staging `block_size` blocks on `max_concurrency` threads, then committing them.
+
+    With `resume`, blocks an earlier, interrupted attempt already staged with the same content
+    are not sent again. At most `2 * max_concurrency` blocks are held in memory at once, so
+    iterables (e.g. a conversion stream) are read lazily. Each block is checked against the
+    Content-MD5 the service returns for it. `metadata` is set on the blob when the blocks are
+    committed; it may be a function returning the dict, called only then, so that it can be
+    worked out while the blocks upload. Returns the commit response.
+    """
+    already_staged = staged_blocks(blob_client) if resume else {}
+    block_ids = []
+    reused = 0
+
+    with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="stage-block") as executor:
+        in_flight = set()
+        for index, block in enumerate(iter_blocks(data, block_size)):
+            block_ids.append(block_id(index, block))
+            if already_staged.get(block_ids[-1]) == len(block):
+                reused += 1
+                continue
+            if len(in_flight) >= 2 * max_concurrency:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            in_flight.add(executor.submit(_stage_block, blob_client, block_ids[-1], block))
+        for future in in_flight:
+            future.result()
+
+    if reused:
+        logging.info(f"Resumed upload of {blob_client.blob_name}: reused {reused} of {len(block_ids)} staged blocks")
+    return blob_client.commit_block_list([BlobBlock(block_id=staged_id) for staged_id in block_ids],
+                                         metadata=metadata() if callable(metadata) else metadata)
+
+
+def single_put_limit(blob_client, bulk_threshold=DEFAULT_BULK_THRESHOLD):
+    """
+    Largest upload sent with one `upload_blob` request: `bulk_threshold`, capped at the client's
+    `max_single_put_size`. Above that the SDK would stage blocks itself, and the Content-MD5 it
+    returns would be of the block list rather than the file.
+    """
+    max_single_put_size = getattr(getattr(blob_client, "_config", None), "max_single_put_size", None)
+    if max_single_put_size is None:
+        return bulk_threshold
+    return min(bulk_threshold, max_single_put_size)
+
+
+def upload(blob_client, data, length=None, block_size=DEFAULT_BLOCK_SIZE, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+           bulk_threshold=DEFAULT_BULK_THRESHOLD, metadata=None):
+    """
+    Upload `data` to `blob_client`, overwriting it, with `metadata` (a dict, or a function
+    returning one; see `upload_in_blocks`) on the blob.
+
+    Uploads of unknown length or larger than `bulk_threshold` (see `single_put_limit`) go through
+    `upload_in_blocks`; smaller ones use the SDK's `upload_blob`, which sends them in a single
+    request. Either way
+    the upload is verified from the response (ETag, and Content-MD5 where the service returns
+    one), so no follow-up exists() call is needed. Returns the response headers.
+    """
+    if length is None or length > single_put_limit(blob_client, bulk_threshold):
+        response = upload_in_blocks(blob_client, data, block_size=block_size, max_concurrency=max_concurrency,
+                                    metadata=metadata)
+    else:
+        md5 = hashlib.md5()
+        # One request, so there is nothing to run concurrently
+        response = blob_client.upload_blob(_hashing(data, md5), length=length, overwrite=True,
+                                           metadata=metadata() if callable(metadata) else metadata)
+        _check_md5(response, md5, blob_client.blob_name)
+    if not response.get("etag"):
+        raise UploadVerificationError(f"No ETag returned for {blob_client.blob_name}")
+    return response
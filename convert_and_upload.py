@@ -4,6 +4,8 @@ from pydub import AudioSegment
 from azure.storage.blob import BlobServiceClient, BlobClient, ContainerClient
 from datetime import datetime, timezone, timedelta
 from urllib.parse import quote
+import block_upload
+from wav_stream import UnsupportedWavError, convert_wav
 
 # Load configuration from config.yaml
 with open("config.yaml", "r") as file:
@@ -22,6 +24,16 @@ def download_blob(blob_service_client, container_name, blob_name, download_file_
     print(f"Downloaded {blob_name} to {download_file_path}")
 
 def convert_to_mono(input_file, output_file):
+    try:
+        convert_wav(input_file, output_file)
+        print(f"Converted {input_file} to mono and saved as {output_file}")
+        return
+    except UnsupportedWavError:
+        pass
+    except Exception as e:
+        print(f"Error converting {input_file} to mono: {e}")
+        return
+
     try:
         audio = AudioSegment.from_wav(input_file)
         mono_audio = audio.set_channels(1)
@@ -35,15 +47,12 @@ def upload_blob(blob_service_client, container_name, blob_name, upload_file_path
     sanitized_blob_name = quote(blob_name, safe='')
 
     # Ensure the container exists
-    container_client = blob_service_client.get_container_client(container_name)
-    try:
-        container_client.create_container()
-    except Exception as e:
-        print(f"Container {container_name} already exists or could not be created: {e}")
+    block_upload.ensure_container(blob_service_client, container_name)
 
     blob_client = blob_service_client.get_blob_client(container=container_name, blob=sanitized_blob_name)
     with open(upload_file_path, "rb") as data:
-        blob_client.upload_blob(data, overwrite=True)
+        block_upload.upload(blob_client, data, length=os.path.getsize(upload_file_path),
+                            **block_upload.upload_options(config))
     print(f"Uploaded {upload_file_path} to {container_name}/{sanitized_blob_name}")
 
 def main():
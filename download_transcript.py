@@ -1,35 +1,32 @@
+import itertools
+import json
 import yaml
-from azure.storage.blob import BlobServiceClient, generate_blob_sas, BlobSasPermissions
-from datetime import datetime, timedelta, timezone
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from azure.core.exceptions import ResourceNotFoundError
+from azure.storage.blob import BlobClient, BlobSasPermissions
 import logging
 import sys
 import requests
 import os
+from urllib.parse import urlparse, unquote
+from ledger import open_ledger
+from sas import get_sas_issuer
 
 # Configure logging
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s %(levelname)s:%(message)s')
+# Ranged reads used to stream transcripts
+DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+DOWNLOAD_MAX_CONCURRENCY = 4
 
 def load_config(config_file):
     with open(config_file, 'r') as file:
         config = yaml.safe_load(file)
     return config
 
-# Load configuration from config.yaml
-config = load_config('config.yaml')
-OUTPUT_CONTAINER_NAME = config["output_container_name"]
-
-def generate_blob_sas_url(connection_string, container_name, blob_name, permission, expiry_duration_hours):
-    blob_service_client = BlobServiceClient.from_connection_string(connection_string)
-    sas_token = generate_blob_sas(
-        account_name=blob_service_client.account_name,
-        container_name=container_name,
-        blob_name=blob_name,
-        account_key=blob_service_client.credential.account_key,
-        permission=permission,
-        expiry=datetime.now().replace(tzinfo=timezone.utc) + timedelta(hours=expiry_duration_hours)
-    )
-    sas_url = f"https://{blob_service_client.account_name}.blob.core.windows.net/{container_name}/{blob_name}?{sas_token}"
-    return sas_url
+def generate_blob_sas_url(connection_string, container_name, blob_name, permission, expiry_duration_hours, blob_service_client=None):
+    issuer = get_sas_issuer(connection_string, blob_service_client=blob_service_client)
+    return issuer.blob_sas_url(container_name, blob_name, permission, expiry_duration_hours)
 
 def download_blob(sas_url, download_file_path):
     try:
@@ -49,58 +46,198 @@ def download_blob(sas_url, download_file_path):
         logging.error(f"Response content: {e.response.content if e.response else 'N/A'}")
         raise
 
-def get_content_url_blob(connection_string, container_name):
+def transcript_blob_name(transcription_id, index=0):
+    """Name the Speech service gives the `index`th result of a transcription in the destination container."""
+    return f"{transcription_id}_contenturl_{index}.json"
+
+def get_content_url_blob(connection_string, container_name, transcription_id, blob_service_client=None):
+    """Find the first result blob of `transcription_id` with a listing limited to that job's prefix."""
     try:
-        blob_service_client = BlobServiceClient.from_connection_string(connection_string)
+        if blob_service_client is None:
+            blob_service_client = get_sas_issuer(connection_string).blob_service_client
         container_client = blob_service_client.get_container_client(container_name)
-        
-        blobs = list(container_client.list_blobs(name_starts_with=''))
-        logging.info(f"Found {len(blobs)} blobs in container {container_name}")
-        
-        for blob in blobs:
+
+        for blob in container_client.list_blobs(name_starts_with=f"{transcription_id}_"):
             if blob.name.endswith("contenturl_0.json"):
                 logging.info(f"Found content URL blob: {blob.name}")
                 return blob.name
-        
-        logging.error(f"No contenturl_0.json file found in container {container_name}")
+
+        logging.error(f"No contenturl_0.json file found for transcription {transcription_id} in container {container_name}")
         return None
     except Exception as e:
         logging.error(f"An error occurred while listing the blobs: {e}")
         return None
 
-def download_transcriptions(config):
-    try:
-        with open('current_file_info.txt', 'r') as file:
-            unique_id, blob_name = file.read().strip().split(',')
-        logging.info(f"Processing file with unique_id: {unique_id}, blob_name: {blob_name}")
+def get_transcript_content_url(api, transcription_id):
+    """Content URL of the transcript file of `transcription_id`, as reported by the Speech API."""
+    files = api.transcriptions_list_files(transcription_id, filter="kind eq 'Transcription'")
+    for file in files.values or []:
+        if file.links and file.links.content_url:
+            return file.links.content_url
+    return None
+
+def iter_blob_chunks(blob_client, chunk_size=DOWNLOAD_CHUNK_SIZE, max_concurrency=DOWNLOAD_MAX_CONCURRENCY):
+    """
+    Download a blob as ranged reads of `chunk_size` bytes, `max_concurrency` at a time, and
+    return a generator over the chunks in order.
+
+    The SDK's own `download_blob().chunks()` reads one range after another; this keeps
+    `max_concurrency` ranges in flight. The first range is fetched before this returns, so a
+    missing blob raises ResourceNotFoundError here rather than part way through iterating. At
+    most `max_concurrency` chunks are buffered ahead of the consumer. Close the generator when
+    stopping early: reads not yet started are then cancelled. An empty blob yields no chunks.
+    """
+    first = blob_client.download_blob(offset=0, length=chunk_size)
+    # properties.size is the length of the range; the blob's size is in "bytes 0-<end>/<size>"
+    size = int(first.properties.content_range.rsplit("/", 1)[1]) if first.properties.content_range else first.properties.size
+    first_chunk = first.readall()
+
+    def fetch(offset):
+        return blob_client.download_blob(offset=offset, length=min(chunk_size, size - offset)).readall()
+
+    def chunks():
+        if not first_chunk:
+            return
+        yield first_chunk
+        if size <= len(first_chunk):
+            return
+        offsets = iter(range(len(first_chunk), size, chunk_size))
+        executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="download-range")
+        pending = deque()
+        try:
+            pending.extend(executor.submit(fetch, offset) for offset in itertools.islice(offsets, max_concurrency))
+            while pending:
+                chunk = pending.popleft().result()
+                for offset in itertools.islice(offsets, 1):
+                    pending.append(executor.submit(fetch, offset))
+                yield chunk
+        finally:
+            # Closed early or a range failed: nothing more is submitted, queued reads are
+            # cancelled, and the ones already running finish without being waited for
+            executor.shutdown(wait=False, cancel_futures=True)
 
-        content_blob_name = get_content_url_blob(
-            config['connection_string'],
-            OUTPUT_CONTAINER_NAME
+    return chunks()
+
+def open_transcript(config, transcription_id, blob_service_client=None, api=None):
+    """Stream the transcript of `transcription_id`, as an iterator of byte chunks.
+
+    The transcript is read directly by its name in the output container,
+    `<transcription_id>_contenturl_0.json`, so the cost does not grow with the number of
+    earlier results there. If it is not under that name, the Speech API's file list (when
+    `api` is given) and then a listing of the job's own prefix are used to find it.
+    Returns None if it cannot be found.
+    """
+    output_container_name = config["output_container_name"]
+    if blob_service_client is None:
+        blob_service_client = get_sas_issuer(config['connection_string']).blob_service_client
+    options = {
+        "chunk_size": config.get("download_chunk_size", DOWNLOAD_CHUNK_SIZE),
+        "max_concurrency": config.get("download_max_concurrency", DOWNLOAD_MAX_CONCURRENCY),
+    }
+
+    try:
+        return iter_blob_chunks(
+            blob_service_client.get_blob_client(output_container_name, transcript_blob_name(transcription_id)), **options
         )
+    except ResourceNotFoundError:
+        logging.warning(f"{transcript_blob_name(transcription_id)} not found, looking the transcript up")
 
-        if content_blob_name:
-            logging.info(f"Found content blob: {content_blob_name}")
-            sas_url = generate_blob_sas_url(
-                config['connection_string'],
-                OUTPUT_CONTAINER_NAME,
-                content_blob_name,
-                BlobSasPermissions(read=True),
-                1
-            )
-            local_download_path = os.path.join(config['download_folder'], f"{unique_id}_transcript.json")
-            download_blob(sas_url, local_download_path)
-            
-            if os.path.exists(local_download_path):
-                logging.info(f"Transcript downloaded successfully to {local_download_path}")
-            else:
-                logging.error(f"Failed to download transcript to {local_download_path}")
-        else:
-            logging.error("No content URL blob found")
+    content_url = get_transcript_content_url(api, transcription_id) if api is not None else None
+    if content_url is not None:
+        return iter_blob_chunks(BlobClient.from_blob_url(content_url), **options)
+
+    content_blob_name = get_content_url_blob(
+        config['connection_string'],
+        output_container_name,
+        transcription_id,
+        blob_service_client=blob_service_client
+    )
+    if content_blob_name is None:
+        logging.error("No content URL blob found")
+        return None
+    return iter_blob_chunks(blob_service_client.get_blob_client(output_container_name, content_blob_name), **options)
+
+def download_transcriptions(config, unique_id=None, blob_service_client=None, transcription_id=None, api=None):
+    """Download the transcript for `unique_id` and return the local path, or None if not found.
+
+    See `open_transcript` for how the transcript is found. When `transcription_id` is omitted it
+    is looked up in the job ledger: the job `unique_id`'s, or when that is omitted too, the most
+    recently transcribed job's.
+    """
+    try:
+        if transcription_id is None:
+            ledger = open_ledger(config)
+            record = ledger.get(unique_id) if unique_id is not None else ledger.latest("transcription_id")
+            if record is None or record["transcription_id"] is None:
+                raise Exception(f"No transcription found in the job ledger for {unique_id or 'any job'}")
+            unique_id, transcription_id = record["unique_id"], record["transcription_id"]
+            logging.info(f"Processing file with unique_id: {unique_id}, blob_name: {record['blob_name']}")
+
+        chunks = open_transcript(config, transcription_id, blob_service_client=blob_service_client, api=api)
+        if chunks is None:
+            return None
+
+        local_download_path = os.path.join(config['download_folder'], f"{unique_id}_transcript.json")
+        os.makedirs(os.path.dirname(local_download_path), exist_ok=True)
+        with closing(chunks), open(local_download_path, "wb") as download_file:
+            for chunk in chunks:
+                download_file.write(chunk)
+        logging.info(f"Transcript downloaded successfully to {local_download_path}")
+        return local_download_path
     except Exception as e:
         logging.error(f"Error in downloading transcriptions: {e}")
         raise
 
+def blob_name_from_source(source_url):
+    """Return the blob name from a transcript's `source` URL (``https://<account>/<container>/<blob>?<sas>``)."""
+    path = unquote(urlparse(source_url).path)
+    container_name, _, blob_name = path.lstrip('/').partition('/')
+    if not container_name or not blob_name:
+        raise ValueError(f"Source URL has no /<container>/<blob> path: {source_url}")
+    return blob_name
+
+def download_container_results(config, transcription_id, unique_ids_by_blob_name, blob_service_client=None):
+    """
+    Fan the results of a container transcription back out to the recordings they belong to.
+
+    Every `<transcription_id>_*contenturl_*.json` blob in the output container is downloaded,
+    matched to a recording through its `source` URL and saved as `<unique_id>_transcript.json`.
+    Returns a dict of unique_id -> local transcript path.
+    """
+    output_container_name = config["output_container_name"]
+    if blob_service_client is None:
+        blob_service_client = get_sas_issuer(config['connection_string']).blob_service_client
+    container_client = blob_service_client.get_container_client(output_container_name)
+
+    transcript_paths = {}
+    try:
+        for blob in container_client.list_blobs(name_starts_with=transcription_id):
+            if "contenturl_" not in blob.name or not blob.name.endswith(".json"):
+                continue
+
+            data = container_client.download_blob(blob.name).readall()
+            source_blob_name = blob_name_from_source(json.loads(data)["source"])
+            unique_id = unique_ids_by_blob_name.get(source_blob_name)
+            if unique_id is None:
+                logging.warning(f"Result {blob.name} is for {source_blob_name}, which is not part of this batch")
+                continue
+
+            local_download_path = os.path.join(config['download_folder'], f"{unique_id}_transcript.json")
+            os.makedirs(os.path.dirname(local_download_path), exist_ok=True)
+            with open(local_download_path, "wb") as download_file:
+                download_file.write(data)
+            transcript_paths[unique_id] = local_download_path
+            logging.info(f"Downloaded {blob.name} for {unique_id} to {local_download_path}")
+    except Exception as e:
+        logging.error(f"Error in downloading container results for {transcription_id}: {e}")
+        raise
+
+    missing = set(unique_ids_by_blob_name.values()) - set(transcript_paths)
+    if missing:
+        logging.error(f"No transcript found for {len(missing)} recordings: {sorted(missing)}")
+    return transcript_paths
+
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s %(levelname)s:%(message)s')
     config = load_config('config.yaml')
     download_transcriptions(config)
\ No newline at end of file
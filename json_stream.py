@@ -0,0 +1,109 @@
+import codecs
+import json
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+
+
+class _TextBuffer:
+    """UTF-8 text decoded from byte chunks on demand, dropping what has been consumed."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decode = codecs.getincrementaldecoder("utf-8")().decode
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Append the next chunk; returns False once the input is exhausted."""
+        if self.eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self.eof = True
+            tail = self._decode(b"", final=True)
+        else:
+            tail = self._decode(chunk)
+        self.text = self.text[self.pos:] + tail
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character, or "" at the end of the input."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r}, found {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the next complete JSON value, reading more input until it is all there."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number followed by nothing but number characters (e.g. "-3." of "-3.5e2") may
+            # continue in the next chunk
+            if _number_may_continue(value, self.text, end) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _number_may_continue(value, text, end):
+    if end == len(text):
+        return True
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        return False
+    return all(char in _NUMBER_CHARS for char in text[end:])
+
+
+def iter_array_items(chunks, key):
+    """
+    Yield the items of the array under the top-level `key` of a JSON object, one at a time,
+    while the document is still arriving as byte `chunks`.
+
+    Other top-level values are decoded and dropped, so memory is bounded by the largest single
+    value rather than by the document. Raises KeyError if the object has no `key`.
+    """
+    buffer = _TextBuffer(chunks)
+    buffer.expect("{")
+    found = False
+    if buffer.peek() == "}":
+        raise KeyError(key)
+
+    while True:
+        name = buffer.value()
+        buffer.expect(":")
+        if name == key:
+            found = True
+            buffer.expect("[")
+            if buffer.peek() == "]":
+                buffer.pos += 1
+            else:
+                while True:
+                    yield buffer.value()
+                    if buffer.expect(",]") == "]":
+                        break
+        else:
+            buffer.value()
+        if buffer.expect(",}") == "}":
+            break
+
+    if not found:
+        raise KeyError(key)
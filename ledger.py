@@ -0,0 +1,315 @@
+import contextlib
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+DEFAULT_LEDGER_PATH = "pipeline_jobs.db"
+# A running job whose worker cannot be checked (another host) is taken over after this long without progress
+DEFAULT_STALE_AFTER = 6 * 60 * 60
+
+# Where the step scripts kept their state before the ledger, relative to the working directory
+LEGACY_FILE_INFO = "current_file_info.txt"
+LEGACY_TRANSCRIPTION_IDS = "transcription_ids.txt"
+
+# Columns callers may set through add/update/complete_stage
+FIELDS = ("input_file_path", "source_sha256", "container_name", "blob_name", "transcription_id", "audio_duration",
+          "conversation_path")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    unique_id TEXT PRIMARY KEY,
+    input_file_path TEXT,
+    source_sha256 TEXT,
+    container_name TEXT,
+    blob_name TEXT,
+    transcription_id TEXT,
+    audio_duration REAL,
+    conversation_path TEXT,
+    status TEXT NOT NULL DEFAULT 'Pending',
+    stage TEXT,
+    completed_stages TEXT NOT NULL DEFAULT '[]',
+    timings TEXT NOT NULL DEFAULT '{}',
+    error TEXT,
+    worker TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, updated_at);
+CREATE INDEX IF NOT EXISTS jobs_by_input_file ON jobs (input_file_path, status);
+CREATE INDEX IF NOT EXISTS jobs_by_transcription ON jobs (transcription_id);
+"""
+
+# Columns added since the first version of the schema, added to older ledger files on open
+_ADDED_COLUMNS = {"source_sha256": "TEXT", "container_name": "TEXT"}
+
+_ledgers = {}
+_ledgers_lock = threading.Lock()
+
+
+class JobClaimedError(Exception):
+    """The job is being run by another worker."""
+
+
+def worker_name():
+    """Identifies this process in the ledger: `<host>:<pid>`."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _worker_alive(worker):
+    host, _, pid = worker.rpartition(":")
+    if host != socket.gethostname():
+        return None
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, ValueError):
+        return True
+    return True
+
+
+def _record(row):
+    record = dict(row)
+    record["completed_stages"] = json.loads(record["completed_stages"])
+    record["timings"] = json.loads(record["timings"])
+    return record
+
+
+class JobLedger:
+    """
+    Durable record of every pipeline job in an SQLite database.
+
+    Each job is one row keyed by its unique_id, holding the blob name, transcription id, the
+    stage it is in, the stages it has completed with their timings, and its last error. Every
+    change is a single transaction, so several worker threads or processes can share one
+    ledger file, and a process that dies leaves its jobs where they were for the next run to
+    pick up. A job is run by one worker at a time: `claim` takes it over atomically, and stage
+    transitions from any other worker raise JobClaimedError.
+    """
+
+    def __init__(self, path=DEFAULT_LEDGER_PATH, worker=None, stale_after=DEFAULT_STALE_AFTER):
+        self.path = path
+        self.worker = worker or worker_name()
+        self.stale_after = stale_after
+        self._local = threading.local()
+        self._connection().executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        with self._transaction() as connection:
+            columns = {row["name"] for row in connection.execute("PRAGMA table_info(jobs)")}
+            for column, column_type in _ADDED_COLUMNS.items():
+                if column not in columns:
+                    connection.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Autocommit; transactions are opened explicitly in _transaction
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """A write transaction; BEGIN IMMEDIATE takes the write lock up front so read-modify-write is atomic."""
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _owned(self, connection, unique_id):
+        """The job's row, after checking that this worker is the one running it."""
+        row = connection.execute("SELECT * FROM jobs WHERE unique_id = ?", (unique_id,)).fetchone()
+        if row is None:
+            raise KeyError(unique_id)
+        if row["worker"] not in (None, self.worker):
+            raise JobClaimedError(f"Job {unique_id} is being run by {row['worker']}")
+        return row
+
+    def add(self, unique_id, **fields):
+        """Record a new Pending job; does nothing if `unique_id` is already in the ledger."""
+        self._check_fields(fields)
+        now = time.time()
+        columns = ["unique_id", "created_at", "updated_at", *fields]
+        with self._transaction() as connection:
+            connection.execute(
+                f"INSERT OR IGNORE INTO jobs ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                (unique_id, now, now, *fields.values()),
+            )
+
+    def update(self, unique_id, **fields):
+        """Set `fields` on a job, e.g. its transcription id as soon as the transcription exists."""
+        self._check_fields(fields)
+        with self._transaction() as connection:
+            self._owned(connection, unique_id)
+            self._set(connection, unique_id, fields)
+
+    def claim(self, unique_id):
+        """
+        Make this worker the one running `unique_id`, and return its record.
+
+        A job can be claimed when it is not running, or when the worker running it has died: its
+        process is gone (same host) or it has made no progress for `stale_after` seconds.
+        Raises JobClaimedError otherwise.
+        """
+        with self._transaction() as connection:
+            row = connection.execute("SELECT * FROM jobs WHERE unique_id = ?", (unique_id,)).fetchone()
+            if row is None:
+                raise KeyError(unique_id)
+            owner = row["worker"]
+            if row["status"] == "Running" and owner not in (None, self.worker):
+                alive = _worker_alive(owner)
+                if alive is None:
+                    alive = time.time() - row["updated_at"] < self.stale_after
+                if alive:
+                    raise JobClaimedError(f"Job {unique_id} is being run by {owner}")
+                logging.warning(f"Taking over job {unique_id} from {owner}, which is no longer running")
+            self._set(connection, unique_id, {"status": "Running", "worker": self.worker, "error": None})
+            return self._get(connection, unique_id)
+
+    def start_stage(self, unique_id, stage):
+        with self._transaction() as connection:
+            self._owned(connection, unique_id)
+            self._set(connection, unique_id, {"status": "Running", "stage": stage, "worker": self.worker})
+
+    def complete_stage(self, unique_id, stage, seconds, **fields):
+        """Mark `stage` completed, together with the results it produced (`fields`), in one transaction."""
+        self._check_fields(fields)
+        with self._transaction() as connection:
+            row = self._owned(connection, unique_id)
+            completed_stages = json.loads(row["completed_stages"])
+            if stage not in completed_stages:
+                completed_stages.append(stage)
+            timings = dict(json.loads(row["timings"]), **{stage: seconds})
+            self._set(connection, unique_id, dict(
+                fields, completed_stages=json.dumps(completed_stages), timings=json.dumps(timings)
+            ))
+
+    def fail(self, unique_id, stage, error, seconds=None):
+        """Mark the job Failed in `stage`; it is released so a later run can retry it."""
+        with self._transaction() as connection:
+            row = self._owned(connection, unique_id)
+            values = {"status": "Failed", "stage": stage, "error": error, "worker": None}
+            if seconds is not None:
+                values["timings"] = json.dumps(dict(json.loads(row["timings"]), **{stage: seconds}))
+            self._set(connection, unique_id, values)
+
+    def finish(self, unique_id):
+        with self._transaction() as connection:
+            self._owned(connection, unique_id)
+            self._set(connection, unique_id, {"status": "Succeeded", "error": None, "worker": None})
+
+    def get(self, unique_id):
+        """The job's record as a dict, or None."""
+        return self._get(self._connection(), unique_id)
+
+    def unfinished(self, input_file_path):
+        """The most recent job for `input_file_path` that has not succeeded, or None."""
+        row = self._connection().execute(
+            "SELECT * FROM jobs WHERE input_file_path = ? AND status != 'Succeeded' ORDER BY updated_at DESC LIMIT 1",
+            (input_file_path,),
+        ).fetchone()
+        return _record(row) if row is not None else None
+
+    def with_status(self, *statuses):
+        """Records of every job in one of `statuses`, oldest first."""
+        rows = self._connection().execute(
+            f"SELECT * FROM jobs WHERE status IN ({', '.join('?' * len(statuses))}) ORDER BY updated_at",
+            statuses,
+        ).fetchall()
+        return [_record(row) for row in rows]
+
+    def latest(self, *fields):
+        """The most recently updated job that has all of `fields` set, or None."""
+        self._check_fields(fields)
+        where = " AND ".join(f"{field} IS NOT NULL" for field in fields) or "1"
+        row = self._connection().execute(
+            f"SELECT * FROM jobs WHERE {where} ORDER BY updated_at DESC LIMIT 1"
+        ).fetchone()
+        return _record(row) if row is not None else None
+
+    def _get(self, connection, unique_id):
+        row = connection.execute("SELECT * FROM jobs WHERE unique_id = ?", (unique_id,)).fetchone()
+        return _record(row) if row is not None else None
+
+    def _set(self, connection, unique_id, values):
+        values = dict(values, updated_at=time.time())
+        connection.execute(
+            f"UPDATE jobs SET {', '.join(f'{column} = ?' for column in values)} WHERE unique_id = ?",
+            (*values.values(), unique_id),
+        )
+
+    @staticmethod
+    def _check_fields(fields):
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown job fields: {sorted(unknown)}")
+
+
+def import_legacy_files(ledger, directory=".", wav_folder=None):
+    """
+    Move the state the step scripts kept in text files before the ledger into it: the last
+    upload from current_file_info.txt (`<unique_id>,<blob_name>`) and the last transcription id
+    from transcription_ids.txt. Each file is renamed to `<name>.migrated` once imported.
+    Returns the unique_id imported, or None.
+
+    The step scripts named the blob `<unique_id>_mono_<file name>` after a file in the wav
+    folder, so with `wav_folder` the job gets that file as its input_file_path and the next run
+    over the folder resumes it (`unfinished`) under the same unique_id. Its recording's hash was
+    never recorded, so the resumed job uploads and transcribes again rather than re-attaching to
+    the imported transcription. Without `wav_folder`, or for a blob named otherwise, the job is
+    kept as history only.
+    """
+    info_path = os.path.join(directory, LEGACY_FILE_INFO)
+    ids_path = os.path.join(directory, LEGACY_TRANSCRIPTION_IDS)
+    if not os.path.exists(info_path):
+        return None
+    with open(info_path, "r", encoding="utf-8") as file:
+        unique_id, _, blob_name = file.read().strip().partition(",")
+    if not unique_id or not blob_name:
+        logging.warning(f"Ignoring {info_path}: expected `<unique_id>,<blob_name>`")
+        return None
+
+    fields = {"blob_name": blob_name}
+    prefix = f"{unique_id}_mono_"
+    if wav_folder is not None and blob_name.startswith(prefix):
+        fields["input_file_path"] = os.path.join(wav_folder, blob_name[len(prefix):])
+    if os.path.exists(ids_path):
+        with open(ids_path, "r", encoding="utf-8") as file:
+            transcription_ids = file.read().split()
+        if transcription_ids:
+            # The file was overwritten by every transcription, so it holds the last upload's
+            fields["transcription_id"] = transcription_ids[-1]
+    ledger.add(unique_id, **fields)
+    for path in (info_path, ids_path):
+        if os.path.exists(path):
+            os.replace(path, path + ".migrated")
+    logging.info(f"Imported job {unique_id} from {LEGACY_FILE_INFO} into the job ledger")
+    return unique_id
+
+
+def open_ledger(config):
+    """
+    The process-wide JobLedger at the config's `ledger_path` (default pipeline_jobs.db). The
+    first open in a process imports any state left in the old text files (see
+    `import_legacy_files`).
+    """
+    path = os.path.abspath(config.get("ledger_path") or DEFAULT_LEDGER_PATH)
+    with _ledgers_lock:
+        ledger = _ledgers.get(path)
+        if ledger is None:
+            ledger = _ledgers[path] = JobLedger(path, stale_after=config.get("ledger_stale_after", DEFAULT_STALE_AFTER))
+            import_legacy_files(ledger, wav_folder=config.get("local_wav_folder"))
+        return ledger
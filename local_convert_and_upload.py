@@ -1,82 +1,263 @@
+import functools
+import hashlib
 import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import yaml
 import uuid
 from pydub import AudioSegment
-from azure.storage.blob import BlobServiceClient
+from azure.core.exceptions import ResourceNotFoundError
 from urllib.parse import quote
 import logging
+import block_upload
+from ledger import open_ledger
+from sas import get_sas_issuer
+from wav_stream import SPEECH_FRAME_RATE, MonoWavStream, UnsupportedWavError, convert_wav, probe_wav
 
 # Configure logging
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s %(levelname)s:%(message)s')
+CONVERTED_CONTAINER_NAME = "convertedinput"
 
-# Load configuration from config.yaml
-with open("config.yaml", "r") as file:
-    config = yaml.safe_load(file)
+# Converted blocks buffered ahead of the upload
+READ_AHEAD_BLOCKS = 8
 
-CONNECTION_STRING = config["connection_string"]
-CONVERTED_CONTAINER_NAME = "convertedinput"
-LOCAL_WAV_FOLDER = config["local_wav_folder"]
+# Blob metadata key holding the SHA-256 of the recording a converted blob was made from
+SOURCE_HASH_METADATA = "source_sha256"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def load_config(config_file):
+    with open(config_file, "r") as file:
+        return yaml.safe_load(file)
+
+def convert_to_mono(input_file, output_file, frame_rate=SPEECH_FRAME_RATE):
+    try:
+        # Stream PCM WAV block by block; only formats the wave module can't read go through pydub
+        convert_wav(input_file, output_file, frame_rate=frame_rate)
+        return
+    except UnsupportedWavError as e:
+        logging.info(f"Falling back to pydub for {input_file}: {e}")
+    except Exception as e:
+        logging.error(f"Error converting {input_file} to mono: {e}")
+        raise
 
-def convert_to_mono(input_file, output_file):
     try:
         audio = AudioSegment.from_wav(input_file)
         mono_audio = audio.set_channels(1)
+        if frame_rate:
+            mono_audio = mono_audio.set_frame_rate(frame_rate)
         mono_audio.export(output_file, format="wav")
         logging.info(f"Converted {input_file} to mono and saved as {output_file}")
     except Exception as e:
         logging.error(f"Error converting {input_file} to mono: {e}")
         raise
 
-def upload_blob(blob_service_client, container_name, blob_name, upload_file_path):
-    container_client = blob_service_client.get_container_client(container_name)
+def probe(path):
+    """The WavFormat of a WAV file from its header, or None if it cannot be read."""
     try:
-        container_client.create_container()
-    except Exception as e:
-        logging.warning(f"Container {container_name} already exists or could not be created: {e}")
+        return probe_wav(path)
+    except (UnsupportedWavError, OSError) as e:
+        logging.warning(f"Could not read the header of {path}: {e}")
+        return None
+
+def wav_duration_seconds(path, wav_format=None):
+    """Duration of a PCM WAV file from its header (`wav_format`, read when not given), or None if it cannot be read."""
+    wav_format = wav_format or probe(path)
+    if wav_format is None or not wav_format.frame_rate:
+        return None
+    return wav_format.duration
+
+def file_sha256(path, chunk_size=HASH_CHUNK_SIZE):
+    """Hex SHA-256 of a file, read in `chunk_size` pieces."""
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                return sha256.hexdigest()
+            sha256.update(chunk)
+
+def uploaded_from(blob_service_client, container_name, blob_name, source_sha256):
+    """Whether `container_name/blob_name` exists and was converted from the recording with `source_sha256`."""
+    try:
+        properties = blob_service_client.get_blob_client(container=container_name, blob=blob_name).get_blob_properties()
+    except ResourceNotFoundError:
+        return False
+    return properties.metadata.get(SOURCE_HASH_METADATA) == source_sha256
+
+def read_ahead(chunks, depth=READ_AHEAD_BLOCKS):
+    """
+    Iterate `chunks` while a background thread produces up to `depth` items ahead, so the
+    producer (conversion) and the consumer (upload) overlap instead of taking turns.
+    """
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        # Give up once the consumer has gone away, instead of blocking on a full buffer forever
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for chunk in chunks:
+                if not put(chunk):
+                    return
+            put(done)
+        except BaseException as e:
+            put(e)
+
+    thread = threading.Thread(target=produce, name="read-ahead", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+def upload_blob_data(blob_service_client, container_name, blob_name, data, length=None, source=None,
+                     metadata=None, **upload_options):
+    """
+    Upload `data` (bytes, a file object or an iterable of byte chunks) to `container_name/blob_name`.
+
+    `upload_options` are the block_upload.upload() settings, see block_upload.upload_options().
+    """
+    source = source or blob_name
+    block_upload.ensure_container(blob_service_client, container_name)
 
     blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
     try:
-        with open(upload_file_path, "rb") as data:
-            blob_client.upload_blob(data, overwrite=True)
-        logging.info(f"Uploaded {upload_file_path} to {container_name}/{blob_name}")
+        response = block_upload.upload(blob_client, data, length=length, metadata=metadata, **upload_options)
+        logging.info(f"Uploaded {source} to {container_name}/{blob_name} (ETag {response['etag']})")
+    except ResourceNotFoundError as e:
+        # Deleted since it was cached; the next upload recreates it
+        block_upload.forget_container(blob_service_client, container_name)
+        logging.error(f"Error uploading {source}: {e}")
+        raise
     except Exception as e:
-        logging.error(f"Error uploading {upload_file_path}: {e}")
+        logging.error(f"Error uploading {source}: {e}")
         raise
-    
+
     return blob_name
 
-def main():
+def upload_blob(blob_service_client, container_name, blob_name, upload_file_path, metadata=None, **upload_options):
+    with open(upload_file_path, "rb") as data:
+        return upload_blob_data(blob_service_client, container_name, blob_name, data,
+                                length=os.path.getsize(upload_file_path), source=upload_file_path,
+                                metadata=metadata, **upload_options)
+
+def convert_and_upload(blob_service_client, input_file_path, unique_id=None, convert=convert_to_mono,
+                       container_name=CONVERTED_CONTAINER_NAME, upload_options=None, source_sha256=None,
+                       check_existing=False, wav_format=None):
+    """Convert one local WAV file to 16 kHz mono and upload it to `container_name`.
+
+    Files whose header says they are already 16 kHz mono 16-bit PCM are uploaded as they are.
+    Other PCM WAV files are converted block by block straight into the upload, with no temp
+    file. Only files the streaming converter cannot read go through `convert(input_file,
+    output_file)` and a temp file; the batch scheduler swaps in a version that runs on its
+    process pool. `upload_options` tune large uploads (see block_upload.upload_options()).
+    Returns the ``(unique_id, blob_name)`` pair the later stages key on.
+
+    The blob records the SHA-256 of the recording it was made from: `source_sha256`, or a
+    function returning it, computed from the file when not given. Unless it is needed first,
+    the hash is worked out on a background thread while the audio converts and uploads, and
+    set on the blob when the upload is committed. With `check_existing`, e.g. when resuming a
+    job, nothing is converted or uploaded if the blob is already there with the same hash.
+    `wav_format` is the file's probe_wav() result, if the caller already has it.
+    """
+    upload_options = upload_options or {}
+    if unique_id is None:
+        unique_id = str(uuid.uuid4())
+
+    # The unique_id prefix keeps temp files of concurrent jobs apart
+    folder, filename = os.path.split(input_file_path)
+    blob_name = f"{unique_id}_mono_{filename}"
+
+    source_sha256 = source_sha256 or functools.partial(file_sha256, input_file_path)
+    if check_existing:
+        source_sha256 = source_sha256() if callable(source_sha256) else source_sha256
+        if uploaded_from(blob_service_client, container_name, blob_name, source_sha256):
+            logging.info(f"{container_name}/{blob_name} was already converted from {input_file_path}, skipping it")
+            return unique_id, blob_name
+    if callable(source_sha256):
+        hashing = ThreadPoolExecutor(max_workers=1, thread_name_prefix="source-hash")
+        source_hash = hashing.submit(source_sha256)
+        hashing.shutdown(wait=False)
+        metadata = lambda: {SOURCE_HASH_METADATA: source_hash.result()}
+    else:
+        metadata = {SOURCE_HASH_METADATA: source_sha256}
+    upload_options = dict(upload_options, metadata=metadata)
+
     try:
-        blob_service_client = BlobServiceClient.from_connection_string(CONNECTION_STRING)
-        
-        for filename in os.listdir(LOCAL_WAV_FOLDER):
-            if filename.endswith(".wav"):
-                input_file_path = os.path.join(LOCAL_WAV_FOLDER, filename)
-                mono_filename = f"mono_{filename}"
-                mono_file_path = os.path.join(LOCAL_WAV_FOLDER, mono_filename)
-                convert_to_mono(input_file_path, mono_file_path)
-                
-                unique_id = str(uuid.uuid4())
-                blob_name = f"{unique_id}_{mono_filename}"
-                uploaded_blob_name = upload_blob(blob_service_client, CONVERTED_CONTAINER_NAME, blob_name, mono_file_path)
+        speech_ready = (wav_format or probe_wav(input_file_path)).is_speech_ready
+    except UnsupportedWavError as e:
+        logging.info(f"Could not probe {input_file_path}, converting: {e}")
+        speech_ready = False
+
+    if speech_ready:
+        logging.info(f"{input_file_path} is already 16 kHz mono PCM, uploading without conversion")
+        uploaded_blob_name = upload_blob(blob_service_client, container_name, blob_name, input_file_path, **upload_options)
+    else:
+        try:
+            stream = MonoWavStream(input_file_path, frame_rate=SPEECH_FRAME_RATE)
+        except UnsupportedWavError as e:
+            logging.info(f"Cannot stream {input_file_path}, converting to a temp file: {e}")
+            stream = None
+
+        if stream is not None:
+            chunks = read_ahead(stream)
+            try:
+                uploaded_blob_name = upload_blob_data(
+                    blob_service_client, container_name, blob_name, chunks,
+                    length=stream.length, source=input_file_path, **upload_options
+                )
+            finally:
+                # Stops the conversion thread if the upload gave up part way through
+                chunks.close()
+                stream.close()
+        else:
+            mono_file_path = os.path.join(folder, blob_name)
+            convert(input_file_path, mono_file_path)
+            try:
+                uploaded_blob_name = upload_blob(blob_service_client, container_name, blob_name, mono_file_path, **upload_options)
+            finally:
                 os.remove(mono_file_path)
                 logging.info(f"Removed local file: {mono_file_path}")
+
+    return unique_id, uploaded_blob_name
+
+def main(config):
+    try:
+        blob_service_client = get_sas_issuer(config["connection_string"]).blob_service_client
+        ledger = open_ledger(config)
+        local_wav_folder = config["local_wav_folder"]
+        
+        for filename in os.listdir(local_wav_folder):
+            if filename.endswith(".wav"):
+                input_file_path = os.path.join(local_wav_folder, filename)
+                unique_id, uploaded_blob_name = convert_and_upload(
+                    blob_service_client, input_file_path, upload_options=block_upload.upload_options(config)
+                )
                 
-                with open("current_file_info.txt", "w") as file:
-                    file.write(f"{unique_id},{uploaded_blob_name}")
-                
-                logging.info(f"Saved file info: unique_id={unique_id}, blob_name={uploaded_blob_name}")
+                ledger.add(unique_id, input_file_path=input_file_path, blob_name=uploaded_blob_name)
                 
-                # Verify the blob exists
-                blob_client = blob_service_client.get_blob_client(container=CONVERTED_CONTAINER_NAME, blob=uploaded_blob_name)
-                if blob_client.exists():
-                    logging.info(f"Verified blob exists: {uploaded_blob_name}")
-                else:
-                    logging.error(f"Blob does not exist: {uploaded_blob_name}")
+                logging.info(f"Recorded job: unique_id={unique_id}, blob_name={uploaded_blob_name}")
 
     except Exception as e:
         logging.error(f"Error in processing: {e}")
         raise
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s %(levelname)s:%(message)s')
+    main(load_config("config.yaml"))
@@ -1,10 +1,14 @@
-import subprocess
 import logging
+import os
 import sys
-import yaml
+from collections import Counter
 from pathlib import Path
 from tqdm import tqdm
-import time
+from swagger_client.rest import connection_metrics
+
+from batch import BatchScheduler
+from pipeline import PipelineContext, STAGES, load_config
+from webhook import start_webhook_receiver, stop_webhook_receiver
 
 # Set up logging to write to a file
 logging.basicConfig(
@@ -15,25 +19,35 @@ logging.basicConfig(
     filemode="w"
 )
 
-def load_config(config_file):
-    with open(config_file, "r", encoding="utf-8") as file:
-        return yaml.safe_load(file)
+def run_jobs(context, config):
+    scheduler = BatchScheduler(context)
+    for filename in sorted(os.listdir(config["local_wav_folder"])):
+        if filename.endswith(".wav"):
+            scheduler.submit(os.path.join(config["local_wav_folder"], filename))
 
-def run_script(script_name, progress_bar):
-    tqdm.write(f"Running {script_name}")
-    try:
-        result = subprocess.run(["python", script_name], capture_output=True, text=True, check=True)
-        tqdm.write(f"Finished running {script_name}")
-        logging.info(result.stdout)  # Log the standard output to file
-    except subprocess.CalledProcessError as e:
-        tqdm.write(f"Error running {script_name}")
-        logging.error(f"Error running {script_name}:")
-        logging.error(e.stderr)
-        raise
-    except Exception as e:
-        tqdm.write(f"Unexpected error running {script_name}")
-        logging.error(f"Unexpected error running {script_name}: {str(e)}")
-        raise
+    with tqdm(total=len(STAGES) * len(scheduler.jobs), desc="Pipeline Progress", unit="step") as progress_bar:
+        completed_stages = Counter()
+
+        def on_stage_complete(name, job):
+            completed_stages[job.unique_id] += 1
+            progress_bar.update(1)
+
+        def on_job_done(job):
+            timings = ", ".join(f"{name}: {seconds:.1f}s" for name, seconds in job.timings.items())
+            if job.status == "Succeeded":
+                tqdm.write(f"Finished {os.path.basename(job.input_file_path)} as {job.unique_id} ({timings})")
+            else:
+                # Stages skipped after a failure still count towards the total
+                progress_bar.update(len(STAGES) - completed_stages[job.unique_id])
+                tqdm.write(f"Failed {os.path.basename(job.input_file_path)} in {job.stage}: {job.error}")
+
+        if config.get("container_batch"):
+            # One Speech API transcription for the whole folder instead of one per file
+            run = scheduler.run_container_batch
+        else:
+            run = scheduler.run
+        jobs = run(on_stage_complete=on_stage_complete, on_job_done=on_job_done)
+    return jobs
 
 def main():
     # Load configuration
@@ -42,26 +56,31 @@ def main():
     # Ensure output directory exists
     Path(config["download_folder"]).mkdir(parents=True, exist_ok=True)
 
-    # Pipeline execution
-    steps = [
-        "local_convert_and_upload.py",
-        "main_transcribe.py",
-        "download_transcript.py",
-        "postprocess_transcript.py"
-    ]
+    # One context for the whole run so config and clients are shared between stages
+    context = PipelineContext(config)
 
+    if config.get("webhook_url"):
+        # Wait for completion callbacks instead of polling every transcription
+        context.webhook_receiver = start_webhook_receiver(config, context.transcriptions_api.api_client)
     try:
-        with tqdm(total=len(steps), desc="Pipeline Progress", unit="step") as progress_bar:
-            for step in steps:
-                run_script(step, progress_bar)
-                progress_bar.update(1)
-                time.sleep(0.5)  # Add a small delay for better visual feedback
+        jobs = run_jobs(context, config)
+    finally:
+        if context.webhook_receiver is not None:
+            stop_webhook_receiver(context.webhook_receiver, context.transcriptions_api.api_client)
+
+    metrics = connection_metrics()
+    logging.info(
+        f"Speech API: {metrics['requests']} requests over {metrics['new_connections']} connections "
+        f"({metrics['reused_connections']} reused)"
+    )
 
-        tqdm.write("\nPipeline completed successfully!")
-    except Exception as e:
-        tqdm.write(f"\nPipeline failed: {str(e)}")
+    failed = [job for job in jobs.values() if job.status != "Succeeded"]
+    if failed:
+        tqdm.write(f"\nPipeline failed for {len(failed)} of {len(jobs)} files.")
         tqdm.write("Check the pipeline.log file for more information.")
         sys.exit(1)
 
+    tqdm.write("\nPipeline completed successfully!")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -4,35 +4,19 @@
 import json
 import logging
 import sys
-import requests
 import time
 import yaml
 import swagger_client
 from azure.storage.blob import (
-    BlobServiceClient,
-    generate_blob_sas,
-    generate_container_sas,
     ContainerSasPermissions,
     BlobSasPermissions,
 )
-from datetime import datetime, timedelta, timezone
-
-# Load configuration from config.yaml
-with open('config.yaml', 'r') as file:
-    config = yaml.safe_load(file)
-
-CONNECTION_STRING = config['connection_string']
-OUTPUT_CONTAINER_NAME = config['output_container_name']
-SUBSCRIPTION_KEY = config['subscription_key']
-SERVICE_REGION = config['service_region']
-INPUT_CONTAINER_NAME = config['input_container_name']
-
-logging.basicConfig(
-    stream=sys.stdout,
-    level=logging.DEBUG,
-    format="%(asctime)s %(message)s",
-    datefmt="%m/%d/%Y %I:%M:%S %p %Z",
-)
+from datetime import datetime
+from ledger import open_ledger
+from sas import get_sas_issuer, validate_blob_sas_url
+
+class TranscriptionNotFinished(Exception):
+    """The transcription was still running when the wait for it ended; it continues in the background."""
 
 class DateTimeEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -41,51 +25,30 @@ class DateTimeEncoder(json.JSONEncoder):
         return super(DateTimeEncoder, self).default(obj)
 
 
+def load_config(config_file):
+    with open(config_file, 'r') as file:
+        return yaml.safe_load(file)
+
 NAME = "Simple transcription"
 DESCRIPTION = "Simple transcription description"
 LOCALE = "en-US"
 
 # Define a function to generate a valid SAS URL
-def generate_sas_url(container_name, blob_name, permission, expiry_duration_hours):
-    blob_service_client = BlobServiceClient.from_connection_string(CONNECTION_STRING)
-    blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
-    
-    if not blob_client.exists():
-        raise Exception(f"Blob does not exist: {blob_name}")
-    
-    sas_token = generate_blob_sas(
-        account_name=blob_service_client.account_name,
-        container_name=container_name,
-        blob_name=blob_name,
-        account_key=blob_service_client.credential.account_key,
-        permission=permission,
-        expiry=datetime.now(timezone.utc) + timedelta(hours=expiry_duration_hours),
-    )
-    sas_url = f"https://{blob_service_client.account_name}.blob.core.windows.net/{container_name}/{blob_name}?{sas_token}"
-    
-    # Test the SAS URL
-    try:
-        response = requests.head(sas_url)
-        response.raise_for_status()
-        logging.info(f"SAS URL is valid and accessible: {sas_url}")
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Error accessing SAS URL: {e}")
-        raise Exception(f"Invalid SAS URL: {sas_url}")
-    
+def generate_sas_url(connection_string, container_name, blob_name, permission, expiry_duration_hours, validate=False):
+    """
+    SAS URL for a blob, from the shared SasIssuer cache.
+
+    With `validate`, the blob's existence and the URL are checked with two extra requests.
+    """
+    issuer = get_sas_issuer(connection_string)
+    sas_url = issuer.blob_sas_url(container_name, blob_name, permission, expiry_duration_hours)
+    if validate:
+        validate_blob_sas_url(issuer.blob_service_client, container_name, blob_name, sas_url)
     return sas_url
 
 # Define a function to generate a valid SAS URL for a container
-def generate_container_sas_url(container_name, permission, expiry_duration_hours):
-    blob_service_client = BlobServiceClient.from_connection_string(CONNECTION_STRING)
-    sas_token = generate_container_sas(
-        account_name=blob_service_client.account_name,
-        container_name=container_name,
-        account_key=blob_service_client.credential.account_key,
-        permission=permission,
-        expiry=datetime.now(timezone.utc) + timedelta(hours=expiry_duration_hours),
-    )
-    sas_url = f"https://{blob_service_client.account_name}.blob.core.windows.net/{container_name}?{sas_token}"
-    return sas_url
+def generate_container_sas_url(connection_string, container_name, permission, expiry_duration_hours):
+    return get_sas_issuer(connection_string).container_sas_url(container_name, permission, expiry_duration_hours)
 
 # Set model information when doing transcription with custom models
 MODEL_REFERENCE = None  # guid of a custom model
@@ -138,49 +101,27 @@ def transcribe_from_container(uri, properties):
     )
     return transcription_definition
 
-def _paginate(api, paginated_object):
-    """
-    The autogenerated client does not support pagination. This function returns a generator over
-    all items of the array that the paginated object `paginated_object` is part of.
-    """
-    yield from paginated_object.values
-    typename = type(paginated_object).__name__
-    auth_settings = ["api_key"]
-    while paginated_object.next_link:
-        link = paginated_object.next_link[len(api.api_client.configuration.host) :]
-        paginated_object, status, headers = api.api_client.call_api(
-            link, "GET", response_type=typename, auth_settings=auth_settings
-        )
-
-        if status == 200:
-            yield from paginated_object.values
-        else:
-            raise Exception(f"could not receive paginated data: status {status}")
-
 def delete_all_transcriptions(api):
     """
     Delete all transcriptions associated with your speech resource.
     """
     logging.info("Deleting all existing completed transcriptions.")
 
-    # get all transcriptions for the subscription
-    transcriptions = list(_paginate(api, api.get_transcriptions()))
+    # Collect only the ids: deleting while paging would shift the skip offsets of later pages
+    transcription_ids = [
+        transcription._self.split("/")[-1]
+        for transcription in swagger_client.Paginator(api.transcriptions_list)
+    ]
 
     # Delete all pre-existing completed transcriptions.
     # If transcriptions are still running or not started, they will not be deleted.
-    for transcription in transcriptions:
-        transcription_id = transcription._self.split("/")[-1]
+    for transcription_id in transcription_ids:
         logging.debug(f"Deleting transcription with id {transcription_id}")
         try:
-            api.delete_transcription(transcription_id)
+            api.transcriptions_delete(transcription_id)
         except swagger_client.rest.ApiException as exc:
             logging.error(f"Could not delete transcription {transcription_id}: {exc}")
 
-def save_transcription_id(transcription_id, file_path):
-    with open(file_path, 'w') as f:  # Changed from 'a' to 'w' to overwrite
-        f.write(f"{transcription_id}\n")
-    logging.info(f"Saved transcription ID {transcription_id} to {file_path}")
-
 def check_transcription_status(api, transcription_id, max_retries=180):  # 15 minutes
     retry_count = 0
     while retry_count < max_retries:
@@ -195,16 +136,63 @@ def check_transcription_status(api, transcription_id, max_retries=180):  # 15 mi
 
     return None
 
-def transcribe():
-    logging.info("Starting transcription client...")
-
+def create_api_configuration(config):
     configuration = swagger_client.Configuration()
     configuration.api_key["Ocp-Apim-Subscription-Key"] = config['subscription_key']
     configuration.host = f"https://{config['service_region']}.api.cognitive.microsoft.com/speechtotext/v3.1"
+    # Clients share the process-wide connection pool (see swagger_client.rest.connection_metrics)
+    configuration.connection_pool_num_pools = config.get("api_connection_pools", configuration.connection_pool_num_pools)
+    configuration.connection_pool_maxsize = config.get("api_connection_pool_maxsize", configuration.connection_pool_maxsize)
+    # Throttled (429) and unavailable (5xx) responses are retried after Retry-After or a jittered backoff
+    configuration.retries = swagger_client.rest.RetryPolicy(total=config.get("api_max_retries", 5))
+    if config.get("api_rate_limit"):
+        # One bucket per subscription, so every client in the process stays under its quota together
+        configuration.rate_limiter = swagger_client.rest.shared_rate_limiter(
+            (config['service_region'], config['subscription_key']),
+            config["api_rate_limit"],
+            config.get("api_rate_limit_burst"),
+        )
+    return configuration
+
+# Fields of a transcription that status checks read: status, its URL, when it was created (for the
+# poller's list filter), and error details when it failed
+STATUS_FIELDS = ("self", "status", "createdDateTime", "lastActionDateTime", "properties")
 
-    client = swagger_client.ApiClient(configuration)
-    api = swagger_client.CustomSpeechTranscriptionsApi(api_client=client)
+def use_lightweight_status(client, config):
+    """
+    Return `transcriptions_get` results as records of STATUS_FIELDS instead of full Transcription
+    models, which status polling would otherwise build on every check. On by default; set
+    `api_lightweight_status` to false for full models.
+    """
+    if config.get("api_lightweight_status", True):
+        client.set_lightweight_response("GET", "/transcriptions/{id}", "Transcription", fields=STATUS_FIELDS)
+    return client
+
+def create_transcriptions_api(config):
+    client = use_lightweight_status(swagger_client.ApiClient(create_api_configuration(config)), config)
+    return swagger_client.CustomSpeechTranscriptionsApi(api_client=client)
+
+def create_status_api(config):
+    """
+    Transcriptions API for the background status poller. Its client does not retry: the poller
+    reschedules throttled checks after Retry-After itself, whereas a client retry would sleep
+    inside the poller's one thread and hold up the checks of every other transcription.
+    """
+    configuration = create_api_configuration(config)
+    configuration.retries = None
+    client = use_lightweight_status(swagger_client.ApiClient(configuration), config)
+    return swagger_client.CustomSpeechTranscriptionsApi(api_client=client)
 
+def create_async_transcriptions_api(config):
+    """
+    Transcriptions API whose operations are coroutines, e.g. `await api.transcriptions_get(id)`,
+    sharing one pooled aiohttp session per event loop. Close it in each loop that used it with
+    `await api.api_client.close()`. Requires aiohttp.
+    """
+    client = use_lightweight_status(swagger_client.AsyncApiClient(create_api_configuration(config)), config)
+    return swagger_client.CustomSpeechTranscriptionsApi(api_client=client)
+
+def build_transcription_properties(config):
     properties = swagger_client.TranscriptionProperties()
     properties.word_level_timestamps_enabled = True
     properties.display_form_word_level_timestamps_enabled = True
@@ -212,7 +200,8 @@ def transcribe():
     properties.profanity_filter_mode = "Masked"
 
     properties.destination_container_url = generate_container_sas_url(
-        OUTPUT_CONTAINER_NAME,
+        config['connection_string'],
+        config['output_container_name'],
         ContainerSasPermissions(read=True, add=True, create=True, write=True, delete=True, list=True),
         8,
     )
@@ -221,61 +210,186 @@ def transcribe():
     properties.diarization = swagger_client.DiarizationProperties(
         swagger_client.DiarizationSpeakersProperties(min_count=1, max_count=5)
     )
+    return properties
+
+def create_and_wait(api, transcription_definition, config, max_retries=180, wait_for_transcription=None,
+                    on_created=None):
+    """
+    Create the transcription described by `transcription_definition` and wait for it to finish.
+    Returns the transcription id.
+
+    `wait_for_transcription(api, transcription_id, max_retries)` does the waiting; it defaults to
+    polling with check_transcription_status and can be swapped for a web hook receiver.
+    `on_created(transcription_id)` is called as soon as the transcription exists, before waiting,
+    so the id can be recorded in the job ledger.
+    """
+    created_transcription, status, headers = api.transcriptions_create_with_http_info(
+        transcription=transcription_definition
+    )
+
+    transcription_id = headers["location"].split("/")[-1]
+    if on_created is not None:
+        on_created(transcription_id)
+
+    logging.info(
+        "Created new transcription with id '%s' in region %s",
+        transcription_id,
+        config['service_region'],
+    )
+
+    logging.info("Checking status.")
+
+    return wait_and_check(api, transcription_id, max_retries=max_retries, wait_for_transcription=wait_for_transcription)
+
+def wait_and_check(api, transcription_id, max_retries=180, wait_for_transcription=None):
+    """
+    Wait for `transcription_id` to succeed and return it. Raises if the transcription failed, and
+    TranscriptionNotFinished if it is still running when the wait ends.
+    """
+    if wait_for_transcription is None:
+        wait_for_transcription = check_transcription_status
+
+    transcription = wait_for_transcription(api, transcription_id, max_retries=max_retries)
+
+    if transcription is None:
+        logging.warning("Transcription is still running after the initial timeout. It will continue in the background.")
+        logging.info(f"Transcription ID: {transcription_id}")
+        raise TranscriptionNotFinished(
+            f"Transcription {transcription_id} is still running; run the job again to re-attach to it"
+        )
+
+    if transcription.status == "Failed":
+        error_details = transcription.to_dict()
+        error_message = json.dumps(error_details, indent=2, cls=DateTimeEncoder)
+        logging.error(f"Transcription failed. Error details:\n{error_message}")
+        raise Exception(f"Transcription failed: {error_message}")
+    if transcription.status != "Succeeded":
+        raise TranscriptionNotFinished(f"Transcription {transcription_id} has not finished: {transcription.status}")
+
+    logging.info("Transcription succeeded. Results are located in your Azure Blob Storage.")
+    return transcription_id
+
+def reattach(api, transcription_id, max_retries=180, wait_for_transcription=None):
+    """
+    Wait for a transcription an earlier run created, instead of paying for a new one.
+
+    Returns its id once it has finished, or None if it no longer exists or has failed, in
+    which case the caller should create a new transcription.
+    """
+    try:
+        transcription = api.transcriptions_get(transcription_id)
+    except swagger_client.rest.ApiException as e:
+        if e.status == 404:
+            logging.warning(f"Transcription {transcription_id} no longer exists, creating a new one")
+            return None
+        raise
+
+    if transcription.status == "Failed":
+        logging.warning(f"Transcription {transcription_id} failed earlier, creating a new one")
+        return None
+
+    logging.info(f"Re-attaching to transcription {transcription_id} ({transcription.status})")
+    if transcription.status == "Succeeded":
+        return transcription_id
+    return wait_and_check(api, transcription_id, max_retries=max_retries, wait_for_transcription=wait_for_transcription)
+
+def transcribe(config, api=None, blob_name=None, max_retries=180, wait_for_transcription=None, on_created=None,
+               transcription_id=None):
+    """
+    Submit `blob_name` from the input container for transcription and wait for it to finish.
+
+    `api` can be shared between calls; when omitted a new client is created. When `blob_name`
+    is omitted, the most recently uploaded job in the ledger is transcribed, as recorded by
+    local_convert_and_upload.py, and its transcription id is recorded against it. When
+    `transcription_id` names a transcription an earlier run created, that one is waited for
+    instead (see `reattach`).
+    """
+    logging.info("Starting transcription client...")
+
+    if api is None:
+        api = create_transcriptions_api(config)
+
+    if transcription_id is not None:
+        if reattach(api, transcription_id, max_retries=max_retries, wait_for_transcription=wait_for_transcription):
+            return transcription_id
+
+    properties = build_transcription_properties(config)
+    input_container_name = config['input_container_name']
 
     try:
-        with open('current_file_info.txt', 'r') as file:
-            unique_id, blob_name = file.read().strip().split(',')
+        if blob_name is None:
+            ledger = open_ledger(config)
+            record = ledger.latest("blob_name")
+            if record is None:
+                raise Exception("No uploaded recording found in the job ledger")
+            unique_id, blob_name = record["unique_id"], record["blob_name"]
+            if on_created is None:
+                on_created = lambda transcription_id: ledger.update(unique_id, transcription_id=transcription_id)
 
-        logging.info(f"Read from current_file_info.txt: unique_id={unique_id}, blob_name={blob_name}")
+            logging.info(f"Read from the job ledger: unique_id={unique_id}, blob_name={blob_name}")
 
         recordings_blob_sas_url = generate_sas_url(
-            INPUT_CONTAINER_NAME,
+            config['connection_string'],
+            input_container_name,
             blob_name,
             BlobSasPermissions(read=True),
             48,
         )
         logging.info(f"Generated SAS URL for blob: {blob_name}")
-        logging.info(f"In container: {INPUT_CONTAINER_NAME}")
+        logging.info(f"In container: {input_container_name}")
         logging.info(f"Full SAS URL: {recordings_blob_sas_url}")
 
         transcription_definition = transcribe_from_single_blob(recordings_blob_sas_url, properties)
 
-        created_transcription, status, headers = api.transcriptions_create_with_http_info(
-            transcription=transcription_definition
-        )
+        return create_and_wait(api, transcription_definition, config, max_retries=max_retries,
+                               wait_for_transcription=wait_for_transcription, on_created=on_created)
+
+    except Exception as e:
+        logging.error(f"Error in transcription process: {e}")
+        raise
 
-        transcription_id = headers["location"].split("/")[-1]
-        save_transcription_id(transcription_id, 'transcription_ids.txt')
+def transcribe_container(config, container_name, api=None, max_retries=720, wait_for_transcription=None,
+                         on_created=None, transcription_id=None):
+    """
+    Submit every recording in `container_name` as a single transcription and wait for it to finish.
 
-        logging.info(
-            "Created new transcription with id '%s' in region %s",
-            transcription_id,
-            config['service_region'],
-        )
+    As with `transcribe`, a `transcription_id` from an earlier run is re-attached to if it can be.
 
-        logging.info("Checking status.")
+    The Speech API writes one `<transcription id>_contenturl_<n>.json` result per recording to the
+    output container; download_transcript.download_container_results maps them back to recordings.
+    """
+    logging.info(f"Starting container transcription for {container_name}...")
 
-        transcription = check_transcription_status(api, transcription_id)
+    if api is None:
+        api = create_transcriptions_api(config)
 
-        if transcription is None:
-            logging.warning("Transcription is still running after the initial timeout. It will continue in the background.")
-            logging.info(f"Transcription ID: {transcription_id}")
+    if transcription_id is not None:
+        if reattach(api, transcription_id, max_retries=max_retries, wait_for_transcription=wait_for_transcription):
             return transcription_id
 
-        if transcription.status == "Succeeded":
-            logging.info("Transcription succeeded. Results are located in your Azure Blob Storage.")
-        elif transcription.status == "Failed":
-            error_details = transcription.to_dict()
-            error_message = json.dumps(error_details, indent=2, cls=DateTimeEncoder)
-            logging.error(f"Transcription failed. Error details:\n{error_message}")
-            raise Exception(f"Transcription failed: {error_message}")
+    properties = build_transcription_properties(config)
 
-        return transcription_id
+    try:
+        recordings_container_sas_url = generate_container_sas_url(
+            config['connection_string'],
+            container_name,
+            ContainerSasPermissions(read=True, list=True),
+            48,
+        )
+        transcription_definition = transcribe_from_container(recordings_container_sas_url, properties)
+        return create_and_wait(api, transcription_definition, config, max_retries=max_retries,
+                               wait_for_transcription=wait_for_transcription, on_created=on_created)
 
     except Exception as e:
-        logging.error(f"Error in transcription process: {e}")
+        logging.error(f"Error in container transcription process: {e}")
         raise
 
 if __name__ == "__main__":
-    transcription_id = transcribe()
+    logging.basicConfig(
+        stream=sys.stdout,
+        level=logging.DEBUG,
+        format="%(asctime)s %(message)s",
+        datefmt="%m/%d/%Y %I:%M:%S %p %Z",
+    )
+    transcription_id = transcribe(load_config('config.yaml'))
     print(f"Transcription ID: {transcription_id}")
\ No newline at end of file
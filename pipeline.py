@@ -0,0 +1,335 @@
+import contextlib
+import functools
+import logging
+import threading
+import time
+import yaml
+
+import block_upload
+import local_convert_and_upload
+import main_transcribe
+import download_transcript
+import postprocess_transcript
+from ledger import FIELDS as LEDGER_FIELDS, JobClaimedError, open_ledger
+from poller import TranscriptionPoller
+from sas import get_sas_issuer
+from transcript_cache import open_transcript_cache
+
+
+def load_config(config_file):
+    with open(config_file, "r", encoding="utf-8") as file:
+        return yaml.safe_load(file)
+
+
+class PipelineContext:
+    """
+    Everything the stages share inside one long-lived process: the parsed config, the
+    Azure Blob / Speech API clients, the job ledger and the transcript cache. Each is created
+    on first use and then reused.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self._transcriptions_api = None
+        self._ledger = None
+        self._poller = None
+        self._lock = threading.Lock()
+        # Set by BatchScheduler while a batch runs: a process pool for the pydub conversions
+        # that cannot be streamed into the upload, and a semaphore bounding in-flight
+        # Speech API transcriptions.
+        self.conversion_executor = None
+        self.transcription_slots = None
+        # webhook.WebhookReceiver; when set, transcriptions complete on callback instead of polling
+        self.webhook_receiver = None
+
+    @classmethod
+    def from_config_file(cls, config_file="config.yaml"):
+        return cls(load_config(config_file))
+
+    @property
+    def blob_service_client(self):
+        # The client the SAS issuer signs with, so every caller in the process shares one
+        return get_sas_issuer(self.config["connection_string"]).blob_service_client
+
+    @property
+    def transcriptions_api(self):
+        with self._lock:
+            if self._transcriptions_api is None:
+                self._transcriptions_api = main_transcribe.create_transcriptions_api(self.config)
+        return self._transcriptions_api
+
+    @property
+    def ledger(self):
+        """The JobLedger every stage transition is recorded in."""
+        with self._lock:
+            if self._ledger is None:
+                self._ledger = open_ledger(self.config)
+        return self._ledger
+
+    @property
+    def transcript_cache(self):
+        """The TranscriptCache of earlier results, or None when it is disabled."""
+        # Shared by every context in the process, like the ledger
+        return open_transcript_cache(self.config)
+
+    @property
+    def poller(self):
+        """Shared TranscriptionPoller, started on first use, with its own non-retrying client."""
+        with self._lock:
+            if self._poller is None:
+                self._poller = TranscriptionPoller(
+                    main_transcribe.create_status_api(self.config),
+                    min_interval=self.config.get("poll_min_interval", 5),
+                    max_interval=self.config.get("poll_max_interval", 120),
+                ).start()
+        return self._poller
+
+    def wait_for_transcription(self, api, transcription_id, max_retries=180, audio_duration=None):
+        if self.webhook_receiver is not None:
+            return self.webhook_receiver.wait_for_transcription(api, transcription_id, max_retries=max_retries)
+        return self.poller.wait_for_transcription(api, transcription_id, max_retries=max_retries, audio_duration=audio_duration)
+
+
+class PipelineJob:
+    """State of one recording as it moves through the stages."""
+
+    def __init__(self, input_file_path, unique_id=None):
+        self.input_file_path = input_file_path
+        self.unique_id = unique_id
+        # SHA-256 of the recording, also kept as metadata on the converted blob
+        self.source_sha256 = None
+        self.container_name = None
+        self.blob_name = None
+        self.transcription_id = None
+        # Either a local transcript file, or an iterator streaming it from blob storage
+        self.transcript_path = None
+        self.transcript_chunks = None
+        self.conversation_path = None
+        # Seconds of audio, from the WAV header; used to pace status checks
+        self.audio_duration = None
+        # "Pending", "Running", "Succeeded" or "Failed"
+        self.status = "Pending"
+        self.stage = None
+        self.error = None
+        # stage name -> seconds spent in that stage
+        self.timings = {}
+        # Names of the stages finished so far, including those finished by an earlier run
+        self.completed_stages = []
+        # Whether an earlier run started this job; stages then check for work it already did
+        self.resumed = False
+        self._fingerprint = None
+
+    @classmethod
+    def from_record(cls, record):
+        """Rebuild a job from its JobLedger record, to resume it where it stopped."""
+        job = cls(record["input_file_path"], unique_id=record["unique_id"])
+        job.source_sha256 = record["source_sha256"]
+        job.container_name = record["container_name"]
+        job.blob_name = record["blob_name"]
+        job.transcription_id = record["transcription_id"]
+        job.audio_duration = record["audio_duration"]
+        job.conversation_path = record["conversation_path"]
+        job.stage = record["stage"]
+        job.error = record["error"]
+        job.timings = dict(record["timings"])
+        job.completed_stages = list(record["completed_stages"])
+        job.resumed = record["stage"] is not None
+        return job
+
+    def fingerprint(self):
+        """SHA-256 of the recording as it is now; read once per run."""
+        if self._fingerprint is None:
+            self._fingerprint = local_convert_and_upload.file_sha256(self.input_file_path)
+        return self._fingerprint
+
+    def ledger_fields(self):
+        """The job's results so far, as JobLedger fields."""
+        return {field: getattr(self, field) for field in LEDGER_FIELDS if getattr(self, field) is not None}
+
+    def __repr__(self):
+        return f"PipelineJob(unique_id={self.unique_id!r}, input_file_path={self.input_file_path!r})"
+
+
+def convert_and_upload_stage(context, job, container_name=local_convert_and_upload.CONVERTED_CONTAINER_NAME):
+    # Read once for both the duration and the upload's choice of path
+    wav_format = local_convert_and_upload.probe(job.input_file_path)
+    job.audio_duration = local_convert_and_upload.wav_duration_seconds(job.input_file_path, wav_format)
+    # Only a transcription to re-attach to needs the hash now; otherwise it overlaps the upload
+    if job.transcription_id is not None and (job.fingerprint() != job.source_sha256 or container_name != job.container_name):
+        # The earlier transcription was of something else; it must not be re-attached to
+        job.transcription_id = None
+        context.ledger.update(job.unique_id, transcription_id=None)
+    convert = local_convert_and_upload.convert_to_mono
+    if context.conversion_executor is not None:
+        executor = context.conversion_executor
+        convert = lambda input_file, output_file: executor.submit(
+            local_convert_and_upload.convert_to_mono, input_file, output_file
+        ).result()
+    job.unique_id, job.blob_name = local_convert_and_upload.convert_and_upload(
+        context.blob_service_client, job.input_file_path, unique_id=job.unique_id, convert=convert,
+        container_name=container_name, upload_options=block_upload.upload_options(context.config),
+        source_sha256=job.fingerprint, check_existing=job.resumed, wav_format=wav_format
+    )
+    job.source_sha256 = job.fingerprint()
+    job.container_name = container_name
+
+def transcribe_stage(context, job):
+    with context.transcription_slots or contextlib.nullcontext():
+        # A transcription created by an earlier run of the job is re-attached to, not created again
+        job.transcription_id = main_transcribe.transcribe(
+            context.config, api=context.transcriptions_api, blob_name=job.blob_name,
+            transcription_id=job.transcription_id,
+            wait_for_transcription=functools.partial(context.wait_for_transcription, audio_duration=job.audio_duration),
+            on_created=lambda transcription_id: context.ledger.update(job.unique_id, transcription_id=transcription_id),
+        )
+
+def download_stage(context, job):
+    # Only the first range is fetched here; the rest streams into postprocessing
+    job.transcript_chunks = download_transcript.open_transcript(
+        context.config, job.transcription_id, blob_service_client=context.blob_service_client,
+        api=context.transcriptions_api
+    )
+    if job.transcript_chunks is None:
+        raise Exception(f"No transcript could be downloaded for {job.unique_id}")
+
+def postprocess_stage(context, job):
+    if job.transcript_chunks is not None:
+        chunks, job.transcript_chunks = job.transcript_chunks, None
+        # The parse stops at the end of recognizedPhrases; closing stops the reads after it
+        with contextlib.closing(chunks):
+            job.conversation_path = postprocess_transcript.postprocess_stream(
+                chunks, context.config["download_folder"], job.unique_id
+            )
+    else:
+        job.conversation_path = postprocess_transcript.postprocess(context.config["download_folder"], job.unique_id)
+
+
+STAGES = [
+    ("Analysing File", convert_and_upload_stage),
+    ("AI Transcription", transcribe_stage),
+    ("Processing Results", download_stage),
+    ("Saving Results", postprocess_stage),
+]
+
+def restore_from_cache(context, job, stages=None, on_stage_complete=None):
+    """
+    Complete `job` from the transcript cache if the same recording was transcribed before.
+
+    Every stage is marked done without running, so nothing is uploaded or transcribed. Returns
+    whether the job was found in the cache.
+    """
+    cache = context.transcript_cache
+    if cache is None:
+        return False
+    conversation_path = postprocess_transcript.conversation_path(context.config["download_folder"], job.unique_id)
+    entry = cache.restore(job.fingerprint(), conversation_path)
+    if entry is None:
+        return False
+
+    logging.info(f"Job {job.unique_id} is a recording transcribed before, using the cached transcript")
+    job.source_sha256 = job.fingerprint()
+    job.transcription_id = entry["transcription_id"]
+    job.conversation_path = conversation_path
+    for name, _ in (stages or STAGES):
+        job.timings[name] = 0.0
+        if name not in job.completed_stages:
+            job.completed_stages.append(name)
+        context.ledger.complete_stage(job.unique_id, name, 0.0, **job.ledger_fields())
+        if on_stage_complete:
+            on_stage_complete(name, job)
+    return True
+
+def cache_result(context, job):
+    """Add the conversation of a succeeded `job` to the transcript cache, keyed by its recording."""
+    cache = context.transcript_cache
+    if cache is None or job.conversation_path is None:
+        return
+    transcript_blob = None
+    if job.transcription_id is not None:
+        transcript_blob = f"{context.config['output_container_name']}/{download_transcript.transcript_blob_name(job.transcription_id)}"
+    try:
+        cache.put(job.fingerprint(), job.conversation_path, transcription_id=job.transcription_id,
+                  transcript_blob=transcript_blob)
+    except OSError as e:
+        logging.warning(f"Could not cache the transcript of {job.unique_id}: {e}")
+
+
+# Stages whose results are kept in the ledger, so a resumed job does not run them again.
+# The transcript download is only held in memory and is repeated along with postprocessing.
+CHECKPOINT_STAGES = ("Analysing File", "AI Transcription")
+
+# What `job.stage` names while run_pipeline is outside any stage: claiming the job and checking
+# the transcript cache, then recording the finished job
+STARTING = "Starting"
+FINISHING = "Finishing"
+
+
+def run_stage(context, job, name, stage, on_stage_start=None, on_stage_complete=None):
+    """
+    Run a single stage for `job`, recording how long it took in `job.timings`.
+
+    The start, completion (with the stage's results) or failure of the stage is also recorded in
+    the ledger. Exceptions from the stage propagate after its timing and the error have been
+    recorded on the job.
+    """
+    job.stage = name
+    context.ledger.start_stage(job.unique_id, name)
+    if on_stage_start:
+        on_stage_start(name, job)
+    start = time.perf_counter()
+    try:
+        stage(context, job)
+    except Exception as e:
+        job.status = "Failed"
+        job.error = str(e)
+        context.ledger.fail(job.unique_id, name, job.error, time.perf_counter() - start)
+        raise
+    finally:
+        job.timings[name] = time.perf_counter() - start
+        logging.info(f"Stage '{name}' for {job.unique_id} took {job.timings[name]:.2f}s")
+    if name not in job.completed_stages:
+        job.completed_stages.append(name)
+    context.ledger.complete_stage(job.unique_id, name, job.timings[name], **job.ledger_fields())
+    if on_stage_complete:
+        on_stage_complete(name, job)
+
+
+def run_pipeline(context, job, stages=None, on_stage_start=None, on_stage_complete=None):
+    """
+    Run `job` through every stage in order, recording how long each one took in `job.timings`.
+
+    `on_stage_start(name, job)` and `on_stage_complete(name, job)` are called around each stage
+    so callers can drive a progress display. Exceptions from a stage propagate after its timing
+    and the error have been recorded on the job. Whatever fails, `job.stage` names the step it
+    failed in: a stage's name, or STARTING or FINISHING.
+
+    The job is claimed in the ledger first (JobClaimedError if another worker is running it).
+    A recording found in the transcript cache completes straight away. Otherwise checkpoint
+    stages the job already completed in an earlier run are skipped, and reported to
+    `on_stage_complete` with their earlier timing, and the result is cached on success.
+    """
+    job.stage = STARTING
+    context.ledger.add(job.unique_id, input_file_path=job.input_file_path)
+    try:
+        context.ledger.claim(job.unique_id)
+    except JobClaimedError as e:
+        job.status = "Failed"
+        job.error = str(e)
+        raise
+    job.status = "Running"
+    if restore_from_cache(context, job, stages, on_stage_complete):
+        context.ledger.finish(job.unique_id)
+        job.status = "Succeeded"
+        return job
+    for name, stage in (stages or STAGES):
+        if name in CHECKPOINT_STAGES and name in job.completed_stages:
+            logging.info(f"Stage '{name}' for {job.unique_id} was completed by an earlier run, skipping it")
+            if on_stage_complete:
+                on_stage_complete(name, job)
+            continue
+        run_stage(context, job, name, stage, on_stage_start, on_stage_complete)
+    job.stage = FINISHING
+    context.ledger.finish(job.unique_id)
+    job.status = "Succeeded"
+    cache_result(context, job)
+    return job
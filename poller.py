@@ -0,0 +1,195 @@
+import logging
+import random
+import threading
+import time
+from contextlib import closing
+from datetime import datetime, timezone
+
+import swagger_client
+from swagger_client.rest import parse_retry_after
+
+FINAL_STATUSES = ("Failed", "Succeeded")
+
+
+def _created_at(transcription):
+    """The transcription's createdDateTime in UTC, or None if the response did not include it."""
+    created = getattr(transcription, "created_date_time", None)
+    if isinstance(created, str):
+        # Lightweight records keep the JSON string
+        created = datetime.fromisoformat(created.replace("Z", "+00:00"))
+    if created is None:
+        return None
+    if created.tzinfo is None:
+        return created.replace(tzinfo=timezone.utc)
+    return created.astimezone(timezone.utc)
+
+
+class _PendingTranscription:
+
+    def __init__(self, transcription_id, first_delay):
+        self.transcription_id = transcription_id
+        self.registered_at = time.monotonic()
+        # The transcription's createdDateTime, learned from its first individual check
+        self.created_after = None
+        self.interval = first_delay
+        self.next_check = self.registered_at + first_delay
+        self.checks = 0
+        self.done = threading.Event()
+        self.transcription = None
+
+
+class TranscriptionPoller:
+    """
+    One background thread that tracks every outstanding transcription.
+
+    Instead of one `time.sleep(5)` loop per file, each transcription gets its own schedule: the
+    first check is delayed in proportion to the audio duration, later checks back off
+    exponentially (capped by `max_interval` and by the time already spent), and every delay is
+    jittered so a batch does not hit the API in lockstep. When several transcriptions are due in
+    the same tick they are refreshed with one paged `transcriptions_list` call, filtered on the
+    oldest one's createdDateTime, rather than N `transcriptions_get` calls. A transcription's first
+    check, which learns its createdDateTime, and any the listing misses use `transcriptions_get`.
+    Retry-After on a throttled response pushes every due check back.
+    """
+
+    def __init__(self, api, min_interval=5.0, max_interval=120.0, backoff=1.5, jitter=0.2,
+                 realtime_factor=0.1, page_size=100):
+        self.api = api
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        # Batch transcription typically finishes in a fraction of the audio duration
+        self.realtime_factor = realtime_factor
+        self.page_size = page_size
+        self._pending = {}
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="transcription-poller", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _jittered(self, delay):
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def wait_for_transcription(self, api, transcription_id, max_retries=180, audio_duration=None):
+        """
+        Drop-in replacement for main_transcribe.check_transcription_status.
+
+        Blocks until the poller sees the transcription reach a final state, for up to the same
+        time budget the per-file loop would use (`max_retries` * 5 s). Returns None on timeout.
+        """
+        first_delay = self.min_interval
+        if audio_duration:
+            first_delay = min(self.max_interval, max(self.min_interval, audio_duration * self.realtime_factor))
+        pending = _PendingTranscription(transcription_id, self._jittered(first_delay))
+
+        with self._condition:
+            self._pending[transcription_id] = pending
+            self._condition.notify_all()
+
+        try:
+            if not pending.done.wait(timeout=max_retries * 5):
+                logging.warning(f"Transcription {transcription_id} did not finish after {pending.checks} checks")
+                return None
+            return pending.transcription
+        finally:
+            with self._condition:
+                self._pending.pop(transcription_id, None)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+                now = time.monotonic()
+                # Checks due shortly ride along with the ones due now, so they share a list call
+                due = [p for p in self._pending.values() if p.next_check <= now + self.min_interval / 2]
+                if not due:
+                    next_check = min((p.next_check for p in self._pending.values()), default=None)
+                    self._condition.wait(timeout=None if next_check is None else next_check - now)
+                    continue
+
+            try:
+                self._refresh(due)
+            except swagger_client.rest.ApiException as e:
+                retry_after = parse_retry_after((e.headers or {}).get("Retry-After"))
+                if e.status in (429, 503) or retry_after is not None:
+                    delay = retry_after if retry_after is not None else self.min_interval
+                    logging.warning(f"Status checks throttled ({e.status}), retrying in {delay:.0f}s")
+                    self._reschedule(due, minimum=delay)
+                else:
+                    logging.error(f"Error checking transcription status: {e}")
+                    self._reschedule(due)
+            except Exception as e:
+                logging.error(f"Error checking transcription status: {e}")
+                self._reschedule(due)
+
+    def _refresh(self, due):
+        """Fetch the current state of every due transcription and wake the finished ones."""
+        transcriptions = {}
+        retry_after = None
+        listed = [p for p in due if p.created_after is not None]
+        if len(listed) > 1:
+            # Only transcriptions created since the oldest due one can be ours
+            since = min(p.created_after for p in listed).strftime("%Y-%m-%dT%H:%M:%SZ")
+            wanted = {p.transcription_id for p in listed}
+            # No prefetch: the listing usually stops early, and a prefetched page would be wasted.
+            # Closing the iterator releases the page it holds as soon as every id has been found.
+            paginator = swagger_client.Paginator(self.api.transcriptions_list, page_size=self.page_size,
+                                                 prefetch=False, filter=f"createdDateTime ge {since}")
+            with closing(iter(paginator)) as listing:
+                for transcription in listing:
+                    transcription_id = transcription._self.split("/")[-1]
+                    if transcription_id in wanted:
+                        transcriptions[transcription_id] = transcription
+                        if len(transcriptions) == len(wanted):
+                            break
+
+        # New transcriptions, and any the listing did not return, are checked one by one
+        for pending in due:
+            if pending.transcription_id not in transcriptions:
+                transcription, status, headers = self.api.transcriptions_get_with_http_info(pending.transcription_id)
+                transcriptions[pending.transcription_id] = transcription
+                delay = parse_retry_after(headers.get("Retry-After"))
+                if delay is not None:
+                    retry_after = max(delay, retry_after or 0)
+            if pending.created_after is None:
+                pending.created_after = _created_at(transcriptions[pending.transcription_id])
+
+        still_running = []
+        for pending in due:
+            pending.checks += 1
+            transcription = transcriptions.get(pending.transcription_id)
+            if transcription is not None:
+                logging.info("Transcriptions status for %s: %s", pending.transcription_id, transcription.status)
+            if transcription is not None and transcription.status in FINAL_STATUSES:
+                pending.transcription = transcription
+                with self._condition:
+                    self._pending.pop(pending.transcription_id, None)
+                pending.done.set()
+            else:
+                still_running.append(pending)
+        self._reschedule(still_running, minimum=retry_after)
+
+    def _reschedule(self, due, minimum=None):
+        now = time.monotonic()
+        with self._condition:
+            for pending in due:
+                elapsed = now - pending.registered_at
+                # Back off, but never wait longer than a quarter of the time already spent
+                pending.interval = min(self.max_interval, max(self.min_interval, elapsed / 4), pending.interval * self.backoff)
+                delay = self._jittered(pending.interval)
+                if minimum is not None:
+                    delay = max(delay, minimum)
+                pending.next_check = now + delay
@@ -2,55 +2,90 @@ import json
 import os
 import logging
 import yaml
+from json_stream import iter_array_items
+from ledger import open_ledger
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s %(levelname)s:%(message)s')
+def load_config(config_file):
+    with open(config_file, "r") as file:
+        return yaml.safe_load(file)
 
-# Load configuration from config.yaml
-with open("config.yaml", "r") as file:
-    config = yaml.safe_load(file)
+# Bytes read at a time when postprocessing a transcript file
+READ_CHUNK_SIZE = 1024 * 1024
 
-input_folder = config["download_folder"]
+def iter_file_chunks(path, chunk_size=READ_CHUNK_SIZE):
+    with open(path, 'rb') as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
 
-try:
-    with open('current_file_info.txt', 'r') as file:
-        unique_id, sanitized_blob_name = file.read().strip().split(',')
+def conversation_path(output_folder, unique_id):
+    return os.path.join(output_folder, f"{unique_id}_speaker_conversation.json")
 
-    input_file_name = f"{unique_id}_transcript.json"
-    output_file_name = f"{unique_id}_speaker_conversation.json"
+def postprocess_stream(chunks, output_folder, unique_id):
+    """Write `<unique_id>_speaker_conversation.json` from a transcript arriving as byte `chunks`.
 
-    input_file_path = os.path.join(input_folder, input_file_name)
-    output_file_path = os.path.join(input_folder, output_file_name)
+    `recognizedPhrases` are parsed and reduced one at a time as the chunks arrive, so a
+    transcript can be postprocessed while it is still downloading, without holding it in
+    memory. Returns the path of the conversation file.
+    """
+    output_file_path = conversation_path(output_folder, unique_id)
+    try:
+        speakers_conversation = [
+            {
+                "speaker": f"speaker_{phrase['speaker']}",
+                "text": phrase["nBest"][0]["display"],
+                "timestamp": phrase["offset"]
+            }
+            for phrase in iter_array_items(chunks, "recognizedPhrases")
+            if phrase["speaker"] in [1, 2]
+        ]
 
-    logging.info(f"Checking for input file: {input_file_path}")
-    
-    if not os.path.exists(input_file_path):
-        logging.error(f"Input file {input_file_path} not found")
-        # List files in the input folder
-        files_in_folder = os.listdir(input_folder)
-        logging.info(f"Files in {input_folder}: {files_in_folder}")
-        raise FileNotFoundError(f"Input file {input_file_path} not found")
+        conversation_json = {
+            "conversation": speakers_conversation
+        }
 
-    with open(input_file_path, 'r') as file:
-        data = json.load(file)
+        os.makedirs(output_folder, exist_ok=True)
+        with open(output_file_path, 'w') as output_file:
+            json.dump(conversation_json, output_file, indent=4)
 
-    speakers_conversation = [
-        {
-            "speaker": f"speaker_{phrase['speaker']}", 
-            "text": phrase["nBest"][0]["display"],
-            "timestamp": phrase["offset"]
-        }
-        for phrase in data["recognizedPhrases"]
-        if phrase["speaker"] in [1, 2]
-    ]
+        logging.info(f"Conversation saved to {output_file_path}")
+        return output_file_path
+    except Exception as e:
+        logging.error(f"Error in postprocessing transcript: {e}")
+        raise
+
+def postprocess(input_folder, unique_id):
+    """Turn `<unique_id>_transcript.json` into `<unique_id>_speaker_conversation.json`.
+
+    Returns the path of the conversation file.
+    """
+    try:
+        input_file_name = f"{unique_id}_transcript.json"
+        input_file_path = os.path.join(input_folder, input_file_name)
+
+        logging.info(f"Checking for input file: {input_file_path}")
+        
+        if not os.path.exists(input_file_path):
+            logging.error(f"Input file {input_file_path} not found")
+            # List files in the input folder
+            files_in_folder = os.listdir(input_folder)
+            logging.info(f"Files in {input_folder}: {files_in_folder}")
+            raise FileNotFoundError(f"Input file {input_file_path} not found")
+
+        return postprocess_stream(iter_file_chunks(input_file_path), input_folder, unique_id)
+    except Exception as e:
+        logging.error(f"Error in postprocessing transcript: {e}")
+        raise
 
-    conversation_json = {
-        "conversation": speakers_conversation
-    }
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s %(levelname)s:%(message)s')
+    # Load configuration from config.yaml
+    config = load_config("config.yaml")
 
-    with open(output_file_path, 'w') as output_file:
-        json.dump(conversation_json, output_file, indent=4)
+    record = open_ledger(config).latest("transcription_id")
+    if record is None:
+        raise SystemExit("No transcribed job found in the job ledger")
 
-    logging.info(f"Conversation saved to {output_file_path}")
-except Exception as e:
-    logging.error(f"Error in postprocessing transcript: {e}")
-    raise
\ No newline at end of file
+    postprocess(config["download_folder"], record["unique_id"])
@@ -38,6 +38,7 @@ setup(
     url="",
     keywords=["Swagger", "Speech Services API v3.1"],
     install_requires=REQUIRES,
+    extras_require={"asyncio": ["aiohttp>=3.8"], "orjson": ["orjson>=3"]},
     packages=find_packages(),
     include_package_data=True,
     long_description="""\
@@ -15,94 +15,102 @@
 
 from __future__ import absolute_import
 
-# import apis into sdk package
-from swagger_client.api.custom_speech_datasets_for_model_adaptation_api import CustomSpeechDatasetsForModelAdaptationApi
-from swagger_client.api.custom_speech_endpoints_api import CustomSpeechEndpointsApi
-from swagger_client.api.custom_speech_model_evaluations_api import CustomSpeechModelEvaluationsApi
-from swagger_client.api.custom_speech_models_api import CustomSpeechModelsApi
-from swagger_client.api.custom_speech_projects_api import CustomSpeechProjectsApi
-from swagger_client.api.custom_speech_transcriptions_api import CustomSpeechTranscriptionsApi
-from swagger_client.api.custom_speech_web_hooks_api import CustomSpeechWebHooksApi
-from swagger_client.api.service_health_api import ServiceHealthApi
+from swagger_client.lazy import attach
 
-# import ApiClient
-from swagger_client.api_client import ApiClient
-from swagger_client.configuration import Configuration
-# import models into sdk package
-from swagger_client.models.base_model import BaseModel
-from swagger_client.models.base_model_deprecation_dates import BaseModelDeprecationDates
-from swagger_client.models.base_model_features import BaseModelFeatures
-from swagger_client.models.base_model_links import BaseModelLinks
-from swagger_client.models.base_model_properties import BaseModelProperties
-from swagger_client.models.block_kind import BlockKind
-from swagger_client.models.commit_blocks_entry import CommitBlocksEntry
-from swagger_client.models.component import Component
-from swagger_client.models.custom_model import CustomModel
-from swagger_client.models.custom_model_deprecation_dates import CustomModelDeprecationDates
-from swagger_client.models.custom_model_features import CustomModelFeatures
-from swagger_client.models.custom_model_links import CustomModelLinks
-from swagger_client.models.custom_model_properties import CustomModelProperties
-from swagger_client.models.dataset import Dataset
-from swagger_client.models.dataset_kind import DatasetKind
-from swagger_client.models.dataset_links import DatasetLinks
-from swagger_client.models.dataset_locales import DatasetLocales
-from swagger_client.models.dataset_properties import DatasetProperties
-from swagger_client.models.dataset_update import DatasetUpdate
-from swagger_client.models.detailed_error_code import DetailedErrorCode
-from swagger_client.models.diarization_properties import DiarizationProperties
-from swagger_client.models.diarization_speakers_properties import DiarizationSpeakersProperties
-from swagger_client.models.endpoint import Endpoint
-from swagger_client.models.endpoint_links import EndpointLinks
-from swagger_client.models.endpoint_properties import EndpointProperties
-from swagger_client.models.endpoint_properties_update import EndpointPropertiesUpdate
-from swagger_client.models.endpoint_update import EndpointUpdate
-from swagger_client.models.entity_error import EntityError
-from swagger_client.models.entity_reference import EntityReference
-from swagger_client.models.error import Error
-from swagger_client.models.error_code import ErrorCode
-from swagger_client.models.evaluation import Evaluation
-from swagger_client.models.evaluation_links import EvaluationLinks
-from swagger_client.models.evaluation_properties import EvaluationProperties
-from swagger_client.models.evaluation_update import EvaluationUpdate
-from swagger_client.models.file import File
-from swagger_client.models.file_kind import FileKind
-from swagger_client.models.file_links import FileLinks
-from swagger_client.models.file_properties import FileProperties
-from swagger_client.models.health_status import HealthStatus
-from swagger_client.models.inner_error import InnerError
-from swagger_client.models.language_identification_properties import LanguageIdentificationProperties
-from swagger_client.models.model_copy import ModelCopy
-from swagger_client.models.model_file import ModelFile
-from swagger_client.models.model_manifest import ModelManifest
-from swagger_client.models.model_update import ModelUpdate
-from swagger_client.models.paginated_base_models import PaginatedBaseModels
-from swagger_client.models.paginated_custom_models import PaginatedCustomModels
-from swagger_client.models.paginated_datasets import PaginatedDatasets
-from swagger_client.models.paginated_endpoints import PaginatedEndpoints
-from swagger_client.models.paginated_evaluations import PaginatedEvaluations
-from swagger_client.models.paginated_files import PaginatedFiles
-from swagger_client.models.paginated_projects import PaginatedProjects
-from swagger_client.models.paginated_transcriptions import PaginatedTranscriptions
-from swagger_client.models.paginated_web_hooks import PaginatedWebHooks
-from swagger_client.models.profanity_filter_mode import ProfanityFilterMode
-from swagger_client.models.project import Project
-from swagger_client.models.project_links import ProjectLinks
-from swagger_client.models.project_properties import ProjectProperties
-from swagger_client.models.project_update import ProjectUpdate
-from swagger_client.models.punctuation_mode import PunctuationMode
-from swagger_client.models.response_block import ResponseBlock
-from swagger_client.models.service_health import ServiceHealth
-from swagger_client.models.shared_model import SharedModel
-from swagger_client.models.shared_model_features import SharedModelFeatures
-from swagger_client.models.status import Status
-from swagger_client.models.transcription import Transcription
-from swagger_client.models.transcription_links import TranscriptionLinks
-from swagger_client.models.transcription_properties import TranscriptionProperties
-from swagger_client.models.transcription_update import TranscriptionUpdate
-from swagger_client.models.uploaded_blocks import UploadedBlocks
-from swagger_client.models.web_hook import WebHook
-from swagger_client.models.web_hook_events import WebHookEvents
-from swagger_client.models.web_hook_links import WebHookLinks
-from swagger_client.models.web_hook_properties import WebHookProperties
-from swagger_client.models.web_hook_properties_update import WebHookPropertiesUpdate
-from swagger_client.models.web_hook_update import WebHookUpdate
+# apis, models and clients in the sdk package, imported on first access (PEP 562)
+_SUBMODULE_ATTRS = {
+    'api.custom_speech_datasets_for_model_adaptation_api': ['CustomSpeechDatasetsForModelAdaptationApi'],
+    'api.custom_speech_endpoints_api': ['CustomSpeechEndpointsApi'],
+    'api.custom_speech_model_evaluations_api': ['CustomSpeechModelEvaluationsApi'],
+    'api.custom_speech_models_api': ['CustomSpeechModelsApi'],
+    'api.custom_speech_projects_api': ['CustomSpeechProjectsApi'],
+    'api.custom_speech_transcriptions_api': ['CustomSpeechTranscriptionsApi'],
+    'api.custom_speech_web_hooks_api': ['CustomSpeechWebHooksApi'],
+    'api.service_health_api': ['ServiceHealthApi'],
+    'api_client': ['ApiClient'],
+    'async_api_client': ['AsyncApiClient'],
+    'configuration': ['Configuration'],
+    'models.base_model': ['BaseModel'],
+    'models.base_model_deprecation_dates': ['BaseModelDeprecationDates'],
+    'models.base_model_features': ['BaseModelFeatures'],
+    'models.base_model_links': ['BaseModelLinks'],
+    'models.base_model_properties': ['BaseModelProperties'],
+    'models.block_kind': ['BlockKind'],
+    'models.commit_blocks_entry': ['CommitBlocksEntry'],
+    'models.component': ['Component'],
+    'models.custom_model': ['CustomModel'],
+    'models.custom_model_deprecation_dates': ['CustomModelDeprecationDates'],
+    'models.custom_model_features': ['CustomModelFeatures'],
+    'models.custom_model_links': ['CustomModelLinks'],
+    'models.custom_model_properties': ['CustomModelProperties'],
+    'models.dataset': ['Dataset'],
+    'models.dataset_kind': ['DatasetKind'],
+    'models.dataset_links': ['DatasetLinks'],
+    'models.dataset_locales': ['DatasetLocales'],
+    'models.dataset_properties': ['DatasetProperties'],
+    'models.dataset_update': ['DatasetUpdate'],
+    'models.detailed_error_code': ['DetailedErrorCode'],
+    'models.diarization_properties': ['DiarizationProperties'],
+    'models.diarization_speakers_properties': ['DiarizationSpeakersProperties'],
+    'models.endpoint': ['Endpoint'],
+    'models.endpoint_links': ['EndpointLinks'],
+    'models.endpoint_properties': ['EndpointProperties'],
+    'models.endpoint_properties_update': ['EndpointPropertiesUpdate'],
+    'models.endpoint_update': ['EndpointUpdate'],
+    'models.entity_error': ['EntityError'],
+    'models.entity_reference': ['EntityReference'],
+    'models.error': ['Error'],
+    'models.error_code': ['ErrorCode'],
+    'models.evaluation': ['Evaluation'],
+    'models.evaluation_links': ['EvaluationLinks'],
+    'models.evaluation_properties': ['EvaluationProperties'],
+    'models.evaluation_update': ['EvaluationUpdate'],
+    'models.file': ['File'],
+    'models.file_kind': ['FileKind'],
+    'models.file_links': ['FileLinks'],
+    'models.file_properties': ['FileProperties'],
+    'models.health_status': ['HealthStatus'],
+    'models.inner_error': ['InnerError'],
+    'models.language_identification_properties': ['LanguageIdentificationProperties'],
+    'models.model_copy': ['ModelCopy'],
+    'models.model_file': ['ModelFile'],
+    'models.model_manifest': ['ModelManifest'],
+    'models.model_update': ['ModelUpdate'],
+    'models.paginated_base_models': ['PaginatedBaseModels'],
+    'models.paginated_custom_models': ['PaginatedCustomModels'],
+    'models.paginated_datasets': ['PaginatedDatasets'],
+    'models.paginated_endpoints': ['PaginatedEndpoints'],
+    'models.paginated_evaluations': ['PaginatedEvaluations'],
+    'models.paginated_files': ['PaginatedFiles'],
+    'models.paginated_projects': ['PaginatedProjects'],
+    'models.paginated_transcriptions': ['PaginatedTranscriptions'],
+    'models.paginated_web_hooks': ['PaginatedWebHooks'],
+    'models.profanity_filter_mode': ['ProfanityFilterMode'],
+    'models.project': ['Project'],
+    'models.project_links': ['ProjectLinks'],
+    'models.project_properties': ['ProjectProperties'],
+    'models.project_update': ['ProjectUpdate'],
+    'models.punctuation_mode': ['PunctuationMode'],
+    'models.response_block': ['ResponseBlock'],
+    'models.service_health': ['ServiceHealth'],
+    'models.shared_model': ['SharedModel'],
+    'models.shared_model_features': ['SharedModelFeatures'],
+    'models.status': ['Status'],
+    'models.transcription': ['Transcription'],
+    'models.transcription_links': ['TranscriptionLinks'],
+    'models.transcription_properties': ['TranscriptionProperties'],
+    'models.transcription_update': ['TranscriptionUpdate'],
+    'models.uploaded_blocks': ['UploadedBlocks'],
+    'models.web_hook': ['WebHook'],
+    'models.web_hook_events': ['WebHookEvents'],
+    'models.web_hook_links': ['WebHookLinks'],
+    'models.web_hook_properties': ['WebHookProperties'],
+    'models.web_hook_properties_update': ['WebHookPropertiesUpdate'],
+    'models.web_hook_update': ['WebHookUpdate'],
+    'pagination': ['Paginator'],
+}
+
+_SUBMODULES = ['api_client', 'async_api_client', 'async_rest', 'codec',
+               'configuration', 'lazy', 'records', 'rest']
+
+__getattr__, __dir__, __all__ = attach(__name__, _SUBMODULE_ATTRS, _SUBMODULES)
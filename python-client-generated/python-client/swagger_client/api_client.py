@@ -12,12 +12,12 @@
 from __future__ import absolute_import
 
 import datetime
-import json
 import mimetypes
 from multiprocessing.pool import ThreadPool
 import os
 import re
 import tempfile
+import threading
 
 # python 2 and python 3 compatibility library
 import six
@@ -25,7 +25,185 @@ from six.moves.urllib.parse import quote
 
 from swagger_client.configuration import Configuration
 import swagger_client.models
-from swagger_client import rest
+from swagger_client import records, rest
+
+
+def _deserialize_primitive(klass):
+    def deserialize(data):
+        if type(data) is klass:
+            return data
+        try:
+            return klass(data)
+        except UnicodeEncodeError:
+            return six.text_type(data)
+        except TypeError:
+            return data
+    return deserialize
+
+
+def _deserialize_object(value):
+    return value
+
+
+def _parse_datetime(string):
+    try:
+        from dateutil.parser import parse
+    except ImportError:
+        return string
+    try:
+        return parse(string)
+    except ValueError:
+        raise rest.ApiException(
+            status=0,
+            reason=(
+                "Failed to parse `{0}` as datetime object"
+                .format(string)
+            )
+        )
+
+
+def _deserialize_datetime(string):
+    """Deserializes string to datetime.
+
+    The string should be in iso8601 datetime format. The service's
+    timestamps are read with datetime.fromisoformat; anything it does not
+    accept goes through dateutil.
+    """
+    try:
+        return datetime.datetime.fromisoformat(string)
+    except (TypeError, ValueError):
+        return _parse_datetime(string)
+
+
+def _deserialize_date(string):
+    try:
+        from dateutil.parser import parse
+        return parse(string).date()
+    except ImportError:
+        return string
+    except ValueError:
+        raise rest.ApiException(
+            status=0,
+            reason="Failed to parse `{0}` as date object".format(string)
+        )
+
+
+def _list_deserializer(convert):
+    def deserialize(data):
+        return [None if item is None else convert(item) for item in data]
+    return deserialize
+
+
+def _dict_deserializer(convert):
+    def deserialize(data):
+        return {k: None if v is None else convert(v)
+                for k, v in six.iteritems(data)}
+    return deserialize
+
+
+class _ModelDeserializer(object):
+    """Deserializes a dict into a model through its plan of
+    (json_key, attr, converter) tuples, built from swagger_types and
+    attribute_map once per model class."""
+
+    __slots__ = ('klass', 'fields', 'is_dict', 'has_child_model')
+
+    def __init__(self, klass):
+        self.klass = klass
+        self.fields = ()
+        self.is_dict = issubclass(klass, dict)
+        self.has_child_model = 'get_real_child_model' in klass.__dict__
+
+    def compile(self):
+        self.fields = tuple(
+            (self.klass.attribute_map[attr], attr, deserializer(attr_type))
+            for attr, attr_type in six.iteritems(self.klass.swagger_types))
+
+    def __call__(self, data):
+        kwargs = {}
+        if isinstance(data, dict):
+            for json_key, attr, convert in self.fields:
+                if json_key in data:
+                    value = data[json_key]
+                    kwargs[attr] = None if value is None else convert(value)
+
+        instance = self.klass(**kwargs)
+
+        if self.is_dict and isinstance(data, dict):
+            for key, value in data.items():
+                if key not in self.klass.swagger_types:
+                    instance[key] = value
+        if self.has_child_model:
+            klass_name = instance.get_real_child_model(data)
+            if klass_name:
+                instance = deserializer(klass_name)(data)
+        return instance
+
+
+_deserializers = {}
+_deserializers_lock = threading.RLock()
+
+
+def deserializer(klass):
+    """The compiled deserializer for `klass`, a class or a type string such
+    as 'list[Transcription]' or 'dict(str, str)'.
+
+    Type strings are parsed and model classes resolved once; the result is
+    memoized for every later response. Deserializers take non-None data.
+    """
+    try:
+        return _deserializers[klass]
+    except KeyError:
+        pass
+    with _deserializers_lock:
+        if klass not in _deserializers:
+            _compile(klass)
+        return _deserializers[klass]
+
+
+def _compile(klass):
+    key = klass
+    if isinstance(klass, records.RecordSpec):
+        _deserializers[key] = records.compile_spec(klass)
+        return
+    if type(klass) == str:
+        if klass.startswith('list['):
+            sub_kls = re.match(r'list\[(.*)\]', klass).group(1)
+            _deserializers[key] = _list_deserializer(deserializer(sub_kls))
+            return
+        if klass.startswith('dict('):
+            sub_kls = re.match(r'dict\(([^,]*), (.*)\)', klass).group(2)
+            _deserializers[key] = _dict_deserializer(deserializer(sub_kls))
+            return
+
+        # convert str to class
+        if klass in ApiClient.NATIVE_TYPES_MAPPING:
+            klass = ApiClient.NATIVE_TYPES_MAPPING[klass]
+        else:
+            klass = getattr(swagger_client.models, klass)
+
+    if klass in ApiClient.PRIMITIVE_TYPES:
+        _deserializers[key] = _deserialize_primitive(klass)
+    elif klass == object:
+        _deserializers[key] = _deserialize_object
+    elif klass == datetime.date:
+        _deserializers[key] = _deserialize_date
+    elif klass == datetime.datetime:
+        _deserializers[key] = _deserialize_datetime
+    elif (not klass.swagger_types and
+            'get_real_child_model' not in klass.__dict__):
+        _deserializers[key] = _deserialize_object
+    else:
+        model = _ModelDeserializer(klass)
+        # Registered before its fields are compiled, so that models
+        # referring to themselves resolve to this same deserializer
+        _deserializers[key] = _deserializers[klass] = model
+        try:
+            model.compile()
+        except Exception:
+            del _deserializers[key]
+            _deserializers.pop(klass, None)
+            raise
 
 
 class ApiClient(object):
@@ -59,6 +237,8 @@ class ApiClient(object):
         'datetime': datetime.datetime,
         'object': object,
     }
+    # Transport that sends the requests
+    rest_client_class = rest.RESTClientObject
 
     def __init__(self, configuration=None, header_name=None, header_value=None,
                  cookie=None):
@@ -68,7 +248,7 @@ class ApiClient(object):
 
         # Use the pool property to lazily initialize the ThreadPool.
         self._pool = None
-        self.rest_client = rest.RESTClientObject(configuration)
+        self.rest_client = self.rest_client_class(configuration)
         self.default_headers = {}
         if header_name is not None:
             self.default_headers[header_name] = header_value
@@ -76,6 +256,8 @@ class ApiClient(object):
         # Set default User-Agent.
         self.user_agent = 'Swagger-Codegen/1.0.0/python'
         self.client_side_validation = configuration.client_side_validation
+        # (method, resource path) -> RecordSpec, see set_lightweight_response
+        self.lightweight_responses = {}
 
     def __del__(self):
         if self._pool is not None:
@@ -100,6 +282,54 @@ class ApiClient(object):
     def set_default_header(self, header_name, header_value):
         self.default_headers[header_name] = header_value
 
+    def set_lightweight_response(self, method, resource_path, response_type,
+                                 fields=None):
+        """Returns responses of one endpoint as plain data instead of models.
+
+        With `fields` None, the operation returns the response's JSON as
+        plain dicts and lists. Otherwise it returns `__slots__` records
+        holding only those fields (see records.RecordSpec), under the same
+        attribute names as the model, e.g. for status polling::
+
+            client.set_lightweight_response(
+                'GET', '/transcriptions/{id}', 'Transcription',
+                fields=('self', 'status'))
+            api.transcriptions_get(id).status
+
+        No model objects, property setters or validation are involved.
+
+        :param method: HTTP method of the endpoint.
+        :param resource_path: the endpoint's path template, as in the
+            generated API class.
+        :param response_type: the endpoint's response type, e.g.
+            'Transcription'.
+        :param fields: json keys to keep, or None.
+        """
+        self.lightweight_responses[(method, resource_path)] = \
+            records.RecordSpec(response_type, fields)
+
+    def lightweight_response_for(self, method, path):
+        """The RecordSpec set for the endpoint a concrete `path` belongs to.
+
+        `path` is matched against the path templates given to
+        set_lightweight_response, so e.g. a next link to
+        `/transcriptions/abc/files?skip=100` finds the spec set for
+        `/transcriptions/{id}/files`. Returns None if there is none.
+        """
+        path = path.split('?')[0]
+        spec = self.lightweight_responses.get((method, path))
+        if spec is not None:
+            return spec
+        for (spec_method, template), spec in \
+                six.iteritems(self.lightweight_responses):
+            if spec_method != method:
+                continue
+            pattern = '[^/]+'.join(
+                re.escape(part) for part in re.split(r'\{[^}/]+\}', template))
+            if re.match(pattern + '$', path):
+                return spec
+        return None
+
     def __call_api(
             self, resource_path, method, path_params=None,
             query_params=None, header_params=None, body=None, post_params=None,
@@ -107,6 +337,36 @@ class ApiClient(object):
             _return_http_data_only=None, collection_formats=None,
             _preload_content=True, _request_timeout=None):
 
+        if response_type:
+            response_type = self.lightweight_responses.get(
+                (method, resource_path), response_type)
+
+        url, query_params, header_params, post_params, body = \
+            self.prepare_request(resource_path, path_params, query_params,
+                                 header_params, body, post_params, files,
+                                 auth_settings, collection_formats)
+
+        # perform request and return response
+        response_data = self.request(
+            method, url, query_params=query_params, headers=header_params,
+            post_params=post_params, body=body,
+            _preload_content=_preload_content,
+            _request_timeout=_request_timeout)
+
+        return self.process_response(response_data, response_type,
+                                     _return_http_data_only, _preload_content)
+
+    def prepare_request(self, resource_path, path_params=None,
+                        query_params=None, header_params=None, body=None,
+                        post_params=None, files=None, auth_settings=None,
+                        collection_formats=None):
+        """Builds the url, parameters and body of a request.
+
+        Shared by the synchronous and asyncio clients, which differ only in
+        how the request is then sent.
+
+        :return: tuple (url, query_params, header_params, post_params, body).
+        """
         config = self.configuration
 
         # header parameters
@@ -147,20 +407,22 @@ class ApiClient(object):
         # auth setting
         self.update_params_for_auth(header_params, query_params, auth_settings)
 
-        # body
-        if body:
+        # body; a codec that serializes models takes it as it is
+        if body and not config.json_codec.serializes_models:
             body = self.sanitize_for_serialization(body)
 
         # request url
         url = self.configuration.host + resource_path
 
-        # perform request and return response
-        response_data = self.request(
-            method, url, query_params=query_params, headers=header_params,
-            post_params=post_params, body=body,
-            _preload_content=_preload_content,
-            _request_timeout=_request_timeout)
+        return url, query_params, header_params, post_params, body
+
+    def process_response(self, response_data, response_type=None,
+                         _return_http_data_only=None, _preload_content=True):
+        """Deserializes a response the way `call_api` returns it.
 
+        :return: the deserialized data, or a tuple of (data, status, headers)
+            unless `_return_http_data_only` is set.
+        """
         self.last_response = response_data
 
         return_data = response_data
@@ -233,9 +495,10 @@ class ApiClient(object):
         if response_type == "file":
             return self.__deserialize_file(response)
 
-        # fetch data from response object
+        # fetch data from response object, parsing the body as received
         try:
-            data = json.loads(response.data)
+            data = self.configuration.json_codec.loads(
+                getattr(response, 'raw_data', response.data))
         except ValueError:
             data = response.data
 
@@ -252,33 +515,7 @@ class ApiClient(object):
         if data is None:
             return None
 
-        if type(klass) == str:
-            if klass.startswith('list['):
-                sub_kls = re.match(r'list\[(.*)\]', klass).group(1)
-                return [self.__deserialize(sub_data, sub_kls)
-                        for sub_data in data]
-
-            if klass.startswith('dict('):
-                sub_kls = re.match(r'dict\(([^,]*), (.*)\)', klass).group(2)
-                return {k: self.__deserialize(v, sub_kls)
-                        for k, v in six.iteritems(data)}
-
-            # convert str to class
-            if klass in self.NATIVE_TYPES_MAPPING:
-                klass = self.NATIVE_TYPES_MAPPING[klass]
-            else:
-                klass = getattr(swagger_client.models, klass)
-
-        if klass in self.PRIMITIVE_TYPES:
-            return self.__deserialize_primitive(data, klass)
-        elif klass == object:
-            return self.__deserialize_object(data)
-        elif klass == datetime.date:
-            return self.__deserialize_date(data)
-        elif klass == datetime.datetime:
-            return self.__deserialize_datatime(data)
-        else:
-            return self.__deserialize_model(data, klass)
+        return deserializer(klass)(data)
 
     def call_api(self, resource_path, method,
                  path_params=None, query_params=None, header_params=None,
@@ -538,102 +775,3 @@ class ApiClient(object):
             f.write(response.data)
 
         return path
-
-    def __deserialize_primitive(self, data, klass):
-        """Deserializes string to primitive type.
-
-        :param data: str.
-        :param klass: class literal.
-
-        :return: int, long, float, str, bool.
-        """
-        try:
-            return klass(data)
-        except UnicodeEncodeError:
-            return six.text_type(data)
-        except TypeError:
-            return data
-
-    def __deserialize_object(self, value):
-        """Return a original value.
-
-        :return: object.
-        """
-        return value
-
-    def __deserialize_date(self, string):
-        """Deserializes string to date.
-
-        :param string: str.
-        :return: date.
-        """
-        try:
-            from dateutil.parser import parse
-            return parse(string).date()
-        except ImportError:
-            return string
-        except ValueError:
-            raise rest.ApiException(
-                status=0,
-                reason="Failed to parse `{0}` as date object".format(string)
-            )
-
-    def __deserialize_datatime(self, string):
-        """Deserializes string to datetime.
-
-        The string should be in iso8601 datetime format.
-
-        :param string: str.
-        :return: datetime.
-        """
-        try:
-            from dateutil.parser import parse
-            return parse(string)
-        except ImportError:
-            return string
-        except ValueError:
-            raise rest.ApiException(
-                status=0,
-                reason=(
-                    "Failed to parse `{0}` as datetime object"
-                    .format(string)
-                )
-            )
-
-    def __hasattr(self, object, name):
-        return name in object.__class__.__dict__
-
-    def __deserialize_model(self, data, klass):
-        """Deserializes list or dict to model.
-
-        :param data: dict, list.
-        :param klass: class literal.
-        :return: model object.
-        """
-
-        if (not klass.swagger_types and
-                not self.__hasattr(klass, 'get_real_child_model')):
-            return data
-
-        kwargs = {}
-        if klass.swagger_types is not None:
-            for attr, attr_type in six.iteritems(klass.swagger_types):
-                if (data is not None and
-                        klass.attribute_map[attr] in data and
-                        isinstance(data, (list, dict))):
-                    value = data[klass.attribute_map[attr]]
-                    kwargs[attr] = self.__deserialize(value, attr_type)
-
-        instance = klass(**kwargs)
-
-        if (isinstance(instance, dict) and
-                klass.swagger_types is not None and
-                isinstance(data, dict)):
-            for key, value in data.items():
-                if key not in klass.swagger_types:
-                    instance[key] = value
-        if self.__hasattr(instance, 'get_real_child_model'):
-            klass_name = instance.get_real_child_model(data)
-            if klass_name:
-                instance = self.__deserialize(data, klass_name)
-        return instance
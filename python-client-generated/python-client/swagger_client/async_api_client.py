@@ -0,0 +1,109 @@
+# coding: utf-8
+"""
+    Speech Services API v3.1
+
+    Speech Services API v3.1.  # noqa: E501
+
+    OpenAPI spec version: v3.1
+
+    Generated by: https://github.com/swagger-api/swagger-codegen.git
+"""
+
+from __future__ import absolute_import
+
+from swagger_client.api_client import ApiClient
+from swagger_client import async_rest
+
+
+class AsyncApiClient(ApiClient):
+    """asyncio API client for the generated API classes.
+
+    Pass it as `api_client` to any generated API class and every operation
+    returns a coroutine instead of a result, deserialized into the same
+    models as with ApiClient::
+
+        async with AsyncApiClient(configuration) as client:
+            api = CustomSpeechTranscriptionsApi(api_client=client)
+            transcription = await api.transcriptions_get(id)
+
+    Requests go through one pooled aiohttp session per event loop (see
+    AsyncRESTClientObject), so a single event loop can keep thousands of
+    requests in flight on a few connections, without a thread per request.
+    Requires aiohttp. Close the client with `await client.close()` in each
+    loop that used it, or use it as an async context manager.
+    """
+
+    rest_client_class = async_rest.AsyncRESTClientObject
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        await self.rest_client.close()
+
+    def call_api(self, resource_path, method,
+                 path_params=None, query_params=None, header_params=None,
+                 body=None, post_params=None, files=None,
+                 response_type=None, auth_settings=None, async_req=None,
+                 _return_http_data_only=None, collection_formats=None,
+                 _preload_content=True, _request_timeout=None):
+        """Makes the HTTP request and returns a coroutine of the deserialized
+        data.
+
+        Takes the same parameters as ApiClient.call_api; `async_req` is
+        ignored, since every request is asynchronous.
+        """
+        return self.__call_api(resource_path, method,
+                               path_params, query_params, header_params,
+                               body, post_params, files,
+                               response_type, auth_settings,
+                               _return_http_data_only, collection_formats,
+                               _preload_content, _request_timeout)
+
+    async def __call_api(
+            self, resource_path, method, path_params=None,
+            query_params=None, header_params=None, body=None, post_params=None,
+            files=None, response_type=None, auth_settings=None,
+            _return_http_data_only=None, collection_formats=None,
+            _preload_content=True, _request_timeout=None):
+
+        if response_type:
+            response_type = self.lightweight_responses.get(
+                (method, resource_path), response_type)
+
+        url, query_params, header_params, post_params, body = \
+            self.prepare_request(resource_path, path_params, query_params,
+                                 header_params, body, post_params, files,
+                                 auth_settings, collection_formats)
+
+        # perform request and return response
+        response_data = await self.request(
+            method, url, query_params=query_params, headers=header_params,
+            post_params=post_params, body=body,
+            _preload_content=_preload_content,
+            _request_timeout=_request_timeout)
+
+        return self.process_response(response_data, response_type,
+                                     _return_http_data_only, _preload_content)
+
+    async def request(self, method, url, query_params=None, headers=None,
+                      post_params=None, body=None, _preload_content=True,
+                      _request_timeout=None):
+        """Makes the HTTP request using AsyncRESTClientObject."""
+        if method not in ("GET", "HEAD", "OPTIONS", "POST", "PUT", "PATCH",
+                          "DELETE"):
+            raise ValueError(
+                "http method must be `GET`, `HEAD`, `OPTIONS`,"
+                " `POST`, `PATCH`, `PUT` or `DELETE`."
+            )
+        return await self.rest_client.request(
+            method, url,
+            query_params=query_params,
+            headers=headers,
+            post_params=post_params,
+            _preload_content=_preload_content,
+            _request_timeout=_request_timeout,
+            body=body)
@@ -0,0 +1,254 @@
+# coding: utf-8
+
+"""
+    Speech Services API v3.1
+
+    Speech Services API v3.1.  # noqa: E501
+
+    OpenAPI spec version: v3.1
+
+    Generated by: https://github.com/swagger-api/swagger-codegen.git
+"""
+
+
+from __future__ import absolute_import
+
+import asyncio
+import logging
+import re
+import ssl
+import weakref
+
+import certifi
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from swagger_client.rest import ApiException, RESTResponse
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRESTResponse(RESTResponse):
+
+    def __init__(self, resp, data):
+        self.aiohttp_response = resp
+        self.status = resp.status
+        self.reason = resp.reason
+        self.raw_data = data
+        self._data = None
+
+    def getheaders(self):
+        """Returns a dictionary of the response headers."""
+        return self.aiohttp_response.headers
+
+    def getheader(self, name, default=None):
+        """Returns a given response header."""
+        return self.aiohttp_response.headers.get(name, default)
+
+
+class AsyncRESTClientObject(object):
+    """asyncio transport on a pooled aiohttp session.
+
+    The session keeps up to `maxsize` connections per host alive between
+    requests, so many coroutines polling the same endpoint share a handful of
+    TLS connections. An aiohttp session only works on the event loop it was
+    created on, so each loop that uses the client gets its own, created on
+    first use there; `close()` releases the running loop's session.
+    """
+
+    def __init__(self, configuration, pools_size=4, maxsize=None):
+        if aiohttp is None:
+            raise ImportError(
+                'The asyncio Swagger client requires aiohttp '
+                '(pip install swagger-client[asyncio]).')
+
+        if maxsize is None:
+            if configuration.connection_pool_maxsize is not None:
+                maxsize = configuration.connection_pool_maxsize
+            else:
+                maxsize = 4
+        self.maxsize = maxsize
+
+        # ca_certs
+        if configuration.ssl_ca_cert:
+            ca_certs = configuration.ssl_ca_cert
+        else:
+            # if not set certificate file, use Mozilla's root certificates.
+            ca_certs = certifi.where()
+
+        if configuration.verify_ssl:
+            self.ssl_context = ssl.create_default_context(cafile=ca_certs)
+            if configuration.cert_file:
+                self.ssl_context.load_cert_chain(
+                    configuration.cert_file, keyfile=configuration.key_file)
+            if configuration.assert_hostname is False:
+                self.ssl_context.check_hostname = False
+        else:
+            self.ssl_context = False
+
+        self.proxy = configuration.proxy
+        self.retries = configuration.retries
+        self.rate_limiter = configuration.rate_limiter
+        self.codec = configuration.json_codec
+        # event loop -> its session; dropped along with a loop that is gone
+        self._sessions = weakref.WeakKeyDictionary()
+
+    def _session(self):
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=self.maxsize,
+                                             ssl=self.ssl_context)
+            session = self._sessions[loop] = aiohttp.ClientSession(
+                connector=connector)
+        return session
+
+    async def close(self):
+        """Close the running event loop's session."""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
+    async def request(self, method, url, query_params=None, headers=None,
+                      body=None, post_params=None, _preload_content=True,
+                      _request_timeout=None):
+        """Perform requests.
+
+        :param method: http request method
+        :param url: http request url
+        :param query_params: query parameters in the url
+        :param headers: http request headers
+        :param body: request json body, for `application/json`
+        :param post_params: request post parameters,
+                            `application/x-www-form-urlencoded`
+                            and `multipart/form-data`
+        :param _preload_content: if False, the aiohttp.ClientResponse object
+                                 will be returned without reading/decoding
+                                 response data. Default is True.
+        :param _request_timeout: timeout setting for this request. If one
+                                 number provided, it will be total request
+                                 timeout. It can also be a pair (tuple) of
+                                 (connection, read) timeouts.
+        """
+        method = method.upper()
+        assert method in ['GET', 'HEAD', 'DELETE', 'POST', 'PUT',
+                          'PATCH', 'OPTIONS']
+
+        if post_params and body:
+            raise ValueError(
+                "body parameter cannot be used with post_params parameter."
+            )
+
+        post_params = post_params or {}
+        headers = headers or {}
+
+        timeout = None
+        if _request_timeout:
+            if isinstance(_request_timeout, (int, float)):
+                timeout = aiohttp.ClientTimeout(total=_request_timeout)
+            elif (isinstance(_request_timeout, tuple) and
+                  len(_request_timeout) == 2):
+                timeout = aiohttp.ClientTimeout(
+                    connect=_request_timeout[0],
+                    sock_read=_request_timeout[1])
+
+        if 'Content-Type' not in headers:
+            headers['Content-Type'] = 'application/json'
+
+        args = {
+            "method": method,
+            "url": url,
+            "headers": headers,
+            "params": query_params or None,
+            "proxy": self.proxy,
+        }
+        if timeout is not None:
+            args["timeout"] = timeout
+
+        # For `POST`, `PUT`, `PATCH`, `OPTIONS`, `DELETE`
+        if method in ['POST', 'PUT', 'PATCH', 'OPTIONS', 'DELETE']:
+            if re.search('json', headers['Content-Type'], re.IGNORECASE):
+                request_body = '{}'
+                if body is not None:
+                    request_body = self.codec.dumps(body)
+                args["data"] = request_body
+            elif headers['Content-Type'] == 'application/x-www-form-urlencoded':  # noqa: E501
+                args["data"] = aiohttp.FormData(post_params)
+            elif headers['Content-Type'] == 'multipart/form-data':
+                # must del headers['Content-Type'], or the correct
+                # Content-Type which generated by aiohttp will be
+                # overwritten.
+                del headers['Content-Type']
+                data = aiohttp.FormData()
+                for param in post_params:
+                    k, v = param
+                    if isinstance(v, tuple) and len(v) == 3:
+                        data.add_field(k,
+                                       value=v[1],
+                                       filename=v[0],
+                                       content_type=v[2])
+                    else:
+                        data.add_field(k, v)
+                args["data"] = data
+            # Pass a `string` parameter directly in the body to support
+            # other content types than Json when `body` argument is provided
+            # in serialized form
+            elif isinstance(body, str):
+                args["data"] = body
+            else:
+                # Cannot generate the request from given parameters
+                msg = """Cannot prepare a request message for provided
+                         arguments. Please check that your arguments match
+                         declared content type."""
+                raise ApiException(status=0, reason=msg)
+
+        # Form data is consumed when sent, so it cannot be sent again
+        retries = self.retries
+        if isinstance(args.get("data"), aiohttp.FormData):
+            retries = None
+
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                delay = self.rate_limiter.reserve()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            try:
+                r = await self._session().request(**args)
+            except aiohttp.ClientSSLError as e:
+                msg = "{0}\n{1}".format(type(e).__name__, str(e))
+                raise ApiException(status=0, reason=msg)
+
+            delay = None
+            if retries is not None:
+                delay = retries.delay(method, r.status, attempt,
+                                      r.headers.get('Retry-After'))
+            if delay is None:
+                break
+            logger.warning("%s %s returned %s, retrying in %.1fs (%d/%d)",
+                           method, url, r.status, delay, attempt + 1,
+                           retries.total)
+            if r.status == 429 and self.rate_limiter is not None:
+                # Throttled: hold back every request sharing the limiter
+                self.rate_limiter.pause(delay)
+            r.release()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        if _preload_content or not 200 <= r.status <= 299:
+            # The body stays bytes; the codec parses it without a str copy
+            r = AsyncRESTResponse(r, await r.read())
+
+            # log the size of the response body; its text is only decoded
+            # when something reads `data`
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("response body: %d bytes", len(r.raw_data))
+
+        if not 200 <= r.status <= 299:
+            raise ApiException(http_resp=r)
+
+        return r
@@ -0,0 +1,79 @@
+# coding: utf-8
+
+"""
+    Speech Services API v3.1
+
+    Speech Services API v3.1.  # noqa: E501
+
+    OpenAPI spec version: v3.1
+
+    Generated by: https://github.com/swagger-api/swagger-codegen.git
+"""
+
+
+from __future__ import absolute_import
+
+import datetime
+import json
+
+import six
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def model_to_json(obj):
+    """JSON form of a value the encoder does not know: a swagger model
+    becomes the dict of its set attributes under their json keys."""
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    if hasattr(obj, 'swagger_types'):
+        return {obj.attribute_map[attr]: getattr(obj, attr)
+                for attr, _ in six.iteritems(obj.swagger_types)
+                if getattr(obj, attr) is not None}
+    raise TypeError("Object of type %s is not JSON serializable"
+                    % type(obj).__name__)
+
+
+class StdlibJsonCodec(object):
+    """JSON through the standard library's json module."""
+
+    name = 'json'
+    # Request bodies must be sanitized to plain data before `dumps`
+    serializes_models = False
+
+    def loads(self, data):
+        """Parses a response body, str or UTF-8 bytes."""
+        return json.loads(data)
+
+    def dumps(self, obj):
+        return json.dumps(obj)
+
+
+class OrjsonCodec(object):
+    """JSON through orjson, which parses straight from the response bytes
+    and serializes models, datetimes and nested data in one pass."""
+
+    name = 'orjson'
+    serializes_models = True
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError('OrjsonCodec requires orjson.')
+
+    def loads(self, data):
+        """Parses a response body, str or UTF-8 bytes."""
+        return orjson.loads(data)
+
+    def dumps(self, obj):
+        """Serializes to UTF-8 bytes."""
+        return orjson.dumps(obj, default=model_to_json)
+
+
+def default_codec():
+    """OrjsonCodec when orjson is installed, StdlibJsonCodec otherwise."""
+    if orjson is not None:
+        return OrjsonCodec()
+    return StdlibJsonCodec()
@@ -22,6 +22,9 @@ import urllib3
 import six
 from six.moves import http_client as httplib
 
+from swagger_client.codec import default_codec
+from swagger_client.rest import RetryPolicy
+
 
 class Configuration(object):
     """NOTE: This class is auto generated by the swagger code generator program.
@@ -31,6 +34,8 @@ class Configuration(object):
     """
 
     _default = None
+    # Shared by every model created without a configuration, see get_default
+    _shared = None
 
     def __init__(self):
         """Constructor"""
@@ -90,6 +95,21 @@ class Configuration(object):
         # requests to the same host, which is often the case here.
         # cpu_count * 5 is used as default value to increase performance.
         self.connection_pool_maxsize = multiprocessing.cpu_count() * 5
+        # Number of per-host connection pools the pool manager keeps.
+        self.connection_pool_num_pools = 4
+        # Share one pool manager between every ApiClient with the same
+        # connection settings, so connections (and their TLS sessions) are
+        # kept alive across clients instead of being set up per client.
+        self.connection_pool_shared = True
+        # Retry policy for throttled (429) and unavailable (5xx) responses,
+        # see rest.RetryPolicy. None disables retries.
+        self.retries = RetryPolicy()
+        # JSON codec for request and response bodies, see codec.py: orjson
+        # when it is installed, the standard library's json otherwise.
+        self.json_codec = default_codec()
+        # Client-side rate limiter (e.g. rest.TokenBucket) shared by every
+        # client using this configuration. None sends requests unpaced.
+        self.rate_limiter = None
 
         # Proxy URL
         self.proxy = None
@@ -102,6 +122,21 @@ class Configuration(object):
     @classmethod
     def set_default(cls, default):
         cls._default = default
+        cls._shared = None
+
+    @classmethod
+    def get_default(cls):
+        """The configuration models use when they are not given one.
+
+        This is the configuration set with `set_default`, or else a single
+        Configuration built once, rather than a new one for every model
+        instance. Models only read it, so it must not be modified.
+        """
+        if cls._default is not None:
+            return cls._default
+        if cls._shared is None:
+            cls._shared = Configuration()
+        return cls._shared
 
     @property
     def logger_file(self):
@@ -0,0 +1,54 @@
+# coding: utf-8
+
+"""
+    Speech Services API v3.1
+
+    Speech Services API v3.1.  # noqa: E501
+
+    OpenAPI spec version: v3.1
+
+    Generated by: https://github.com/swagger-api/swagger-codegen.git
+"""
+
+
+from __future__ import absolute_import
+
+import importlib
+
+
+def attach(package_name, submodule_attrs, submodules=()):
+    """Module `__getattr__`, `__dir__` and `__all__` for a lazy package.
+
+    `submodule_attrs` maps a submodule (relative to the package) to the names
+    the package re-exports from it, e.g.
+    ``{'models.transcription': ['Transcription']}``. Neither is imported
+    until first accessed (PEP 562); the value is then stored in the package
+    globals, so later lookups are plain attribute reads. Names in
+    `submodules`, and the first component of each submodule in
+    `submodule_attrs`, resolve to the submodule itself.
+    """
+    attr_to_module = {}
+    for module, attrs in submodule_attrs.items():
+        for attr in attrs:
+            attr_to_module[attr] = module
+    submodules = set(submodules)
+    submodules.update(module.split('.')[0] for module in submodule_attrs)
+    package = importlib.import_module(package_name)
+
+    def __getattr__(name):
+        if name in attr_to_module:
+            module = importlib.import_module(
+                '%s.%s' % (package_name, attr_to_module[name]))
+            value = getattr(module, name)
+        elif name in submodules:
+            value = importlib.import_module('%s.%s' % (package_name, name))
+        else:
+            raise AttributeError("module %r has no attribute %r"
+                                 % (package_name, name))
+        setattr(package, name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(package)) | set(attr_to_module) | submodules)
+
+    return __getattr__, __dir__, sorted(attr_to_module)
@@ -45,7 +45,7 @@ class BaseModel(object):
     def __init__(self, links=None, properties=None, _configuration=None):  # noqa: E501
         """BaseModel - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._links = None
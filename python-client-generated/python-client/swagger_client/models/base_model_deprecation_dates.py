@@ -45,7 +45,7 @@ class BaseModelDeprecationDates(object):
     def __init__(self, adaptation_date_time=None, transcription_date_time=None, _configuration=None):  # noqa: E501
         """BaseModelDeprecationDates - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._adaptation_date_time = None
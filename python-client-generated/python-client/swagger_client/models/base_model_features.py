@@ -43,7 +43,7 @@ class BaseModelFeatures(object):
     def __init__(self, supports_adaptations_with=None, _configuration=None):  # noqa: E501
         """BaseModelFeatures - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._supports_adaptations_with = None
@@ -45,7 +45,7 @@ class BaseModelProperties(object):
     def __init__(self, deprecation_dates=None, features=None, _configuration=None):  # noqa: E501
         """BaseModelProperties - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._deprecation_dates = None
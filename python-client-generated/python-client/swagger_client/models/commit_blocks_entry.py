@@ -45,7 +45,7 @@ class CommitBlocksEntry(object):
     def __init__(self, kind=None, id=None, _configuration=None):  # noqa: E501
         """CommitBlocksEntry - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._kind = None
@@ -49,7 +49,7 @@ class Component(object):
     def __init__(self, message=None, name=None, status=None, type=None, _configuration=None):  # noqa: E501
         """Component - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._message = None
@@ -55,7 +55,7 @@ class CustomModel(object):
     def __init__(self, project=None, links=None, properties=None, text=None, base_model=None, datasets=None, custom_properties=None, _configuration=None):  # noqa: E501
         """CustomModel - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._project = None
@@ -43,7 +43,7 @@ class CustomModelDeprecationDates(object):
     def __init__(self, transcription_date_time=None, _configuration=None):  # noqa: E501
         """CustomModelDeprecationDates - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._transcription_date_time = None
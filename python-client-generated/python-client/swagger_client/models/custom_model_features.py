@@ -41,7 +41,7 @@ class CustomModelFeatures(object):
     def __init__(self, _configuration=None):  # noqa: E501
         """CustomModelFeatures - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
         self.discriminator = None
 
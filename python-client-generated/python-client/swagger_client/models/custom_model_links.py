@@ -47,7 +47,7 @@ class CustomModelLinks(object):
     def __init__(self, copy_to=None, files=None, manifest=None, _configuration=None):  # noqa: E501
         """CustomModelLinks - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._copy_to = None
@@ -51,7 +51,7 @@ class CustomModelProperties(object):
     def __init__(self, custom_model_weight_percent=None, deprecation_dates=None, features=None, email=None, error=None, _configuration=None):  # noqa: E501
         """CustomModelProperties - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._custom_model_weight_percent = None
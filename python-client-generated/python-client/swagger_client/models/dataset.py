@@ -67,7 +67,7 @@ class Dataset(object):
     def __init__(self, links=None, properties=None, kind=None, _self=None, display_name=None, description=None, project=None, content_url=None, custom_properties=None, locale=None, last_action_date_time=None, status=None, created_date_time=None, _configuration=None):  # noqa: E501
         """Dataset - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._links = None
@@ -49,7 +49,7 @@ class DatasetLinks(object):
     def __init__(self, files=None, commit_blocks=None, list_blocks=None, upload_blocks=None, _configuration=None):  # noqa: E501
         """DatasetLinks - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._files = None
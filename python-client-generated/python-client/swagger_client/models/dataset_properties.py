@@ -51,7 +51,7 @@ class DatasetProperties(object):
     def __init__(self, accepted_line_count=None, rejected_line_count=None, duration=None, email=None, error=None, _configuration=None):  # noqa: E501
         """DatasetProperties - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._accepted_line_count = None
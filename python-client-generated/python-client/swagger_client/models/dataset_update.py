@@ -49,7 +49,7 @@ class DatasetUpdate(object):
     def __init__(self, project=None, display_name=None, description=None, custom_properties=None, _configuration=None):  # noqa: E501
         """DatasetUpdate - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._project = None
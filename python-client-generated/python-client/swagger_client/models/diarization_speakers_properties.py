@@ -45,7 +45,7 @@ class DiarizationSpeakersProperties(object):
     def __init__(self, min_count=None, max_count=None, _configuration=None):  # noqa: E501
         """DiarizationSpeakersProperties - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._min_count = None
@@ -67,7 +67,7 @@ class Endpoint(object):
     def __init__(self, project=None, links=None, properties=None, _self=None, display_name=None, description=None, text=None, model=None, locale=None, custom_properties=None, last_action_date_time=None, status=None, created_date_time=None, _configuration=None):  # noqa: E501
         """Endpoint - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._project = None
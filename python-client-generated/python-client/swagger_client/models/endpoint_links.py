@@ -55,7 +55,7 @@ class EndpointLinks(object):
     def __init__(self, rest_interactive=None, rest_conversation=None, rest_dictation=None, web_socket_interactive=None, web_socket_conversation=None, web_socket_dictation=None, logs=None, _configuration=None):  # noqa: E501
         """EndpointLinks - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._rest_interactive = None
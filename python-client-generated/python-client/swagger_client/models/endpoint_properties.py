@@ -49,7 +49,7 @@ class EndpointProperties(object):
     def __init__(self, logging_enabled=None, time_to_live=None, email=None, error=None, _configuration=None):  # noqa: E501
         """EndpointProperties - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._logging_enabled = None
@@ -53,7 +53,7 @@ class EndpointUpdate(object):
     def __init__(self, model=None, properties=None, project=None, display_name=None, description=None, custom_properties=None, _configuration=None):  # noqa: E501
         """EndpointUpdate - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._model = None
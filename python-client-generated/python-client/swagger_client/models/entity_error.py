@@ -45,7 +45,7 @@ class EntityError(object):
     def __init__(self, code=None, message=None, _configuration=None):  # noqa: E501
         """EntityError - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._code = None
@@ -43,7 +43,7 @@ class EntityReference(object):
     def __init__(self, _self=None, _configuration=None):  # noqa: E501
         """EntityReference - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self.__self = None
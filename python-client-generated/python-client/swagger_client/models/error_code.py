@@ -59,7 +59,7 @@ class ErrorCode(object):
     def __init__(self, _configuration=None):  # noqa: E501
         """ErrorCode - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
         self.discriminator = None
 
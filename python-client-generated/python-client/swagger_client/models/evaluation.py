@@ -73,7 +73,7 @@ class Evaluation(object):
     def __init__(self, model1=None, model2=None, transcription1=None, transcription2=None, dataset=None, links=None, properties=None, project=None, _self=None, last_action_date_time=None, status=None, created_date_time=None, display_name=None, description=None, custom_properties=None, locale=None, _configuration=None):  # noqa: E501
         """Evaluation - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._model1 = None
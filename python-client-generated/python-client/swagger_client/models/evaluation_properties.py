@@ -77,7 +77,7 @@ class EvaluationProperties(object):
     def __init__(self, word_error_rate2=None, word_error_rate1=None, sentence_error_rate2=None, sentence_count2=None, word_count2=None, correct_word_count2=None, word_substitution_count2=None, word_deletion_count2=None, word_insertion_count2=None, sentence_error_rate1=None, sentence_count1=None, word_count1=None, correct_word_count1=None, word_substitution_count1=None, word_deletion_count1=None, word_insertion_count1=None, email=None, error=None, _configuration=None):  # noqa: E501
         """EvaluationProperties - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._word_error_rate2 = None
@@ -53,7 +53,7 @@ class File(object):
     def __init__(self, kind=None, links=None, created_date_time=None, properties=None, name=None, _self=None, _configuration=None):  # noqa: E501
         """File - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._kind = None
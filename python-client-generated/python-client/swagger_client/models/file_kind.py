@@ -55,7 +55,7 @@ class FileKind(object):
     def __init__(self, _configuration=None):  # noqa: E501
         """FileKind - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
         self.discriminator = None
 
@@ -43,7 +43,7 @@ class FileLinks(object):
     def __init__(self, content_url=None, _configuration=None):  # noqa: E501
         """FileLinks - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._content_url = None
@@ -45,7 +45,7 @@ class FileProperties(object):
     def __init__(self, size=None, duration=None, _configuration=None):  # noqa: E501
         """FileProperties - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._size = None
@@ -51,7 +51,7 @@ class InnerError(object):
     def __init__(self, code=None, details=None, message=None, target=None, inner_error=None, _configuration=None):  # noqa: E501
         """InnerError - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._code = None
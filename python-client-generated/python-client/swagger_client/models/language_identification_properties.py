@@ -45,7 +45,7 @@ class LanguageIdentificationProperties(object):
     def __init__(self, candidate_locales=None, speech_model_mapping=None, _configuration=None):  # noqa: E501
         """LanguageIdentificationProperties - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._candidate_locales = None
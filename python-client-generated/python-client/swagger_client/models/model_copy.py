@@ -43,7 +43,7 @@ class ModelCopy(object):
     def __init__(self, target_subscription_key=None, _configuration=None):  # noqa: E501
         """ModelCopy - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._target_subscription_key = None
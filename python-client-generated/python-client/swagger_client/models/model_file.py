@@ -45,7 +45,7 @@ class ModelFile(object):
     def __init__(self, name=None, content_url=None, _configuration=None):  # noqa: E501
         """ModelFile - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._name = None
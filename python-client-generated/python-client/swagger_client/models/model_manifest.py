@@ -47,7 +47,7 @@ class ModelManifest(object):
     def __init__(self, model=None, model_files=None, properties=None, _configuration=None):  # noqa: E501
         """ModelManifest - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._model = None
@@ -45,7 +45,7 @@ class PaginatedEndpoints(object):
     def __init__(self, values=None, next_link=None, _configuration=None):  # noqa: E501
         """PaginatedEndpoints - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._values = None
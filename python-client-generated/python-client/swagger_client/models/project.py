@@ -57,7 +57,7 @@ class Project(object):
     def __init__(self, links=None, properties=None, _self=None, display_name=None, description=None, locale=None, custom_properties=None, created_date_time=None, _configuration=None):  # noqa: E501
         """Project - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._links = None
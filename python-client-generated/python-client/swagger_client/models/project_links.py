@@ -51,7 +51,7 @@ class ProjectLinks(object):
     def __init__(self, evaluations=None, datasets=None, models=None, endpoints=None, transcriptions=None, _configuration=None):  # noqa: E501
         """ProjectLinks - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._evaluations = None
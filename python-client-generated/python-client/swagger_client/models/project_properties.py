@@ -51,7 +51,7 @@ class ProjectProperties(object):
     def __init__(self, dataset_count=None, evaluation_count=None, model_count=None, transcription_count=None, endpoint_count=None, _configuration=None):  # noqa: E501
         """ProjectProperties - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._dataset_count = None
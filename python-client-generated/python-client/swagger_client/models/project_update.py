@@ -47,7 +47,7 @@ class ProjectUpdate(object):
     def __init__(self, display_name=None, description=None, custom_properties=None, _configuration=None):  # noqa: E501
         """ProjectUpdate - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._display_name = None
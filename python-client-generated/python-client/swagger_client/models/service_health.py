@@ -47,7 +47,7 @@ class ServiceHealth(object):
     def __init__(self, status=None, message=None, components=None, _configuration=None):  # noqa: E501
         """ServiceHealth - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._status = None
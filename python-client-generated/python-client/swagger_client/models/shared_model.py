@@ -55,7 +55,7 @@ class SharedModel(object):
     def __init__(self, _self=None, locale=None, display_name=None, description=None, last_action_date_time=None, status=None, created_date_time=None, _configuration=None):  # noqa: E501
         """SharedModel - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self.__self = None
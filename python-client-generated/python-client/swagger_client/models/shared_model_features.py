@@ -47,7 +47,7 @@ class SharedModelFeatures(object):
     def __init__(self, supports_transcriptions=None, supports_endpoints=None, supports_transcriptions_on_speech_containers=None, _configuration=None):  # noqa: E501
         """SharedModelFeatures - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._supports_transcriptions = None
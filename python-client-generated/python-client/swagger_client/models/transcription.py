@@ -71,7 +71,7 @@ class Transcription(object):
     def __init__(self, links=None, properties=None, _self=None, model=None, project=None, dataset=None, content_urls=None, content_container_url=None, locale=None, display_name=None, description=None, custom_properties=None, last_action_date_time=None, status=None, created_date_time=None, _configuration=None):  # noqa: E501
         """Transcription - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._links = None
@@ -43,7 +43,7 @@ class TranscriptionLinks(object):
     def __init__(self, files=None, _configuration=None):  # noqa: E501
         """TranscriptionLinks - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._files = None
@@ -67,7 +67,7 @@ class TranscriptionProperties(object):
     def __init__(self, diarization_enabled=None, word_level_timestamps_enabled=None, display_form_word_level_timestamps_enabled=None, duration=None, channels=None, destination_container_url=None, punctuation_mode=None, profanity_filter_mode=None, time_to_live=None, diarization=None, language_identification=None, email=None, error=None, _configuration=None):  # noqa: E501
         """TranscriptionProperties - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._diarization_enabled = None
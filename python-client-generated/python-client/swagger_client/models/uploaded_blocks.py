@@ -45,7 +45,7 @@ class UploadedBlocks(object):
     def __init__(self, committed_blocks=None, uncommitted_blocks=None, _configuration=None):  # noqa: E501
         """UploadedBlocks - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._committed_blocks = None
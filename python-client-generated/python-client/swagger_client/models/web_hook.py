@@ -63,7 +63,7 @@ class WebHook(object):
     def __init__(self, web_url=None, links=None, properties=None, _self=None, display_name=None, description=None, events=None, created_date_time=None, last_action_date_time=None, status=None, custom_properties=None, _configuration=None):  # noqa: E501
         """WebHook - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._web_url = None
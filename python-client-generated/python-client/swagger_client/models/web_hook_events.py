@@ -85,7 +85,7 @@ class WebHookEvents(object):
     def __init__(self, dataset_creation=None, dataset_processing=None, dataset_completion=None, dataset_deletion=None, model_creation=None, model_processing=None, model_completion=None, model_deletion=None, evaluation_creation=None, evaluation_processing=None, evaluation_completion=None, evaluation_deletion=None, transcription_creation=None, transcription_processing=None, transcription_completion=None, transcription_deletion=None, endpoint_creation=None, endpoint_processing=None, endpoint_completion=None, endpoint_deletion=None, ping=None, challenge=None, _configuration=None):  # noqa: E501
         """WebHookEvents - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._dataset_creation = None
@@ -45,7 +45,7 @@ class WebHookLinks(object):
     def __init__(self, ping=None, test=None, _configuration=None):  # noqa: E501
         """WebHookLinks - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._ping = None
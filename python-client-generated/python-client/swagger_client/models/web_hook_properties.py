@@ -47,7 +47,7 @@ class WebHookProperties(object):
     def __init__(self, error=None, api_version=None, secret=None, _configuration=None):  # noqa: E501
         """WebHookProperties - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._error = None
@@ -53,7 +53,7 @@ class WebHookUpdate(object):
     def __init__(self, web_url=None, properties=None, events=None, display_name=None, description=None, custom_properties=None, _configuration=None):  # noqa: E501
         """WebHookUpdate - a model defined in Swagger"""  # noqa: E501
         if _configuration is None:
-            _configuration = Configuration()
+            _configuration = Configuration.get_default()
         self._configuration = _configuration
 
         self._web_url = None
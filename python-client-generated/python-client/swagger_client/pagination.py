@@ -0,0 +1,140 @@
+# coding: utf-8
+
+"""
+    Speech Services API v3.1
+
+    Speech Services API v3.1.  # noqa: E501
+
+    OpenAPI spec version: v3.1
+
+    Generated by: https://github.com/swagger-api/swagger-codegen.git
+"""
+
+
+from __future__ import absolute_import
+
+import asyncio
+
+
+class _Fetched(object):
+    """A page fetched in the calling thread, read like an AsyncResult."""
+
+    def __init__(self, page):
+        self.page = page
+
+    def get(self):
+        return self.page
+
+
+class Paginator(object):
+    """Iterates the items of a paginated listing, fetching pages lazily.
+
+    Works with every list operation returning a Paginated* model (`values`
+    and `@nextLink`)::
+
+        for transcription in Paginator(api.transcriptions_list,
+                                       filter="status eq 'Failed'"):
+            ...
+
+    `skip` and `top` window the whole listing: the first `skip` items are
+    skipped by the service, and iteration stops after `top` items without
+    requesting further pages. `page_size` is the `top` sent with the first
+    request; the service carries it over into its next links. Other
+    arguments are passed to the operation.
+
+    Only the page being consumed and, with `prefetch` (the default), the
+    next one are held at a time: the next page is requested on the API
+    client's thread pool while the current one is iterated. With an
+    AsyncApiClient, iterate with `async for`; the next page is then a task
+    on the event loop.
+    """
+
+    def __init__(self, operation, *args, skip=None, top=None, page_size=None,
+                 prefetch=True, **kwargs):
+        self.operation = operation
+        self.api_client = operation.__self__.api_client
+        self.args = args
+        self.kwargs = kwargs
+        if skip is not None:
+            self.kwargs['skip'] = skip
+        if page_size is not None or top is not None:
+            self.kwargs['top'] = min(size for size in (page_size, top)
+                                     if size is not None)
+        self.top = top
+        self.prefetch = prefetch
+
+    def _first_page(self):
+        if self.prefetch:
+            return self.operation(*self.args, async_req=True, **self.kwargs)
+        return _Fetched(self.operation(*self.args, **self.kwargs))
+
+    def _next_page_request(self, page):
+        """call_api arguments for the page after `page`."""
+        host = self.api_client.configuration.host
+        if not page.next_link.startswith(host):
+            raise ValueError("next link %s is not on host %s"
+                             % (page.next_link, host))
+        resource_path = page.next_link[len(host):]
+        # Pages after the first keep the lightweight response the first
+        # one had, looked up by the operation's path template (see
+        # ApiClient.set_lightweight_response)
+        response_type = (
+            self.api_client.lightweight_response_for('GET', resource_path) or
+            type(page).__name__)
+        return dict(resource_path=resource_path, method='GET',
+                    response_type=response_type, auth_settings=['api_key'],
+                    _return_http_data_only=True)
+
+    def _window(self, page, remaining):
+        """The items of `page` to yield and whether to fetch the next."""
+        values = page.values or []
+        if remaining is not None and len(values) >= remaining:
+            return values[:remaining], False
+        return values, bool(page.next_link)
+
+    def __iter__(self):
+        remaining = self.top
+        request = self._first_page()
+        while request is not None:
+            page = request.get()
+            values, more = self._window(page, remaining)
+            next_page = self._next_page_request(page) if more else None
+            del page
+            request = None
+            if next_page is not None and self.prefetch:
+                request = self.api_client.call_api(async_req=True,
+                                                   **next_page)
+            if remaining is not None:
+                remaining -= len(values)
+            for item in values:
+                yield item
+            if next_page is not None and not self.prefetch:
+                request = _Fetched(self.api_client.call_api(**next_page))
+
+    def __aiter__(self):
+        return self._aiter()
+
+    async def _aiter(self):
+        remaining = self.top
+        request = asyncio.ensure_future(
+            self.operation(*self.args, **self.kwargs))
+        try:
+            while request is not None:
+                page = await request
+                values, more = self._window(page, remaining)
+                request = None
+                if more:
+                    request = self.api_client.call_api(
+                        **self._next_page_request(page))
+                    if self.prefetch:
+                        request = asyncio.ensure_future(request)
+                del page
+                if remaining is not None:
+                    remaining -= len(values)
+                for item in values:
+                    yield item
+        finally:
+            if isinstance(request, asyncio.Future):
+                request.cancel()
+            elif request is not None:
+                request.close()
@@ -0,0 +1,161 @@
+# coding: utf-8
+
+"""
+    Speech Services API v3.1
+
+    Speech Services API v3.1.  # noqa: E501
+
+    OpenAPI spec version: v3.1
+
+    Generated by: https://github.com/swagger-api/swagger-codegen.git
+"""
+
+
+from __future__ import absolute_import
+
+import collections
+import re
+
+import six
+
+import swagger_client.models
+
+
+class RecordSpec(collections.namedtuple('RecordSpec',
+                                        ['response_type', 'fields'])):
+    """Which fields of a response to keep, for a lightweight response.
+
+    `fields` is None for the plain JSON dict, or the json keys to keep.
+    Given as a dict, each key maps to None for its plain JSON value or to
+    the fields to keep of the object(s) it holds, e.g.
+    ``{'values': ('self', 'status'), '@nextLink': None}``.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, response_type, fields=None):
+        return super(RecordSpec, cls).__new__(cls, response_type,
+                                              _normalize(fields))
+
+
+def _normalize(fields):
+    if fields is None:
+        return None
+    if isinstance(fields, dict):
+        return tuple((key, _normalize(nested))
+                     for key, nested in sorted(fields.items()))
+    return tuple((key, None) for key in fields)
+
+
+class Record(object):
+    """A response object reduced to a few fields, in `__slots__`.
+
+    Fields are read under the model's attribute names (`status`, `_self`,
+    `next_link`), so code written against the model keeps working for the
+    fields kept.
+    """
+
+    __slots__ = ()
+    # (json_key, attr, converter or None)
+    _fields = ()
+
+    def __init__(self, data):
+        for json_key, attr, convert in self._fields:
+            value = data.get(json_key)
+            if convert is not None and value is not None:
+                value = convert(value)
+            object.__setattr__(self, attr, value)
+
+    def to_dict(self):
+        """Returns the record fields as a dict"""
+        result = {}
+        for _, attr, _ in self._fields:
+            value = getattr(self, attr)
+            if isinstance(value, list):
+                value = [x.to_dict() if hasattr(x, "to_dict") else x
+                         for x in value]
+            elif hasattr(value, "to_dict"):
+                value = value.to_dict()
+            result[attr] = value
+        return result
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, self.to_dict())
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return False
+        return self.to_dict() == other.to_dict()
+
+    def __ne__(self, other):
+        return not self == other
+
+
+def _model_class(type_name):
+    """The model class for a type string, or None for native types."""
+    match = re.match(r'(?:list\[(.*)\]|dict\([^,]*, (.*)\))$', type_name)
+    if match:
+        type_name = match.group(1) or match.group(2)
+    return getattr(swagger_client.models, type_name, None)
+
+
+def _attr_name(json_key):
+    name = re.sub(r'\W', '_', json_key).lstrip('_')
+    if not name or name[0].isdigit() or name in ('self', 'to_dict'):
+        name = '_' + name
+    return name
+
+
+_record_types = {}
+
+
+def record_type(klass, fields):
+    """The Record class keeping `fields` (normalized) of model `klass`."""
+    key = (klass, fields)
+    if key in _record_types:
+        return _record_types[key]
+
+    attrs_by_json_key = {}
+    types_by_json_key = {}
+    if klass is not None:
+        for attr, json_key in six.iteritems(klass.attribute_map):
+            attrs_by_json_key[json_key] = attr
+            types_by_json_key[json_key] = klass.swagger_types[attr]
+
+    record_fields = []
+    for json_key, nested in fields:
+        attr = attrs_by_json_key.get(json_key) or _attr_name(json_key)
+        convert = None
+        if nested is not None:
+            nested_klass = _model_class(types_by_json_key.get(json_key, ''))
+            convert = _converter(record_type(nested_klass, nested))
+        record_fields.append((json_key, attr, convert))
+
+    name = (klass.__name__ if klass is not None else 'Object') + 'Record'
+    cls = type(name, (Record,), {
+        '__slots__': tuple(attr for _, attr, _ in record_fields),
+        '_fields': tuple(record_fields),
+    })
+    _record_types[key] = cls
+    return cls
+
+
+def _converter(cls):
+    """Builds `cls` records from an object, or from each item of a list."""
+    def convert(value):
+        if isinstance(value, list):
+            return [None if item is None else cls(item) for item in value]
+        return cls(value)
+    return convert
+
+
+def _deserialize_raw(data):
+    return data
+
+
+def compile_spec(spec):
+    """A deserializer for `spec` (RecordSpec), see api_client.deserializer."""
+    if spec.fields is None:
+        return _deserialize_raw
+    return _converter(record_type(_model_class(spec.response_type),
+                                  spec.fields))
@@ -13,11 +13,15 @@
 
 from __future__ import absolute_import
 
+import datetime
+import email.utils
 import io
-import json
 import logging
+import random
 import re
 import ssl
+import threading
+import time
 
 import certifi
 # python 2 and python 3 compatibility library
@@ -39,7 +43,22 @@ class RESTResponse(io.IOBase):
         self.urllib3_response = resp
         self.status = resp.status
         self.reason = resp.reason
-        self.data = resp.data
+        # The body as received; `data` is its text, decoded on first use
+        self.raw_data = resp.data
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            if isinstance(self.raw_data, bytes):
+                self._data = self.raw_data.decode('utf8')
+            else:
+                self._data = self.raw_data
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = self.raw_data = value
 
     def getheaders(self):
         """Returns a dictionary of the response headers."""
@@ -50,9 +69,262 @@ class RESTResponse(io.IOBase):
         return self.urllib3_response.headers.get(name, default)
 
 
+class PoolMetrics(object):
+    """Counts requests and the connections opened to serve them.
+
+    Every connection opened is a TCP (and for https, TLS) handshake; every
+    other request went out on a kept-alive connection. Shared by all
+    RESTClientObjects in the process, see `connection_metrics()`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def count_connection(self):
+        with self._lock:
+            self.new_connections += 1
+
+    @property
+    def reused_connections(self):
+        return max(0, self.requests - self.new_connections)
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'new_connections': self.new_connections,
+                'reused_connections': max(
+                    0, self.requests - self.new_connections),
+            }
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.new_connections = 0
+
+
+pool_metrics = PoolMetrics()
+
+
+def connection_metrics():
+    """Requests sent, connections opened and connections reused so far."""
+    return pool_metrics.as_dict()
+
+
+class _CountingHTTPConnection(urllib3.connection.HTTPConnection):
+
+    def connect(self):
+        pool_metrics.count_connection()
+        return super(_CountingHTTPConnection, self).connect()
+
+
+class _CountingHTTPSConnection(urllib3.connection.HTTPSConnection):
+
+    def connect(self):
+        pool_metrics.count_connection()
+        return super(_CountingHTTPSConnection, self).connect()
+
+
+class _CountingHTTPConnectionPool(urllib3.HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(urllib3.HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+_shared_pool_managers = {}
+_shared_pool_managers_lock = threading.Lock()
+
+
+def _new_pool_manager(num_pools, maxsize, pool_args):
+    if pool_args.get('proxy_url'):
+        manager = urllib3.ProxyManager(num_pools=num_pools, maxsize=maxsize,
+                                       **pool_args)
+    else:
+        manager = urllib3.PoolManager(num_pools=num_pools, maxsize=maxsize,
+                                      **pool_args)
+    manager.pool_classes_by_scheme = {
+        'http': _CountingHTTPConnectionPool,
+        'https': _CountingHTTPSConnectionPool,
+    }
+    return manager
+
+
+def shared_pool_manager(num_pools, maxsize, **pool_args):
+    """The process-wide pool manager for these connection settings.
+
+    Clients with the same settings get the same manager, and so reuse each
+    other's kept-alive connections.
+    """
+    key = (num_pools, maxsize, tuple(sorted(pool_args.items())))
+    with _shared_pool_managers_lock:
+        manager = _shared_pool_managers.get(key)
+        if manager is None:
+            manager = _shared_pool_managers[key] = _new_pool_manager(
+                num_pools, maxsize, pool_args)
+        return manager
+
+
+def clear_shared_pool_managers():
+    """Close every shared pool manager; later clients open new ones."""
+    with _shared_pool_managers_lock:
+        managers = list(_shared_pool_managers.values())
+        _shared_pool_managers.clear()
+    for manager in managers:
+        manager.clear()
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None."""  # noqa: E501
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return max(0.0, (retry_at - now).total_seconds())
+
+
+class RetryPolicy(object):
+    """When and how long to wait before sending a request again.
+
+    Responses with a status in `status_forcelist` are retried up to `total`
+    times. The wait is the response's Retry-After when it has one (capped at
+    `max_retry_after`), and otherwise an exponential backoff of
+    `backoff_factor * 2 ** attempt` seconds, capped at `max_backoff`, with
+    full jitter so that throttled clients do not retry in lockstep.
+
+    Only idempotent methods are retried on every listed status. POST and
+    PATCH are retried only on 429, which means the request was rejected
+    before it was processed, so sending it again cannot create a second
+    transcription.
+    """
+
+    IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'PUT', 'DELETE',
+                                    'OPTIONS'])
+
+    def __init__(self, total=5, backoff_factor=1.0, max_backoff=60.0,
+                 max_retry_after=300.0,
+                 status_forcelist=(429, 500, 502, 503, 504),
+                 safe_statuses=(429,)):
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.status_forcelist = frozenset(status_forcelist)
+        self.safe_statuses = frozenset(safe_statuses)
+
+    def is_retryable(self, method, status):
+        if status not in self.status_forcelist:
+            return False
+        return (method in self.IDEMPOTENT_METHODS or
+                status in self.safe_statuses)
+
+    def backoff(self, attempt):
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+
+    def delay(self, method, status, attempt, retry_after=None):
+        """Seconds to wait before retrying, or None to give up.
+
+        :param attempt: number of retries made so far.
+        :param retry_after: the response's Retry-After header, if any.
+        """
+        if attempt >= self.total or not self.is_retryable(method, status):
+            return None
+        seconds = parse_retry_after(retry_after)
+        if seconds is None:
+            return self.backoff(attempt)
+        return min(seconds, self.max_retry_after)
+
+
+class TokenBucket(object):
+    """Client-side rate limiter: `rate` requests per second, bursts of `capacity`.
+
+    Share one bucket between every client using the same subscription, so
+    a batch is paced just under its quota instead of running into 429s.
+    Copies of a Configuration share its bucket.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens +
+                           (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self):
+        """Take a token and return the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds):
+        """Hold back requests for `seconds`, e.g. after a 429."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+_shared_rate_limiters = {}
+_shared_rate_limiters_lock = threading.Lock()
+
+
+def shared_rate_limiter(key, rate, capacity=None):
+    """The process-wide TokenBucket for `key`, e.g. a subscription.
+
+    Created with `rate` and `capacity` on first use.
+    """
+    with _shared_rate_limiters_lock:
+        limiter = _shared_rate_limiters.get(key)
+        if limiter is None:
+            limiter = _shared_rate_limiters[key] = TokenBucket(rate, capacity)
+        return limiter
+
+
+# urllib3 only retries failed connections; responses are left to RetryPolicy
+_CONNECTION_RETRIES = urllib3.Retry(3, respect_retry_after_header=False)
+
+
 class RESTClientObject(object):
 
-    def __init__(self, configuration, pools_size=4, maxsize=None):
+    def __init__(self, configuration, pools_size=None, maxsize=None):
         # urllib3.PoolManager will pass all kw parameters to connectionpool
         # https://github.com/shazow/urllib3/blob/f9409436f83aeb79fbaf090181cd81b784f1b8ce/urllib3/poolmanager.py#L75  # noqa: E501
         # https://github.com/shazow/urllib3/blob/f9409436f83aeb79fbaf090181cd81b784f1b8ce/urllib3/connectionpool.py#L680  # noqa: E501
@@ -72,9 +344,19 @@ class RESTClientObject(object):
             # if not set certificate file, use Mozilla's root certificates.
             ca_certs = certifi.where()
 
-        addition_pool_args = {}
+        pool_args = {
+            'cert_reqs': cert_reqs,
+            'ca_certs': ca_certs,
+            'cert_file': configuration.cert_file,
+            'key_file': configuration.key_file,
+        }
         if configuration.assert_hostname is not None:
-            addition_pool_args['assert_hostname'] = configuration.assert_hostname  # noqa: E501
+            pool_args['assert_hostname'] = configuration.assert_hostname  # noqa: E501
+        if configuration.proxy:
+            pool_args['proxy_url'] = configuration.proxy
+
+        if pools_size is None:
+            pools_size = configuration.connection_pool_num_pools
 
         if maxsize is None:
             if configuration.connection_pool_maxsize is not None:
@@ -82,28 +364,17 @@ class RESTClientObject(object):
             else:
                 maxsize = 4
 
+        self.retries = configuration.retries
+        self.rate_limiter = configuration.rate_limiter
+        self.codec = configuration.json_codec
+
         # https pool manager
-        if configuration.proxy:
-            self.pool_manager = urllib3.ProxyManager(
-                num_pools=pools_size,
-                maxsize=maxsize,
-                cert_reqs=cert_reqs,
-                ca_certs=ca_certs,
-                cert_file=configuration.cert_file,
-                key_file=configuration.key_file,
-                proxy_url=configuration.proxy,
-                **addition_pool_args
-            )
+        if configuration.connection_pool_shared:
+            self.pool_manager = shared_pool_manager(pools_size, maxsize,
+                                                    **pool_args)
         else:
-            self.pool_manager = urllib3.PoolManager(
-                num_pools=pools_size,
-                maxsize=maxsize,
-                cert_reqs=cert_reqs,
-                ca_certs=ca_certs,
-                cert_file=configuration.cert_file,
-                key_file=configuration.key_file,
-                **addition_pool_args
-            )
+            self.pool_manager = _new_pool_manager(pools_size, maxsize,
+                                                  pool_args)
 
     def request(self, method, url, query_params=None, headers=None,
                 body=None, post_params=None, _preload_content=True,
@@ -150,79 +421,81 @@ class RESTClientObject(object):
         if 'Content-Type' not in headers:
             headers['Content-Type'] = 'application/json'
 
-        try:
-            # For `POST`, `PUT`, `PATCH`, `OPTIONS`, `DELETE`
-            if method in ['POST', 'PUT', 'PATCH', 'OPTIONS', 'DELETE']:
-                if query_params:
-                    url += '?' + urlencode(query_params)
-                if re.search('json', headers['Content-Type'], re.IGNORECASE):
-                    request_body = '{}'
-                    if body is not None:
-                        request_body = json.dumps(body)
-                    r = self.pool_manager.request(
-                        method, url,
-                        body=request_body,
-                        preload_content=_preload_content,
-                        timeout=timeout,
-                        headers=headers)
-                elif headers['Content-Type'] == 'application/x-www-form-urlencoded':  # noqa: E501
-                    r = self.pool_manager.request(
-                        method, url,
-                        fields=post_params,
-                        encode_multipart=False,
-                        preload_content=_preload_content,
-                        timeout=timeout,
-                        headers=headers)
-                elif headers['Content-Type'] == 'multipart/form-data':
-                    # must del headers['Content-Type'], or the correct
-                    # Content-Type which generated by urllib3 will be
-                    # overwritten.
-                    del headers['Content-Type']
-                    r = self.pool_manager.request(
-                        method, url,
-                        fields=post_params,
-                        encode_multipart=True,
-                        preload_content=_preload_content,
-                        timeout=timeout,
-                        headers=headers)
-                # Pass a `string` parameter directly in the body to support
-                # other content types than Json when `body` argument is
-                # provided in serialized form
-                elif isinstance(body, str):
-                    request_body = body
-                    r = self.pool_manager.request(
-                        method, url,
-                        body=request_body,
-                        preload_content=_preload_content,
-                        timeout=timeout,
-                        headers=headers)
-                else:
-                    # Cannot generate the request from given parameters
-                    msg = """Cannot prepare a request message for provided
-                             arguments. Please check that your arguments match
-                             declared content type."""
-                    raise ApiException(status=0, reason=msg)
-            # For `GET`, `HEAD`
+        # For `POST`, `PUT`, `PATCH`, `OPTIONS`, `DELETE`
+        if method in ['POST', 'PUT', 'PATCH', 'OPTIONS', 'DELETE']:
+            if query_params:
+                url += '?' + urlencode(query_params)
+            if re.search('json', headers['Content-Type'], re.IGNORECASE):
+                request_body = '{}'
+                if body is not None:
+                    request_body = self.codec.dumps(body)
+                args = {'body': request_body}
+            elif headers['Content-Type'] == 'application/x-www-form-urlencoded':  # noqa: E501
+                args = {'fields': post_params, 'encode_multipart': False}
+            elif headers['Content-Type'] == 'multipart/form-data':
+                # must del headers['Content-Type'], or the correct
+                # Content-Type which generated by urllib3 will be
+                # overwritten.
+                del headers['Content-Type']
+                args = {'fields': post_params, 'encode_multipart': True}
+            # Pass a `string` parameter directly in the body to support
+            # other content types than Json when `body` argument is
+            # provided in serialized form
+            elif isinstance(body, str):
+                args = {'body': body}
             else:
-                r = self.pool_manager.request(method, url,
-                                              fields=query_params,
-                                              preload_content=_preload_content,
-                                              timeout=timeout,
-                                              headers=headers)
-        except urllib3.exceptions.SSLError as e:
-            msg = "{0}\n{1}".format(type(e).__name__, str(e))
-            raise ApiException(status=0, reason=msg)
+                # Cannot generate the request from given parameters
+                msg = """Cannot prepare a request message for provided
+                         arguments. Please check that your arguments match
+                         declared content type."""
+                raise ApiException(status=0, reason=msg)
+        # For `GET`, `HEAD`
+        else:
+            args = {'fields': query_params}
+
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            pool_metrics.count_request()
+            try:
+                r = self.pool_manager.request(
+                    method, url,
+                    preload_content=_preload_content,
+                    timeout=timeout,
+                    headers=headers,
+                    retries=_CONNECTION_RETRIES,
+                    **args)
+            except urllib3.exceptions.SSLError as e:
+                msg = "{0}\n{1}".format(type(e).__name__, str(e))
+                raise ApiException(status=0, reason=msg)
+
+            delay = None
+            if self.retries is not None:
+                delay = self.retries.delay(method, r.status, attempt,
+                                           r.headers.get('Retry-After'))
+            if delay is None:
+                break
+            logger.warning("%s %s returned %s, retrying in %.1fs (%d/%d)",
+                           method, url, r.status, delay, attempt + 1,
+                           self.retries.total)
+            if r.status == 429 and self.rate_limiter is not None:
+                # Throttled: hold back every request sharing the limiter
+                self.rate_limiter.pause(delay)
+            if not _preload_content:
+                r.drain_conn()
+                r.release_conn()
+            time.sleep(delay)
+            attempt += 1
 
         if _preload_content:
+            # The body stays bytes; the codec parses it without a str copy
             r = RESTResponse(r)
 
-            # In the python 3, the response.data is bytes.
-            # we need to decode it to string.
-            if six.PY3:
-                r.data = r.data.decode('utf8')
-
-            # log response body
-            logger.debug("response body: %s", r.data)
+            # log the size of the response body; its text is only decoded
+            # when something reads `data`
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("response body: %d bytes", len(r.raw_data))
 
         if not 200 <= r.status <= 299:
             raise ApiException(http_resp=r)
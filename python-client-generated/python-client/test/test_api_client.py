@@ -0,0 +1,157 @@
+# coding: utf-8
+
+"""
+    Speech Services API v3.1
+
+    Speech Services API v3.1.  # noqa: E501
+
+    OpenAPI spec version: v3.1
+
+    Generated by: https://github.com/swagger-api/swagger-codegen.git
+"""
+
+
+from __future__ import absolute_import
+
+import datetime
+import json
+import unittest
+
+import swagger_client
+from swagger_client import api_client
+
+
+class _Response(object):
+
+    def __init__(self, body):
+        self.data = json.dumps(body)
+
+
+class TestApiClientDeserialize(unittest.TestCase):
+    """ApiClient deserialization unit tests"""
+
+    def setUp(self):
+        self.client = swagger_client.ApiClient()
+
+    def tearDown(self):
+        pass
+
+    def test_page(self):
+        page = self.client.deserialize(_Response({
+            "values": [{
+                "self": "https://host/transcriptions/1",
+                "displayName": "one",
+                "locale": "en-US",
+                "status": "Succeeded",
+                "contentUrls": ["https://a", None],
+                "customProperties": {"key": "value"},
+                "properties": {"channels": [0, 1], "diarization": None},
+                "createdDateTime": "2024-03-01T10:12:07Z",
+            }],
+            "@nextLink": None,
+        }), "PaginatedTranscriptions")
+        self.assertIsInstance(page, swagger_client.PaginatedTranscriptions)
+        self.assertIsNone(page.next_link)
+        transcription = page.values[0]
+        self.assertIsInstance(transcription, swagger_client.Transcription)
+        self.assertEqual(transcription._self, "https://host/transcriptions/1")
+        self.assertEqual(transcription.status, "Succeeded")
+        self.assertEqual(transcription.content_urls, ["https://a", None])
+        self.assertEqual(transcription.custom_properties, {"key": "value"})
+        self.assertEqual(transcription.properties.channels, [0, 1])
+        self.assertIsNone(transcription.properties.diarization)
+        self.assertEqual(
+            transcription.created_date_time,
+            datetime.datetime(2024, 3, 1, 10, 12, 7,
+                              tzinfo=datetime.timezone.utc))
+
+    def test_native_types(self):
+        self.assertEqual(
+            self.client.deserialize(_Response({"a": "1"}), "dict(str, int)"),
+            {"a": 1})
+        self.assertEqual(
+            self.client.deserialize(_Response([1, 2]), "list[str]"),
+            ["1", "2"])
+        self.assertEqual(
+            self.client.deserialize(_Response({"x": [1]}), "object"),
+            {"x": [1]})
+        self.assertEqual(
+            self.client.deserialize(_Response("2024-03-01"), "date"),
+            datetime.date(2024, 3, 1))
+
+    def test_plans_are_memoized(self):
+        plan = api_client.deserializer("list[Transcription]")
+        self.assertIs(api_client.deserializer("list[Transcription]"), plan)
+        model = api_client.deserializer("Transcription")
+        self.assertIs(api_client.deserializer(swagger_client.Transcription),
+                      model)
+        json_keys = [json_key for json_key, _, _ in model.fields]
+        self.assertIn("self", json_keys)
+        self.assertIn("createdDateTime", json_keys)
+
+    def test_unparseable_datetime(self):
+        with self.assertRaises(swagger_client.rest.ApiException):
+            self.client.deserialize(_Response("not a date"), "datetime")
+
+
+class TestLightweightResponses(unittest.TestCase):
+    """ApiClient.set_lightweight_response unit tests"""
+
+    def setUp(self):
+        self.client = swagger_client.ApiClient()
+
+        def request(method, url, **kwargs):
+            response = _Response(self.body)
+            response.status = 200
+            response.getheaders = lambda: {}
+            return response
+        self.client.request = request
+        self.api = swagger_client.CustomSpeechTranscriptionsApi(
+            api_client=self.client)
+        self.body = {
+            "self": "https://host/transcriptions/1",
+            "displayName": "one",
+            "locale": "en-US",
+            "status": "Running",
+            "properties": {"channels": [0, 1]},
+        }
+
+    def test_record(self):
+        self.client.set_lightweight_response(
+            'GET', '/transcriptions/{id}', 'Transcription',
+            fields=('self', 'status'))
+        transcription = self.api.transcriptions_get("1")
+        self.assertNotIsInstance(transcription, swagger_client.Transcription)
+        self.assertEqual(transcription.status, "Running")
+        self.assertEqual(transcription._self, "https://host/transcriptions/1")
+        self.assertFalse(hasattr(transcription, "__dict__"))
+        self.assertFalse(hasattr(transcription, "locale"))
+        self.assertEqual(transcription.to_dict(), {
+            "_self": "https://host/transcriptions/1", "status": "Running"})
+
+    def test_raw_dict(self):
+        self.client.set_lightweight_response(
+            'GET', '/transcriptions/{id}', 'Transcription')
+        self.assertEqual(self.api.transcriptions_get("1"), self.body)
+
+    def test_nested_records(self):
+        self.client.set_lightweight_response(
+            'GET', '/transcriptions', 'PaginatedTranscriptions',
+            fields={'values': ('self', 'status'), '@nextLink': None})
+        self.body = {"values": [self.body, self.body], "@nextLink": None}
+        page = self.api.transcriptions_list()
+        self.assertIsNone(page.next_link)
+        self.assertEqual([t.status for t in page.values],
+                         ["Running", "Running"])
+
+    def test_other_endpoints_unaffected(self):
+        self.client.set_lightweight_response(
+            'GET', '/transcriptions/{id}', 'Transcription',
+            fields=('self', 'status'))
+        self.body = {"values": [self.body]}
+        page = self.api.transcriptions_list()
+        self.assertIsInstance(page.values[0], swagger_client.Transcription)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,259 @@
+# coding: utf-8
+
+"""
+    Speech Services API v3.1
+
+    Speech Services API v3.1.  # noqa: E501
+
+    OpenAPI spec version: v3.1
+
+    Generated by: https://github.com/swagger-api/swagger-codegen.git
+"""
+
+
+from __future__ import absolute_import
+
+import asyncio
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import swagger_client
+from swagger_client import async_rest
+from swagger_client.async_api_client import AsyncApiClient
+from swagger_client.rest import ApiException
+
+
+class _Response(object):
+
+    def __init__(self, status, data, headers=None):
+        self.status = status
+        self.reason = "OK" if status < 400 else "Error"
+        self.data = data
+        self.headers = headers or {}
+
+    def getheaders(self):
+        return self.headers
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name, default)
+
+
+class _Transport(object):
+    """Answers requests from a dict of (method, url) -> (status, body)."""
+
+    responses = {}
+
+    def __init__(self, configuration):
+        self.requests = []
+
+    async def request(self, method, url, query_params=None, headers=None,
+                      body=None, post_params=None, _preload_content=True,
+                      _request_timeout=None):
+        self.requests.append((method, url, query_params, headers, body))
+        await asyncio.sleep(0)
+        status, data = self.responses[(method, url)]
+        r = _Response(status, json.dumps(data))
+        if not 200 <= r.status <= 299:
+            raise ApiException(http_resp=r)
+        return r
+
+    async def close(self):
+        pass
+
+
+class _TestApiClient(AsyncApiClient):
+    rest_client_class = _Transport
+
+
+class TestAsyncApiClient(unittest.TestCase):
+    """AsyncApiClient unit tests"""
+
+    def setUp(self):
+        configuration = swagger_client.Configuration()
+        configuration.host = "https://example.test/speechtotext/v3.1"
+        configuration.api_key['Ocp-Apim-Subscription-Key'] = 'key'
+        self.client = _TestApiClient(configuration)
+        self.api = swagger_client.CustomSpeechTranscriptionsApi(
+            api_client=self.client)
+        _Transport.responses = {
+            ("GET", "https://example.test/speechtotext/v3.1/transcriptions/abc"): (200, {
+                "self": "https://example.test/speechtotext/v3.1/transcriptions/abc",
+                "displayName": "Simple transcription",
+                "locale": "en-US",
+                "status": "Running",
+                "properties": {"diarizationEnabled": True},
+            }),
+            ("GET", "https://example.test/speechtotext/v3.1/transcriptions/gone"): (404, {
+                "code": "NotFound",
+            }),
+        }
+
+    def tearDown(self):
+        pass
+
+    def test_transcriptions_get(self):
+        """Operations are awaitable and deserialize into the usual models"""
+        transcription = asyncio.run(self.api.transcriptions_get("abc"))
+        self.assertIsInstance(transcription, swagger_client.Transcription)
+        self.assertEqual(transcription.status, "Running")
+        self.assertTrue(transcription.properties.diarization_enabled)
+        method, url, _, headers, _ = self.client.rest_client.requests[0]
+        self.assertEqual(headers['Ocp-Apim-Subscription-Key'], 'key')
+
+    def test_with_http_info(self):
+        data, status, headers = asyncio.run(
+            self.api.transcriptions_get_with_http_info("abc"))
+        self.assertEqual(status, 200)
+        self.assertEqual(data.locale, "en-US")
+
+    def test_concurrent_requests(self):
+        async def get_all():
+            return await asyncio.gather(
+                *(self.api.transcriptions_get("abc") for _ in range(100)))
+
+        transcriptions = asyncio.run(get_all())
+        self.assertEqual(len(transcriptions), 100)
+        self.assertEqual(len(self.client.rest_client.requests), 100)
+
+    def test_error_status(self):
+        with self.assertRaises(ApiException) as raised:
+            asyncio.run(self.api.transcriptions_get("gone"))
+        self.assertEqual(raised.exception.status, 404)
+
+
+class _ClientResponse(object):
+
+    status = 200
+    reason = "OK"
+    headers = {}
+
+    async def read(self):
+        return b'{}'
+
+
+class _ClientSession(object):
+    """Records the arguments of every request instead of sending it."""
+
+    closed = False
+    instances = []
+
+    def __init__(self, connector=None):
+        self.requests = []
+        self.instances.append(self)
+
+    async def request(self, **kwargs):
+        self.requests.append(kwargs)
+        return _ClientResponse()
+
+
+class _Aiohttp(object):
+    """The parts of aiohttp AsyncRESTClientObject uses, without a network."""
+
+    ClientSession = _ClientSession
+
+    class FormData(object):
+        pass
+
+    class ClientSSLError(Exception):
+        pass
+
+    @staticmethod
+    def TCPConnector(**kwargs):
+        return None
+
+
+class TestAsyncRESTClientObject(unittest.TestCase):
+    """AsyncRESTClientObject builds the same requests as RESTClientObject"""
+
+    def setUp(self):
+        patcher = mock.patch.object(async_rest, 'aiohttp', _Aiohttp)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.rest_client = async_rest.AsyncRESTClientObject(
+            swagger_client.Configuration())
+
+    def sent_data(self, method, body):
+        asyncio.run(self.rest_client.request(
+            method, "https://example.test/speechtotext/v3.1/transcriptions",
+            body=body))
+        return _ClientSession.instances[-1].requests[-1]["data"]
+
+    def test_json_body(self):
+        data = self.sent_data("POST", {"locale": "en-US"})
+        self.assertEqual(json.loads(data), {"locale": "en-US"})
+
+    def test_json_request_without_body(self):
+        """An empty JSON object is sent, as by the sync client"""
+        for method in ['POST', 'PUT', 'PATCH', 'OPTIONS', 'DELETE']:
+            with self.subTest(method=method):
+                self.assertEqual(self.sent_data(method, None), '{}')
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({
+            "self": "http://127.0.0.1/speechtotext/v3.1" + self.path,
+            "displayName": "Simple transcription",
+            "locale": "en-US",
+            "status": "Succeeded",
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@unittest.skipIf(async_rest.aiohttp is None, "aiohttp is not installed")
+class TestAsyncRoundTrip(unittest.TestCase):
+    """AsyncApiClient against a local HTTP server, through aiohttp"""
+
+    def setUp(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        configuration = swagger_client.Configuration()
+        configuration.host = "http://127.0.0.1:%d/speechtotext/v3.1" % (
+            server.server_address[1])
+        self.client = AsyncApiClient(configuration)
+        self.api = swagger_client.CustomSpeechTranscriptionsApi(
+            api_client=self.client)
+
+    async def get(self, transcription_id):
+        try:
+            return await self.api.transcriptions_get(transcription_id)
+        finally:
+            await self.client.close()
+
+    def test_transcriptions_get(self):
+        transcription = asyncio.run(self.get("abc"))
+        self.assertIsInstance(transcription, swagger_client.Transcription)
+        self.assertEqual(transcription.status, "Succeeded")
+
+    def test_each_event_loop_gets_a_session(self):
+        """A client first used on one event loop also works on another"""
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        self.addCleanup(loop.run_until_complete, self.client.close())
+        first = loop.run_until_complete(self.api.transcriptions_get("a"))
+        self.assertEqual(first._self.rsplit("/", 1)[1], "a")
+        transcription = asyncio.run(self.get("b"))
+        self.assertEqual(transcription._self.rsplit("/", 1)[1], "b")
+        # The first loop's session is still its own
+        second = loop.run_until_complete(self.api.transcriptions_get("c"))
+        self.assertEqual(second._self.rsplit("/", 1)[1], "c")
+
+
+if __name__ == '__main__':
+    unittest.main()
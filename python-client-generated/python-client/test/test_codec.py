@@ -0,0 +1,95 @@
+# coding: utf-8
+
+"""
+    Speech Services API v3.1
+
+    Speech Services API v3.1.  # noqa: E501
+
+    OpenAPI spec version: v3.1
+
+    Generated by: https://github.com/swagger-api/swagger-codegen.git
+"""
+
+
+from __future__ import absolute_import
+
+import datetime
+import json
+import unittest
+
+import swagger_client
+from swagger_client import codec
+
+
+class _Response(object):
+
+    def __init__(self, body):
+        self.raw_data = json.dumps(body).encode('utf8')
+
+    @property
+    def data(self):
+        return self.raw_data.decode('utf8')
+
+
+def _transcription():
+    return swagger_client.Transcription(
+        display_name="one",
+        locale="en-US",
+        content_urls=["https://a"],
+        custom_properties={"key": "value"},
+        created_date_time=datetime.datetime(
+            2024, 3, 1, 10, 12, 7, tzinfo=datetime.timezone.utc),
+        properties=swagger_client.TranscriptionProperties(
+            diarization_enabled=True, channels=[0, 1]),
+    )
+
+
+class TestCodec(unittest.TestCase):
+    """JSON codec unit tests"""
+
+    def setUp(self):
+        self.client = swagger_client.ApiClient()
+        self.codecs = [codec.StdlibJsonCodec()]
+        if codec.orjson is not None:
+            self.codecs.append(codec.OrjsonCodec())
+
+    def tearDown(self):
+        pass
+
+    def _encoded(self, json_codec, body):
+        if not json_codec.serializes_models:
+            body = self.client.sanitize_for_serialization(body)
+        return json.loads(json_codec.dumps(body))
+
+    def test_dumps_models(self):
+        """Every codec sends a model as the sanitized JSON"""
+        expected = self.client.sanitize_for_serialization(_transcription())
+        for json_codec in self.codecs:
+            self.assertEqual(self._encoded(json_codec, _transcription()),
+                             expected, json_codec.name)
+            self.assertEqual(
+                self._encoded(json_codec, {"items": [_transcription()]}),
+                {"items": [expected]}, json_codec.name)
+
+    def test_loads_bytes(self):
+        body = {"values": [{"self": "https://host/files/1",
+                            "name": "contenturl_0.json",
+                            "kind": "Transcription"}]}
+        for json_codec in self.codecs:
+            self.client.configuration.json_codec = json_codec
+            files = self.client.deserialize(_Response(body), "PaginatedFiles")
+            self.assertEqual(files.values[0].name, "contenturl_0.json")
+
+    def test_default_codec(self):
+        expected = 'orjson' if codec.orjson is not None else 'json'
+        self.assertEqual(codec.default_codec().name, expected)
+        self.assertEqual(swagger_client.Configuration().json_codec.name,
+                         expected)
+
+    def test_unserializable(self):
+        with self.assertRaises(TypeError):
+            codec.model_to_json(object())
+
+
+if __name__ == '__main__':
+    unittest.main()
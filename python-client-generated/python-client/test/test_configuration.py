@@ -0,0 +1,51 @@
+# coding: utf-8
+
+"""
+    Speech Services API v3.1
+
+    Speech Services API v3.1.  # noqa: E501
+
+    OpenAPI spec version: v3.1
+
+    Generated by: https://github.com/swagger-api/swagger-codegen.git
+"""
+
+
+from __future__ import absolute_import
+
+import unittest
+
+import swagger_client
+from swagger_client.configuration import Configuration
+
+
+class TestConfiguration(unittest.TestCase):
+    """Configuration unit tests"""
+
+    def tearDown(self):
+        Configuration.set_default(None)
+
+    def test_models_share_default(self):
+        """Models created without a configuration share one"""
+        first = swagger_client.EntityReference(_self="a")
+        second = swagger_client.TranscriptionLinks(files="b")
+        self.assertIs(first._configuration, second._configuration)
+        self.assertIs(first._configuration, Configuration.get_default())
+
+    def test_set_default(self):
+        configuration = Configuration()
+        configuration.client_side_validation = False
+        Configuration.set_default(configuration)
+        self.assertIs(Configuration.get_default(), configuration)
+        # Validation follows the default configuration
+        self.assertIsNone(swagger_client.EntityReference()._self)
+
+    def test_explicit_configuration(self):
+        configuration = Configuration()
+        model = swagger_client.EntityReference(_self="a",
+                                               _configuration=configuration)
+        self.assertIs(model._configuration, configuration)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+# coding: utf-8
+
+"""
+    Speech Services API v3.1
+
+    Speech Services API v3.1.  # noqa: E501
+
+    OpenAPI spec version: v3.1
+
+    Generated by: https://github.com/swagger-api/swagger-codegen.git
+"""
+
+
+from __future__ import absolute_import
+
+import os
+import subprocess
+import sys
+import unittest
+
+import swagger_client
+import swagger_client.api
+import swagger_client.models
+
+
+class TestLazyImports(unittest.TestCase):
+    """Lazy package loading unit tests"""
+
+    def run_fresh(self, code):
+        """Runs `code` in a new interpreter and returns its stdout"""
+        path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=path)
+        return subprocess.check_output([sys.executable, "-c", code], env=env,
+                                       universal_newlines=True).split()
+
+    def test_import_loads_no_apis_or_models(self):
+        loaded = self.run_fresh(
+            "import sys, swagger_client\n"
+            "print(*sorted(m for m in sys.modules if m.startswith('swagger_client')))")
+        self.assertEqual(loaded, ['swagger_client', 'swagger_client.lazy'])
+
+    def test_access_loads_one_module(self):
+        loaded = self.run_fresh(
+            "import sys, swagger_client\n"
+            "swagger_client.Transcription\n"
+            "print(*sorted(m for m in sys.modules if m.startswith('swagger_client.models')))")
+        self.assertEqual(loaded, ['swagger_client.models',
+                                  'swagger_client.models.transcription'])
+
+    def test_exports(self):
+        self.assertIs(swagger_client.Transcription,
+                      swagger_client.models.transcription.Transcription)
+        self.assertIs(swagger_client.models.Transcription,
+                      swagger_client.Transcription)
+        self.assertIs(swagger_client.CustomSpeechTranscriptionsApi,
+                      swagger_client.api.CustomSpeechTranscriptionsApi)
+        self.assertIs(swagger_client.rest.ApiException,
+                      sys.modules['swagger_client.rest'].ApiException)
+        self.assertIn('ApiClient', swagger_client.__all__)
+        self.assertIn('PaginatedFiles', dir(swagger_client.models))
+        self.assertEqual(len(swagger_client.models.__all__), 77)
+
+    def test_star_import(self):
+        namespace = {}
+        exec("from swagger_client.models import *", namespace)
+        self.assertIs(namespace['PaginatedFiles'],
+                      swagger_client.models.PaginatedFiles)
+
+    def test_unknown_name(self):
+        with self.assertRaises(AttributeError):
+            swagger_client.NotAModel
+        self.assertIsNone(getattr(swagger_client.models, 'str', None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,193 @@
+# coding: utf-8
+
+"""
+    Speech Services API v3.1
+
+    Speech Services API v3.1.  # noqa: E501
+
+    OpenAPI spec version: v3.1
+
+    Generated by: https://github.com/swagger-api/swagger-codegen.git
+"""
+
+
+from __future__ import absolute_import
+
+import asyncio
+import json
+import unittest
+
+from six.moves.urllib.parse import parse_qsl, urlparse
+
+import swagger_client
+from swagger_client.async_api_client import AsyncApiClient
+from swagger_client.pagination import Paginator
+
+HOST = "https://example.test/speechtotext/v3.1"
+
+
+class _Response(object):
+
+    def __init__(self, data):
+        self.status = 200
+        self.reason = "OK"
+        self.data = json.dumps(data)
+
+    def getheaders(self):
+        return {}
+
+    def getheader(self, name, default=None):
+        return default
+
+
+class _Transport(object):
+    """Serves `total` transcriptions, or files of a transcription, in pages
+    windowed by `skip` and `top` like the service."""
+
+    total = 0
+
+    def __init__(self, configuration):
+        self.requests = []
+
+    def page(self, url, query_params):
+        parsed = urlparse(url)
+        params = dict(parse_qsl(parsed.query))
+        params.update(query_params or [])
+        self.requests.append(params)
+        skip = int(params.get('skip', 0))
+        top = int(params.get('top', 100))
+        path = parsed.path[len(urlparse(HOST).path):]
+        values = [{"self": "%s%s/%d" % (HOST, path, i), "name": str(i),
+                   "displayName": str(i), "locale": "en-US",
+                   "webUrl": "https://example.test/hook", "events": {}}
+                  for i in range(skip, min(skip + top, self.total))]
+        next_link = None
+        if skip + top < self.total:
+            next_link = "%s%s?skip=%d&top=%d" % (HOST, path, skip + top, top)
+        return _Response({"values": values, "@nextLink": next_link})
+
+    def GET(self, url, query_params=None, headers=None,
+            _preload_content=True, _request_timeout=None):
+        return self.page(url, query_params)
+
+
+class _AsyncTransport(_Transport):
+
+    async def request(self, method, url, query_params=None, headers=None,
+                      body=None, post_params=None, _preload_content=True,
+                      _request_timeout=None):
+        await asyncio.sleep(0)
+        return self.page(url, query_params)
+
+    async def close(self):
+        pass
+
+
+class _TestApiClient(swagger_client.ApiClient):
+    rest_client_class = _Transport
+
+
+class _TestAsyncApiClient(AsyncApiClient):
+    rest_client_class = _AsyncTransport
+
+
+def _configuration():
+    configuration = swagger_client.Configuration()
+    configuration.host = HOST
+    return configuration
+
+
+class TestPaginator(unittest.TestCase):
+    """Paginator unit tests"""
+
+    def setUp(self):
+        _Transport.total = 250
+        self.client = _TestApiClient(_configuration())
+        self.api = swagger_client.CustomSpeechTranscriptionsApi(
+            api_client=self.client)
+        self.requests = self.client.rest_client.requests
+
+    def ids(self, items):
+        return [int(item._self.split("/")[-1]) for item in items]
+
+    def test_all_pages(self):
+        transcriptions = list(Paginator(self.api.transcriptions_list))
+        self.assertEqual(self.ids(transcriptions), list(range(250)))
+        self.assertIsInstance(transcriptions[0], swagger_client.Transcription)
+        self.assertEqual([r.get('skip', '0') for r in self.requests],
+                         ['0', '100', '200'])
+
+    def test_window(self):
+        transcriptions = Paginator(self.api.transcriptions_list,
+                                   skip=5, top=12, page_size=5)
+        self.assertEqual(self.ids(transcriptions), list(range(5, 17)))
+        self.assertEqual(len(self.requests), 3)
+
+    def test_top_within_one_page(self):
+        transcriptions = Paginator(self.api.transcriptions_list, top=3)
+        self.assertEqual(self.ids(transcriptions), [0, 1, 2])
+        self.assertEqual(self.requests, [{'top': 3}])
+
+    def test_lazy(self):
+        transcriptions = iter(Paginator(self.api.transcriptions_list,
+                                        page_size=10, prefetch=False))
+        next(transcriptions)
+        self.assertEqual(len(self.requests), 1)
+        for _ in range(10):
+            next(transcriptions)
+        self.assertEqual(len(self.requests), 2)
+
+    def test_prefetch(self):
+        transcriptions = iter(Paginator(self.api.transcriptions_list,
+                                        page_size=10))
+        next(transcriptions)
+        self.client.pool.close()
+        self.client.pool.join()
+        # The second page was requested while the first is consumed
+        self.assertEqual(len(self.requests), 2)
+
+    def test_files(self):
+        _Transport.total = 7
+        files = list(Paginator(self.api.transcriptions_list_files, "abc",
+                               page_size=3))
+        self.assertIsInstance(files[0], swagger_client.File)
+        self.assertEqual([f.name for f in files],
+                         [str(i) for i in range(7)])
+
+    def test_lightweight_pages(self):
+        self.client.set_lightweight_response(
+            "GET", "/transcriptions", "PaginatedTranscriptions",
+            fields={'values': ('self',), '@nextLink': None})
+        transcriptions = list(Paginator(self.api.transcriptions_list))
+        self.assertEqual(self.ids(transcriptions), list(range(250)))
+        self.assertNotIsInstance(transcriptions[-1],
+                                 swagger_client.Transcription)
+
+    def test_lightweight_pages_with_path_parameters(self):
+        """The next links' concrete path finds the template's response"""
+        self.client.set_lightweight_response(
+            "GET", "/transcriptions/{id}/files", "PaginatedFiles",
+            fields={'values': ('self', 'name'), '@nextLink': None})
+        _Transport.total = 7
+        files = list(Paginator(self.api.transcriptions_list_files, "abc",
+                               page_size=3))
+        self.assertEqual([f.name for f in files],
+                         [str(i) for i in range(7)])
+        for file in files:
+            self.assertNotIsInstance(file, swagger_client.File)
+
+    def test_async(self):
+        client = _TestAsyncApiClient(_configuration())
+        api = swagger_client.CustomSpeechWebHooksApi(api_client=client)
+
+        async def collect():
+            return [web_hook async for web_hook
+                    in Paginator(api.web_hooks_list, skip=10, top=150)]
+
+        web_hooks = asyncio.run(collect())
+        self.assertIsInstance(web_hooks[0], swagger_client.WebHook)
+        self.assertEqual(self.ids(web_hooks), list(range(10, 160)))
+
+
+if __name__ == '__main__':
+    unittest.main()
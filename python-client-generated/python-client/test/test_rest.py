@@ -0,0 +1,197 @@
+# coding: utf-8
+
+"""
+    Speech Services API v3.1
+
+    Speech Services API v3.1.  # noqa: E501
+
+    OpenAPI spec version: v3.1
+
+    Generated by: https://github.com/swagger-api/swagger-codegen.git
+"""
+
+
+from __future__ import absolute_import
+
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import swagger_client
+from swagger_client import rest
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answers 200, or the statuses queued in `failures` first."""
+
+    protocol_version = "HTTP/1.1"
+    failures = []
+    received = []
+
+    def _respond(self):
+        self.received.append(self.command)
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        status, headers = self.failures.pop(0) if self.failures else (200, {})
+        body = json.dumps({"status": "Running"}).encode("utf8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestRESTClientObject(unittest.TestCase):
+    """RESTClientObject connection pool tests"""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.configuration = swagger_client.Configuration()
+        self.configuration.host = "http://127.0.0.1:%d" % self.server.server_port  # noqa: E501
+        self.configuration.retries = rest.RetryPolicy(backoff_factor=0.01)
+        rest.clear_shared_pool_managers()
+        rest.pool_metrics.reset()
+        _Handler.failures = []
+        _Handler.received = []
+
+    def tearDown(self):
+        rest.clear_shared_pool_managers()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _get(self, client):
+        return client.call_api('/transcriptions/abc', 'GET',
+                               response_type='object',
+                               _return_http_data_only=True)
+
+    def test_shared_pool_across_clients(self):
+        """Separate ApiClients reuse one kept-alive connection"""
+        for _ in range(5):
+            client = swagger_client.ApiClient(self.configuration)
+            self.assertEqual(self._get(client), {"status": "Running"})
+        first = swagger_client.ApiClient(self.configuration)
+        second = swagger_client.ApiClient(self.configuration)
+        self.assertIs(first.rest_client.pool_manager,
+                      second.rest_client.pool_manager)
+        self.assertEqual(rest.connection_metrics(), {
+            'requests': 5, 'new_connections': 1, 'reused_connections': 4})
+
+    def test_unshared_pool(self):
+        self.configuration.connection_pool_shared = False
+        for _ in range(3):
+            self._get(swagger_client.ApiClient(self.configuration))
+        self.assertEqual(rest.connection_metrics()['new_connections'], 3)
+
+    def test_pool_settings(self):
+        self.configuration.connection_pool_num_pools = 2
+        self.configuration.connection_pool_maxsize = 7
+        client = swagger_client.ApiClient(self.configuration)
+        manager = client.rest_client.pool_manager
+        self.assertEqual(manager.pools._maxsize, 2)
+        self.assertEqual(manager.connection_pool_kw['maxsize'], 7)
+
+    def test_debug_log_keeps_body_undecoded(self):
+        """DEBUG logging reports the body size without decoding it"""
+        rest_client = rest.RESTClientObject(self.configuration)
+        with self.assertLogs(rest.logger, level="DEBUG") as logs:
+            response = rest_client.GET(
+                self.configuration.host + '/transcriptions/abc')
+        self.assertIn("response body: 21 bytes", logs.output[-1])
+        self.assertIsNone(response._data)
+        self.assertEqual(json.loads(response.data), {"status": "Running"})
+
+    def _post(self, client):
+        return client.call_api('/transcriptions', 'POST', body={},
+                               response_type='object',
+                               _return_http_data_only=True)
+
+    def test_retry_after_throttling(self):
+        """A 429 is retried after its Retry-After, even for POST"""
+        _Handler.failures = [(429, {"Retry-After": "0"}),
+                             (429, {"Retry-After": "0"})]
+        client = swagger_client.ApiClient(self.configuration)
+        self.assertEqual(self._post(client), {"status": "Running"})
+        self.assertEqual(_Handler.received, ["POST"] * 3)
+
+    def test_non_idempotent_not_retried(self):
+        """A 503 is retried for GET, but not for POST"""
+        _Handler.failures = [(503, {})]
+        client = swagger_client.ApiClient(self.configuration)
+        self.assertEqual(self._get(client), {"status": "Running"})
+        _Handler.failures = [(503, {})]
+        with self.assertRaises(rest.ApiException) as raised:
+            self._post(client)
+        self.assertEqual(raised.exception.status, 503)
+
+    def test_retries_exhausted(self):
+        self.configuration.retries = rest.RetryPolicy(total=2,
+                                                      backoff_factor=0.01)
+        _Handler.failures = [(500, {})] * 3
+        client = swagger_client.ApiClient(self.configuration)
+        with self.assertRaises(rest.ApiException) as raised:
+            self._get(client)
+        self.assertEqual(raised.exception.status, 500)
+        self.assertEqual(len(_Handler.received), 3)
+
+    def test_retries_disabled(self):
+        self.configuration.retries = None
+        _Handler.failures = [(429, {"Retry-After": "0"})]
+        with self.assertRaises(rest.ApiException):
+            self._get(swagger_client.ApiClient(self.configuration))
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """RetryPolicy and TokenBucket unit tests"""
+
+    def test_parse_retry_after(self):
+        self.assertEqual(rest.parse_retry_after("12"), 12.0)
+        self.assertIsNone(rest.parse_retry_after(None))
+        self.assertIsNone(rest.parse_retry_after("soon"))
+        self.assertEqual(
+            rest.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+    def test_delay(self):
+        policy = rest.RetryPolicy(total=3, backoff_factor=1, max_backoff=4,
+                                  max_retry_after=30)
+        self.assertEqual(policy.delay('GET', 429, 0, "7"), 7.0)
+        self.assertEqual(policy.delay('POST', 429, 0, "600"), 30)
+        self.assertIsNone(policy.delay('POST', 503, 0))
+        self.assertIsNone(policy.delay('GET', 404, 0))
+        self.assertIsNone(policy.delay('GET', 503, 3))
+        for attempt in range(3):
+            self.assertLessEqual(policy.delay('GET', 503, attempt), 4)
+
+    def test_token_bucket(self):
+        bucket = rest.TokenBucket(rate=100, capacity=2)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.01, places=2)
+        bucket.pause(1)
+        self.assertGreater(bucket.reserve(), 0.99)
+
+    def test_configuration_copies_share_bucket(self):
+        configuration = swagger_client.Configuration()
+        configuration.rate_limiter = rest.TokenBucket(rate=5)
+        swagger_client.Configuration.set_default(configuration)
+        try:
+            copy = swagger_client.Configuration()
+        finally:
+            swagger_client.Configuration.set_default(None)
+        self.assertIs(copy.rate_limiter, configuration.rate_limiter)
+
+
+if __name__ == '__main__':
+    unittest.main()
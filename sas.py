@@ -0,0 +1,162 @@
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+
+import requests
+from azure.storage.blob import BlobServiceClient, generate_blob_sas, generate_container_sas
+
+# How long a signed URL is reused before a fresh one is signed
+DEFAULT_REUSE_WINDOW = timedelta(minutes=30)
+# Signed URLs kept per storage account; the least recently used are dropped beyond this
+DEFAULT_MAX_CACHED_URLS = 1024
+# The longest a user delegation key can be valid for
+MAX_USER_DELEGATION_KEY_VALIDITY = timedelta(days=7)
+
+_issuers = {}
+_issuers_lock = threading.Lock()
+
+
+class SasIssuer:
+    """
+    Signs SAS URLs for one storage account and caches them.
+
+    A URL asked for with `hours` of validity is signed for `hours` plus `reuse_window`, and
+    handed out again for as long as it still has at least `hours` left. Callers therefore
+    always get the validity they ask for, while repeat requests for the same container/blob
+    and permissions within the window cost nothing.
+
+    URLs that can no longer be handed out are dropped whenever a new one is cached, and at most
+    `max_entries` are kept, least recently used first out, so a long-lived process signing a
+    URL for every new blob does not grow without bound.
+
+    URLs are signed locally with the account key when the client has one, and otherwise, for a client
+    with a token (Azure AD) credential, with a user delegation key, requested once and reused
+    for as long as it is valid. A client that has neither, such as one built from a connection
+    string with a SharedAccessSignature, cannot sign; its own SAS token is handed out instead,
+    so the URLs are valid for as long as that token is rather than for `hours`.
+    """
+
+    def __init__(self, blob_service_client, reuse_window=DEFAULT_REUSE_WINDOW, max_entries=DEFAULT_MAX_CACHED_URLS):
+        self.blob_service_client = blob_service_client
+        self.reuse_window = reuse_window
+        self.max_entries = max_entries
+        self._account_name = blob_service_client.account_name
+        credential = blob_service_client.credential
+        self._account_key = getattr(credential, "account_key", None)
+        self._can_delegate = self._account_key is None and hasattr(credential, "get_token")
+        self._delegation_key = None
+        # The client's own SAS token, if any, is the query string of its URL
+        url = urlsplit(blob_service_client.url)
+        self._base_url = f"{url.scheme}://{url.netloc}{url.path}".rstrip("/")
+        self._sas_token = url.query
+        # key -> (url, expiry, validity asked for), least recently used first
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached(self, key, hours, sign):
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[1] - now >= cached[2]:
+                self._cache.move_to_end(key)
+                return cached[0]
+        validity = timedelta(hours=hours)
+        expiry = now + validity + self.reuse_window
+        url = sign(expiry)
+        with self._lock:
+            self._cache[key] = (url, expiry, validity)
+            self._cache.move_to_end(key)
+            self._prune(now)
+        return url
+
+    def _signing_key(self, expiry):
+        """The keyword argument that signs a SAS expiring at `expiry`, or None when this client cannot sign."""
+        if self._account_key is not None:
+            return {"account_key": self._account_key}
+        if not self._can_delegate:
+            return None
+        with self._lock:
+            key = self._delegation_key
+        if key is None or key[1] < expiry:
+            start = datetime.now(timezone.utc)
+            key_expiry = start + MAX_USER_DELEGATION_KEY_VALIDITY
+            if key_expiry < expiry:
+                raise ValueError(f"A SAS signed with a user delegation key cannot be valid past {key_expiry}")
+            key = (self.blob_service_client.get_user_delegation_key(start, key_expiry), key_expiry)
+            with self._lock:
+                self._delegation_key = key
+        return {"user_delegation_key": key[0]}
+
+    def _unsigned_url(self, path):
+        return f"{self._base_url}/{path}?{self._sas_token}" if self._sas_token else f"{self._base_url}/{path}"
+
+    def _prune(self, now):
+        """Drop the URLs that could not be handed out again, then the least recently used over `max_entries`."""
+        for key in [key for key, (_, expiry, validity) in self._cache.items() if expiry - now < validity]:
+            del self._cache[key]
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def blob_sas_url(self, container_name, blob_name, permission, hours):
+        def sign(expiry):
+            signing_key = self._signing_key(expiry)
+            if signing_key is None:
+                return self._unsigned_url(f"{container_name}/{blob_name}")
+            sas_token = generate_blob_sas(
+                account_name=self._account_name,
+                container_name=container_name,
+                blob_name=blob_name,
+                permission=permission,
+                expiry=expiry,
+                **signing_key,
+            )
+            return f"{self._base_url}/{container_name}/{blob_name}?{sas_token}"
+        return self._cached((container_name, blob_name, str(permission), hours), hours, sign)
+
+    def container_sas_url(self, container_name, permission, hours):
+        def sign(expiry):
+            signing_key = self._signing_key(expiry)
+            if signing_key is None:
+                return self._unsigned_url(container_name)
+            sas_token = generate_container_sas(
+                account_name=self._account_name,
+                container_name=container_name,
+                permission=permission,
+                expiry=expiry,
+                **signing_key,
+            )
+            return f"{self._base_url}/{container_name}?{sas_token}"
+        return self._cached((container_name, None, str(permission), hours), hours, sign)
+
+
+def get_sas_issuer(connection_string, blob_service_client=None):
+    """
+    The process-wide SasIssuer for `connection_string`, created on first use.
+
+    Its `blob_service_client` is the one client every caller shares; pass `blob_service_client`
+    to have a new issuer adopt an existing client instead of creating one.
+    """
+    with _issuers_lock:
+        issuer = _issuers.get(connection_string)
+        if issuer is None:
+            if blob_service_client is None:
+                blob_service_client = BlobServiceClient.from_connection_string(connection_string)
+            issuer = _issuers[connection_string] = SasIssuer(blob_service_client)
+        return issuer
+
+
+def validate_blob_sas_url(blob_service_client, container_name, blob_name, sas_url):
+    """Check that the blob exists and that `sas_url` can read it (two requests; opt-in)."""
+    blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+    if not blob_client.exists():
+        raise Exception(f"Blob does not exist: {blob_name}")
+
+    try:
+        response = requests.head(sas_url)
+        response.raise_for_status()
+        logging.info(f"SAS URL is valid and accessible: {sas_url}")
+    except requests.exceptions.RequestException as e:
+        logging.error(f"Error accessing SAS URL: {e}")
+        raise Exception(f"Invalid SAS URL: {sas_url}")
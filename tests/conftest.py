@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The generated Speech API client is not installed, as in benchmarks/speech_payloads.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "python-client-generated",
+                                "python-client"))
@@ -0,0 +1,95 @@
+"""
+A stand-in for the Speech to text service behind a real swagger_client ApiClient: transcriptions
+kept in a dict, served by `GET /transcriptions` (paged, with the `createdDateTime ge` filter) and
+`GET /transcriptions/{id}`. `DELETE` of any path is recorded in `deleted`.
+"""
+import json
+import threading
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl, urlparse
+
+import swagger_client
+
+HOST = "https://example.test/speechtotext/v3.1"
+
+
+class _Response:
+
+    def __init__(self, status, body, headers=None):
+        self.status = status
+        self.reason = "OK" if status < 400 else "Error"
+        self.data = json.dumps(body)
+        self.headers = headers or {}
+
+    def getheaders(self):
+        return self.headers
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name, default)
+
+
+class SpeechService:
+    """Transcriptions by id, and the requests made, shared by every client of the service."""
+
+    def __init__(self):
+        self.transcriptions = {}
+        self.requests = []
+        self.deleted = []
+        self.lock = threading.Lock()
+
+    def add(self, transcription_id, status="Running", created="2024-03-01T10:12:07Z"):
+        self.transcriptions[transcription_id] = {
+            "self": f"{HOST}/transcriptions/{transcription_id}",
+            "displayName": transcription_id,
+            "locale": "en-US",
+            "status": status,
+            "createdDateTime": created,
+        }
+
+    def set_status(self, transcription_id, status):
+        self.transcriptions[transcription_id]["status"] = status
+
+    def api(self):
+        service = self
+
+        class Transport:
+            def GET(self, url, query_params=None, headers=None, _preload_content=True, _request_timeout=None):
+                return service.get(url, query_params)
+
+            def DELETE(self, url, query_params=None, headers=None, body=None, _preload_content=True,
+                       _request_timeout=None):
+                service.deleted.append(urlparse(url).path[len(urlparse(HOST).path):])
+                return _Response(204, None)
+
+        configuration = swagger_client.Configuration()
+        configuration.host = HOST
+        api_client = swagger_client.ApiClient(configuration)
+        api_client.rest_client = Transport()
+        return swagger_client.CustomSpeechTranscriptionsApi(api_client=api_client)
+
+    def get(self, url, query_params):
+        parsed = urlparse(url)
+        params = dict(parse_qsl(parsed.query))
+        params.update(query_params or [])
+        path = parsed.path[len(urlparse(HOST).path):]
+        with self.lock:
+            self.requests.append((path, params))
+            if path != "/transcriptions":
+                transcription = self.transcriptions.get(path.split("/")[-1])
+                if transcription is None:
+                    raise swagger_client.rest.ApiException(http_resp=_Response(404, {"code": "NotFound"}))
+                return _Response(200, transcription)
+
+            values = list(self.transcriptions.values())
+            if "filter" in params:
+                since = _parse(params["filter"].split(" ge ")[1])
+                values = [t for t in values if _parse(t["createdDateTime"]) >= since]
+            skip, top = int(params.get("skip", 0)), int(params.get("top", 100))
+            body = {"values": values[skip:skip + top]}
+            if skip + top < len(values):
+                body["@nextLink"] = f"{HOST}/transcriptions?skip={skip + top}&top={top}"
+            return _Response(200, body)
+
+
+def _parse(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone(timezone.utc)
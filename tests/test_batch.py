@@ -0,0 +1,58 @@
+import unittest
+
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+
+import block_upload
+from batch import delete_batch_container, resumable_batch_id
+from pipeline import PipelineJob
+
+
+class _BlobServiceClient:
+
+    url = "https://speechtest.blob.core.windows.net/"
+
+    def __init__(self, error=None):
+        self.error = error
+        self.deleted = []
+
+    def delete_container(self, container_name):
+        if self.error is not None:
+            raise self.error
+        self.deleted.append(container_name)
+
+
+class TestResumableBatch(unittest.TestCase):
+
+    def test_resumable_batch_id(self):
+        jobs = [PipelineJob(f"{name}.wav") for name in "ab"]
+        for job in jobs:
+            job.container_name = "convertedinput-0123456789ab"
+        self.assertEqual(resumable_batch_id(jobs), "0123456789ab")
+        jobs[1].container_name = "convertedinput"
+        self.assertIsNone(resumable_batch_id(jobs))
+        jobs[1].container_name = None
+        self.assertIsNone(resumable_batch_id(jobs[1:]))
+
+
+class TestDeleteBatchContainer(unittest.TestCase):
+
+    def test_delete_forgets_the_container(self):
+        client = _BlobServiceClient()
+        block_upload._known_containers.add((client.url, "convertedinput-batch"))
+        delete_batch_container(client, "convertedinput-batch")
+        self.assertEqual(client.deleted, ["convertedinput-batch"])
+        self.assertNotIn((client.url, "convertedinput-batch"), block_upload._known_containers)
+
+    def test_delete_failures_are_not_raised(self):
+        delete_batch_container(_BlobServiceClient(ResourceNotFoundError("gone")), "convertedinput-batch")
+        client = _BlobServiceClient(HttpResponseError("forbidden"))
+        block_upload._known_containers.add((client.url, "convertedinput-batch"))
+        with self.assertLogs(level="WARNING"):
+            delete_batch_container(client, "convertedinput-batch")
+        # Still there, so uploads to it need not create it again
+        self.assertIn((client.url, "convertedinput-batch"), block_upload._known_containers)
+        block_upload._known_containers.discard((client.url, "convertedinput-batch"))
+
+
+if __name__ == "__main__":
+    unittest.main()
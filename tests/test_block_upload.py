@@ -0,0 +1,186 @@
+import hashlib
+import io
+import os
+import tempfile
+import unittest
+import wave
+from types import SimpleNamespace
+
+import block_upload
+import local_convert_and_upload
+from block_upload import UploadVerificationError
+
+
+class _BlobClient:
+    """Just enough of azure.storage.blob.BlobClient: staged blocks, commits and single puts."""
+
+    blob_name = "recording.wav"
+
+    def __init__(self, max_single_put_size=64, corrupt=False):
+        self._config = SimpleNamespace(max_single_put_size=max_single_put_size)
+        self.corrupt = corrupt
+        self.staged = {}
+        self.staged_ids = []
+        self.single_puts = 0
+        self.content = None
+        self.metadata = None
+
+    def _md5(self, data):
+        return hashlib.md5(data + (b"!" if self.corrupt else b"")).digest()
+
+    def get_block_list(self, block_list_type):
+        return [], [SimpleNamespace(id=block_id, size=len(block)) for block_id, block in self.staged.items()]
+
+    def stage_block(self, block_id, block, length=None):
+        self.staged[block_id] = block
+        self.staged_ids.append(block_id)
+        return {"content_md5": bytearray(self._md5(block))}
+
+    def commit_block_list(self, blocks, metadata=None):
+        self.content = b"".join(self.staged[block.id] for block in blocks)
+        self.metadata = metadata
+        return {"etag": '"commit"', "content_md5": None}
+
+    def upload_blob(self, data, length=None, overwrite=False, metadata=None, **kwargs):
+        self.single_puts += 1
+        self.upload_blob_options = kwargs
+        self.content = data if isinstance(data, bytes) else data.read()
+        self.metadata = metadata
+        if length > self._config.max_single_put_size:
+            # The SDK stages blocks itself; the Content-MD5 is then not the file's
+            return {"etag": '"put"', "content_md5": bytearray(hashlib.md5(b"block list").digest())}
+        return {"etag": '"put"', "content_md5": bytearray(self._md5(self.content))}
+
+
+class _BlobServiceClient:
+
+    url = "https://speechtest.blob.core.windows.net/"
+
+    def __init__(self):
+        self.created = []
+        self.blob_client = _BlobClient()
+
+    def get_container_client(self, container_name):
+        return SimpleNamespace(create_container=lambda: self.created.append(container_name))
+
+    def get_blob_client(self, container, blob):
+        return self.blob_client
+
+
+DATA = bytes(range(256)) * 4
+
+
+class TestUpload(unittest.TestCase):
+
+    def test_iter_blocks(self):
+        chunks = [DATA[offset:offset + 37] for offset in range(0, len(DATA), 37)]
+        for data in (DATA, io.BytesIO(DATA), iter(chunks)):
+            with self.subTest(data=type(data).__name__):
+                blocks = list(block_upload.iter_blocks(data, 100))
+                self.assertEqual([len(block) for block in blocks], [100] * 10 + [24])
+                self.assertEqual(b"".join(blocks), DATA)
+
+    def test_resume_sends_only_missing_blocks(self):
+        blob_client = _BlobClient()
+        blocks = list(block_upload.iter_blocks(DATA, 100))
+        # An interrupted attempt staged blocks 0, 1 and 3
+        for index in (0, 1, 3):
+            blob_client.stage_block(block_upload.block_id(index, blocks[index]), blocks[index])
+        blob_client.staged_ids.clear()
+
+        block_upload.upload_in_blocks(blob_client, io.BytesIO(DATA), block_size=100, max_concurrency=2)
+        self.assertEqual(sorted(blob_client.staged_ids),
+                         [block_upload.block_id(index, blocks[index]) for index in (2, 4, 5, 6, 7, 8, 9, 10)])
+        self.assertEqual(blob_client.content, DATA)
+
+    def test_changed_blocks_are_sent_again(self):
+        blob_client = _BlobClient()
+        block_upload.upload_in_blocks(blob_client, DATA, block_size=100)
+        blob_client.staged_ids.clear()
+        changed = b"x" * 100 + DATA[100:]
+        block_upload.upload_in_blocks(blob_client, changed, block_size=100)
+        self.assertEqual(blob_client.staged_ids, [block_upload.block_id(0, changed[:100])])
+        self.assertEqual(blob_client.content, changed)
+
+    def test_block_md5_mismatch_raises(self):
+        with self.assertRaises(UploadVerificationError):
+            block_upload.upload_in_blocks(_BlobClient(corrupt=True), DATA, block_size=100)
+
+    def test_single_put_md5_mismatch_raises(self):
+        blob_client = _BlobClient(max_single_put_size=len(DATA), corrupt=True)
+        with self.assertRaises(UploadVerificationError):
+            block_upload.upload(blob_client, DATA, length=len(DATA), bulk_threshold=len(DATA))
+        self.assertEqual(blob_client.single_puts, 1)
+
+    def test_single_put(self):
+        blob_client = _BlobClient(max_single_put_size=len(DATA))
+        response = block_upload.upload(blob_client, io.BytesIO(DATA), length=len(DATA), bulk_threshold=len(DATA))
+        self.assertEqual(response["etag"], '"put"')
+        self.assertEqual(blob_client.content, DATA)
+        self.assertEqual(blob_client.upload_blob_options, {})
+
+    def test_metadata_worked_out_at_commit(self):
+        blob_client = _BlobClient()
+        staged_by_then = []
+
+        def metadata():
+            staged_by_then.append(len(blob_client.staged_ids))
+            return {"source_sha256": "abc"}
+
+        block_upload.upload(blob_client, DATA, length=len(DATA), block_size=100, metadata=metadata)
+        self.assertEqual(staged_by_then, [11])
+        self.assertEqual(blob_client.metadata, {"source_sha256": "abc"})
+
+    def test_threshold_capped_at_max_single_put_size(self):
+        """A bulk_threshold above max_single_put_size must not reach upload_blob's own block staging"""
+        blob_client = _BlobClient(max_single_put_size=100)
+        block_upload.upload(blob_client, DATA, length=len(DATA), block_size=100, bulk_threshold=10 * len(DATA))
+        self.assertEqual(blob_client.single_puts, 0)
+        self.assertEqual(blob_client.content, DATA)
+
+
+class TestEnsureContainer(unittest.TestCase):
+
+    def test_created_once_until_forgotten(self):
+        blob_service_client = _BlobServiceClient()
+        self.addCleanup(block_upload.forget_container, blob_service_client, "input")
+        block_upload.ensure_container(blob_service_client, "input")
+        block_upload.ensure_container(blob_service_client, "input")
+        self.assertEqual(blob_service_client.created, ["input"])
+        block_upload.forget_container(blob_service_client, "input")
+        block_upload.ensure_container(blob_service_client, "input")
+        self.assertEqual(blob_service_client.created, ["input", "input"])
+
+
+class TestConvertAndUpload(unittest.TestCase):
+
+    def test_source_hash_set_at_commit(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "call.wav")
+            with wave.open(path, "wb") as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(16000)
+                wav.writeframes(DATA)
+            blob_service_client = _BlobServiceClient()
+            self.addCleanup(block_upload.forget_container, blob_service_client, "input")
+            hashed = []
+
+            def source_sha256():
+                hashed.append(path)
+                return local_convert_and_upload.file_sha256(path)
+
+            local_convert_and_upload.convert_and_upload(
+                blob_service_client, path, unique_id="job-1", container_name="input",
+                upload_options={"block_size": 100}, source_sha256=source_sha256,
+            )
+            with open(path, "rb") as file:
+                recording = file.read()
+        self.assertEqual(blob_service_client.blob_client.content, recording)
+        self.assertEqual(blob_service_client.blob_client.metadata,
+                         {local_convert_and_upload.SOURCE_HASH_METADATA: hashlib.sha256(recording).hexdigest()})
+        self.assertEqual(hashed, [path])
+
+
+if __name__ == "__main__":
+    unittest.main()
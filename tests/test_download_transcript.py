@@ -0,0 +1,119 @@
+import threading
+import unittest
+from types import SimpleNamespace
+
+from azure.core.exceptions import HttpResponseError
+
+from download_transcript import blob_name_from_source, iter_blob_chunks
+
+
+class _Download:
+
+    def __init__(self, data, offset, length):
+        self.data = data[offset:offset + length]
+        # As the service answers: no Content-Range for an empty blob
+        content_range = f"bytes {offset}-{offset + len(self.data) - 1}/{len(data)}" if data else None
+        self.properties = SimpleNamespace(content_range=content_range, size=len(self.data))
+
+    def readall(self):
+        return self.data
+
+
+class _BlobClient:
+    """Ranged reads of `data`; reads of `blocked` offsets wait for `release`, the one at `fail_at` raises."""
+
+    def __init__(self, data, blocked=(), fail_at=None):
+        self.data = data
+        self.blocked = set(blocked)
+        self.fail_at = fail_at
+        self.release = threading.Event()
+        self.offsets = []
+
+    def download_blob(self, offset=0, length=None):
+        self.offsets.append(offset)
+        if offset in self.blocked:
+            self.release.wait()
+        if offset == self.fail_at:
+            raise HttpResponseError("range failed")
+        return _Download(self.data, offset, length)
+
+
+class TestBlobNameFromSource(unittest.TestCase):
+
+    def test_blob_name(self):
+        self.assertEqual(
+            blob_name_from_source("https://speechtest.blob.core.windows.net/convertedinput-ab/job-1/my%20call.wav?sv=1&sig=x"),
+            "job-1/my call.wav",
+        )
+
+    def test_url_without_blob_path(self):
+        for source_url in ("https://speechtest.blob.core.windows.net", "https://speechtest.blob.core.windows.net/",
+                           "https://speechtest.blob.core.windows.net/convertedinput?sv=1",
+                           "https://speechtest.blob.core.windows.net/convertedinput/"):
+            with self.subTest(source_url=source_url), self.assertRaisesRegex(ValueError, "no /<container>/<blob> path"):
+                blob_name_from_source(source_url)
+
+
+class TestIterBlobChunks(unittest.TestCase):
+
+    DATA = bytes(range(256)) * 4
+
+    def consume(self, chunks, count=None):
+        """Read `count` chunks (all when None) on another thread; return the thread and the outcome."""
+        outcome = {}
+
+        def run():
+            try:
+                outcome["chunks"] = [chunk for _, chunk in zip(range(count or 1 << 30), chunks)]
+            except Exception as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        return thread, outcome
+
+    def test_chunks_in_order(self):
+        blob_client = _BlobClient(self.DATA)
+        chunks = list(iter_blob_chunks(blob_client, chunk_size=100, max_concurrency=3))
+        self.assertEqual([len(chunk) for chunk in chunks], [100] * 10 + [24])
+        self.assertEqual(b"".join(chunks), self.DATA)
+        self.assertEqual(sorted(blob_client.offsets), list(range(0, 1024, 100)))
+
+    def test_single_range(self):
+        blob_client = _BlobClient(self.DATA)
+        self.assertEqual(list(iter_blob_chunks(blob_client, chunk_size=4096)), [self.DATA])
+        self.assertEqual(blob_client.offsets, [0])
+
+    def test_empty_blob(self):
+        blob_client = _BlobClient(b"")
+        self.assertEqual(list(iter_blob_chunks(blob_client, chunk_size=100)), [])
+        self.assertEqual(blob_client.offsets, [0])
+
+    def test_close_does_not_wait_for_reads_in_flight(self):
+        blob_client = _BlobClient(self.DATA, blocked=range(200, 1024, 100))
+        self.addCleanup(blob_client.release.set)
+        chunks = iter_blob_chunks(blob_client, chunk_size=100, max_concurrency=2)
+        thread, outcome = self.consume(chunks, count=2)
+        thread.join(timeout=5)
+        self.assertEqual(b"".join(outcome["chunks"]), self.DATA[:200])
+
+        closer = threading.Thread(target=chunks.close)
+        closer.start()
+        closer.join(timeout=5)
+        self.assertFalse(closer.is_alive())
+        blob_client.release.set()
+        # Nothing is read after the ranges that were already submitted
+        self.assertLessEqual(set(blob_client.offsets), {0, 100, 200, 300})
+
+    def test_failed_range_raises_without_waiting_for_the_others(self):
+        blob_client = _BlobClient(self.DATA, blocked=range(200, 1024, 100), fail_at=100)
+        self.addCleanup(blob_client.release.set)
+        thread, outcome = self.consume(iter_blob_chunks(blob_client, chunk_size=100, max_concurrency=2))
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+        self.assertIsInstance(outcome["error"], HttpResponseError)
+        self.assertLessEqual(set(blob_client.offsets), {0, 100, 200})
+
+
+if __name__ == "__main__":
+    unittest.main()
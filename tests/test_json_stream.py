@@ -0,0 +1,63 @@
+import json
+import unittest
+
+from json_stream import iter_array_items
+
+DOCUMENT = {
+    "source": "https://example.test/recording.wav",
+    "durationInTicks": 12345678,
+    "combinedRecognizedPhrases": [{"channel": 0, "display": "Grüße, 世界 \"quoted\" \\ done"}],
+    "recognizedPhrases": [
+        {"speaker": 1, "offsetInTicks": 0, "nBest": [{"display": "Héllo 👋", "confidence": 0.93}]},
+        {"speaker": 2, "offsetInTicks": 15000000, "nBest": [{"display": "", "words": []}]},
+        12,
+        -3.5e2,
+        None,
+        True,
+        "tail ✓",
+    ],
+    "trailing": {"nested": [1, [2, {"three": 3}]]},
+}
+
+
+class TestIterArrayItems(unittest.TestCase):
+
+    def setUp(self):
+        self.data = json.dumps(DOCUMENT, ensure_ascii=False, indent=1).encode("utf-8")
+        self.expected = DOCUMENT["recognizedPhrases"]
+
+    def test_split_at_every_byte(self):
+        for split in range(len(self.data) + 1):
+            chunks = [self.data[:split], self.data[split:]]
+            self.assertEqual(list(iter_array_items(chunks, "recognizedPhrases")), self.expected, split)
+
+    def test_single_byte_chunks(self):
+        chunks = [self.data[i:i + 1] for i in range(len(self.data))]
+        self.assertEqual(list(iter_array_items(chunks, "recognizedPhrases")), self.expected)
+
+    def test_compact_document_split_at_every_byte(self):
+        data = json.dumps(DOCUMENT, separators=(",", ":")).encode("utf-8")
+        for split in range(len(data) + 1):
+            self.assertEqual(list(iter_array_items([data[:split], data[split:]], "recognizedPhrases")),
+                             self.expected, split)
+
+    def test_other_array(self):
+        self.assertEqual(list(iter_array_items([self.data], "combinedRecognizedPhrases")),
+                         DOCUMENT["combinedRecognizedPhrases"])
+
+    def test_empty_array(self):
+        self.assertEqual(list(iter_array_items([b'{"recognizedPhrases": [ ]}'], "recognizedPhrases")), [])
+
+    def test_missing_key(self):
+        with self.assertRaises(KeyError):
+            list(iter_array_items([b'{"source": "x"}'], "recognizedPhrases"))
+        with self.assertRaises(KeyError):
+            list(iter_array_items([b"{}"], "recognizedPhrases"))
+
+    def test_truncated_document(self):
+        with self.assertRaises(ValueError):
+            list(iter_array_items([self.data[:len(self.data) // 2]], "recognizedPhrases"))
+
+
+if __name__ == "__main__":
+    unittest.main()
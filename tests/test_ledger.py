@@ -0,0 +1,151 @@
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+import ledger
+from ledger import JobClaimedError, JobLedger
+
+
+class TestJobLedger(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "jobs.db")
+        self.ledger = JobLedger(self.path, worker="this-host:1")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def other(self, worker, stale_after=60):
+        return JobLedger(self.path, worker=worker, stale_after=stale_after)
+
+    def test_claim_running_job_of_live_worker(self):
+        self.ledger.add("job")
+        self.other("other-host:7").claim("job")
+        with self.assertRaises(JobClaimedError):
+            self.ledger.claim("job")
+        # Stage transitions from a worker that does not own the job are refused too
+        with self.assertRaises(JobClaimedError):
+            self.ledger.start_stage("job", "Analysing File")
+
+    def test_takeover_of_stale_claim(self):
+        self.ledger.add("job")
+        self.other("other-host:7").claim("job")
+        # Another host's worker cannot be checked; it is presumed dead once the job stops progressing
+        stale = self.other("this-host:1", stale_after=0.05)
+        time.sleep(0.1)
+        record = stale.claim("job")
+        self.assertEqual(record["worker"], "this-host:1")
+        self.assertEqual(record["status"], "Running")
+
+    def test_takeover_from_dead_process(self):
+        process = subprocess.Popen([sys.executable, "-c", "pass"])
+        process.wait()
+        self.ledger.add("job")
+        self.other(f"{socket.gethostname()}:{process.pid}", stale_after=3600).claim("job")
+        self.assertEqual(self.ledger.claim("job")["worker"], "this-host:1")
+
+    def test_reclaim_own_job(self):
+        self.ledger.add("job")
+        self.ledger.claim("job")
+        self.assertEqual(self.ledger.claim("job")["status"], "Running")
+
+    def test_claim_unknown_job(self):
+        with self.assertRaises(KeyError):
+            self.ledger.claim("missing")
+
+    def test_complete_stage(self):
+        self.ledger.add("job", input_file_path="a.wav")
+        self.ledger.claim("job")
+        self.ledger.start_stage("job", "Analysing File")
+        self.ledger.complete_stage("job", "Analysing File", 1.5, blob_name="a_mono.wav")
+        self.ledger.complete_stage("job", "Analysing File", 2.5)
+        self.ledger.complete_stage("job", "AI Transcription", 30.0, transcription_id="t-1")
+        record = self.ledger.get("job")
+        self.assertEqual(record["completed_stages"], ["Analysing File", "AI Transcription"])
+        self.assertEqual(record["timings"], {"Analysing File": 2.5, "AI Transcription": 30.0})
+        self.assertEqual((record["blob_name"], record["transcription_id"]), ("a_mono.wav", "t-1"))
+        self.assertEqual(self.ledger.latest("transcription_id")["unique_id"], "job")
+        with self.assertRaises(ValueError):
+            self.ledger.complete_stage("job", "Saving Results", 1.0, unknown="x")
+
+        self.ledger.finish("job")
+        record = self.ledger.get("job")
+        self.assertEqual((record["status"], record["worker"]), ("Succeeded", None))
+        self.assertIsNone(self.ledger.unfinished("a.wav"))
+
+    def test_fail_releases_job(self):
+        self.ledger.add("job", input_file_path="a.wav")
+        self.ledger.claim("job")
+        self.ledger.start_stage("job", "AI Transcription")
+        self.ledger.fail("job", "AI Transcription", "quota exceeded", 4.0)
+        record = self.ledger.get("job")
+        self.assertEqual((record["status"], record["stage"], record["error"], record["worker"]),
+                         ("Failed", "AI Transcription", "quota exceeded", None))
+        self.assertEqual(record["timings"], {"AI Transcription": 4.0})
+        self.assertEqual(self.ledger.unfinished("a.wav")["unique_id"], "job")
+        self.assertEqual([r["unique_id"] for r in self.ledger.with_status("Failed")], ["job"])
+        # A later run, in another process, may retry it straight away
+        self.assertIsNone(self.other("other-host:7").claim("job")["error"])
+
+
+class TestLegacyFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.ledger = JobLedger(os.path.join(self.directory.name, "jobs.db"))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, text):
+        with open(os.path.join(self.directory.name, name), "w") as file:
+            file.write(text)
+
+    def test_import(self):
+        self.write(ledger.LEGACY_FILE_INFO, "bfe2c27e,bfe2c27e_mono_01 - Tom, Pixel.wav")
+        self.write(ledger.LEGACY_TRANSCRIPTION_IDS, "e2d8c93d\n")
+        self.assertEqual(ledger.import_legacy_files(self.ledger, self.directory.name), "bfe2c27e")
+
+        record = self.ledger.latest("blob_name", "transcription_id")
+        self.assertEqual((record["unique_id"], record["blob_name"], record["transcription_id"]),
+                         ("bfe2c27e", "bfe2c27e_mono_01 - Tom, Pixel.wav", "e2d8c93d"))
+        files = os.listdir(self.directory.name)
+        self.assertIn("current_file_info.txt.migrated", files)
+        self.assertIn("transcription_ids.txt.migrated", files)
+        self.assertNotIn(ledger.LEGACY_FILE_INFO, files)
+        # Imported once
+        self.assertIsNone(ledger.import_legacy_files(self.ledger, self.directory.name))
+
+    def test_imported_job_is_resumed(self):
+        self.write(ledger.LEGACY_FILE_INFO, "bfe2c27e,bfe2c27e_mono_01 - Tom, Pixel.wav")
+        ledger.import_legacy_files(self.ledger, self.directory.name, wav_folder="input")
+        record = self.ledger.unfinished(os.path.join("input", "01 - Tom, Pixel.wav"))
+        self.assertEqual(record["unique_id"], "bfe2c27e")
+
+    def test_imported_job_without_wav_folder_is_history(self):
+        self.write(ledger.LEGACY_FILE_INFO, "bfe2c27e,bfe2c27e_mono_01 - Tom, Pixel.wav")
+        ledger.import_legacy_files(self.ledger, self.directory.name)
+        self.assertIsNone(self.ledger.get("bfe2c27e")["input_file_path"])
+
+    def test_import_without_transcription(self):
+        self.write(ledger.LEGACY_FILE_INFO, "abc,abc_mono.wav\n")
+        ledger.import_legacy_files(self.ledger, self.directory.name)
+        record = self.ledger.get("abc")
+        self.assertEqual((record["blob_name"], record["transcription_id"]), ("abc_mono.wav", None))
+
+    def test_malformed_file_is_left_alone(self):
+        self.write(ledger.LEGACY_FILE_INFO, "no comma here")
+        self.assertIsNone(ledger.import_legacy_files(self.ledger, self.directory.name))
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, ledger.LEGACY_FILE_INFO)))
+
+    def test_nothing_to_import(self):
+        self.assertIsNone(ledger.import_legacy_files(self.ledger, self.directory.name))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import os
+import tempfile
+import unittest
+
+import main_transcribe
+import pipeline
+from ledger import JobClaimedError, JobLedger
+from pipeline import PipelineContext, PipelineJob, run_pipeline
+from tests.speech_service import SpeechService
+
+
+class _Transcription:
+
+    def __init__(self, status):
+        self.status = status
+
+    def to_dict(self):
+        return {"status": self.status}
+
+
+class TestWaitAndCheck(unittest.TestCase):
+
+    def wait_and_check(self, transcription):
+        return main_transcribe.wait_and_check(None, "abc", wait_for_transcription=lambda *a, **k: transcription)
+
+    def test_succeeded(self):
+        self.assertEqual(self.wait_and_check(_Transcription("Succeeded")), "abc")
+
+    def test_timeout(self):
+        with self.assertRaises(main_transcribe.TranscriptionNotFinished):
+            self.wait_and_check(None)
+
+    def test_not_final(self):
+        with self.assertRaises(main_transcribe.TranscriptionNotFinished):
+            self.wait_and_check(_Transcription("Running"))
+
+    def test_failed(self):
+        with self.assertRaisesRegex(Exception, "Transcription failed"):
+            self.wait_and_check(_Transcription("Failed"))
+
+
+class TestPollerClient(unittest.TestCase):
+
+    def test_poller_does_not_retry(self):
+        context = PipelineContext({"subscription_key": "key", "service_region": "westus"})
+        poller = context.poller
+        try:
+            self.assertIsNot(poller.api.api_client, context.transcriptions_api.api_client)
+            self.assertIsNone(poller.api.api_client.rest_client.retries)
+            self.assertIsNotNone(context.transcriptions_api.api_client.rest_client.retries)
+        finally:
+            poller.stop()
+
+
+class _Context(PipelineContext):
+    """Waits no time at all: the wait ends with the transcription's current state."""
+
+    def wait_for_transcription(self, api, transcription_id, max_retries=180, audio_duration=None):
+        transcription = api.transcriptions_get(transcription_id)
+        return transcription if transcription.status in ("Succeeded", "Failed") else None
+
+
+class TestTranscriptionCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.service = SpeechService()
+        self.service.add("abc", status="Running")
+        self.context = _Context({
+            "ledger_path": os.path.join(self.directory.name, "jobs.db"),
+            "transcript_cache_dir": "",
+        })
+        self.context._transcriptions_api = self.service.api()
+        self.stages = [
+            ("Analysing File", lambda context, job: None),
+            ("AI Transcription", pipeline.transcribe_stage),
+        ]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_unfinished_transcription_is_not_checkpointed(self):
+        job = PipelineJob("recording.wav", unique_id="job-1")
+        job.transcription_id = "abc"
+        with self.assertRaises(main_transcribe.TranscriptionNotFinished):
+            run_pipeline(self.context, job, stages=self.stages)
+
+        record = self.context.ledger.get("job-1")
+        self.assertEqual(record["completed_stages"], ["Analysing File"])
+        self.assertEqual(record["stage"], "AI Transcription")
+        # The next run re-attaches to the same transcription
+        self.assertEqual(record["transcription_id"], "abc")
+
+        self.service.set_status("abc", "Succeeded")
+        job = run_pipeline(self.context, PipelineJob.from_record(record), stages=self.stages)
+        self.assertEqual(job.status, "Succeeded")
+        self.assertEqual(self.context.ledger.get("job-1")["completed_stages"], ["Analysing File", "AI Transcription"])
+
+
+class TestFailedStage(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.context = _Context({
+            "ledger_path": os.path.join(self.directory.name, "jobs.db"),
+            "transcript_cache_dir": "",
+        })
+        self.stages = [("Analysing File", lambda context, job: None), ("AI Transcription", lambda context, job: None)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_failing_stage(self):
+        def fail(context, job):
+            raise RuntimeError("no audio")
+
+        job = PipelineJob("recording.wav", unique_id="job-1")
+        with self.assertRaises(RuntimeError):
+            run_pipeline(self.context, job, stages=[self.stages[0], ("AI Transcription", fail)])
+        self.assertEqual(job.stage, "AI Transcription")
+
+    def test_claimed_job(self):
+        other_worker = JobLedger(self.context.config["ledger_path"], worker="other-host:1")
+        other_worker.add("job-1")
+        other_worker.claim("job-1")
+        job = PipelineJob("recording.wav", unique_id="job-1")
+        with self.assertRaises(JobClaimedError):
+            run_pipeline(self.context, job, stages=self.stages)
+        self.assertEqual(job.stage, pipeline.STARTING)
+
+    def test_failure_after_every_stage(self):
+        def finish(unique_id):
+            raise OSError("disk full")
+
+        self.context.ledger.finish = finish
+        job = PipelineJob("recording.wav", unique_id="job-1")
+        with self.assertRaises(OSError):
+            run_pipeline(self.context, job, stages=self.stages)
+        self.assertEqual(job.completed_stages, ["Analysing File", "AI Transcription"])
+        self.assertEqual(job.stage, pipeline.FINISHING)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from poller import TranscriptionPoller
+from tests.speech_service import SpeechService
+
+
+def _iso(moment):
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class TestTranscriptionPoller(unittest.TestCase):
+
+    def setUp(self):
+        self.service = SpeechService()
+        self.api = self.service.api()
+        self.poller = TranscriptionPoller(self.api, min_interval=0.02, max_interval=0.05).start()
+
+    def tearDown(self):
+        self.poller.stop()
+
+    def wait_all(self, transcription_ids):
+        results = {}
+
+        def wait(transcription_id):
+            results[transcription_id] = self.poller.wait_for_transcription(self.api, transcription_id, max_retries=1)
+
+        threads = [threading.Thread(target=wait, args=(t,)) for t in transcription_ids]
+        for thread in threads:
+            thread.start()
+        return threads, results
+
+    def test_waits_for_final_status(self):
+        self.service.add("a", created=_iso(datetime.now(timezone.utc)))
+        threads, results = self.wait_all(["a"])
+        while len(self.service.requests) < 3:
+            threading.Event().wait(0.01)
+        self.service.set_status("a", "Succeeded")
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results["a"].status, "Succeeded")
+
+    def test_reattached_transcriptions_are_found(self):
+        """Transcriptions created long before they were registered still finish"""
+        now = datetime.now(timezone.utc)
+        self.service.add("old", created=_iso(now - timedelta(hours=3)))
+        self.service.add("older", created=_iso(now - timedelta(days=1)))
+        self.service.add("new", created=_iso(now))
+        threads, results = self.wait_all(["old", "older", "new"])
+
+        # Let every transcription get its first individual check, then finish them together
+        while sum(1 for path, _ in self.service.requests if path != "/transcriptions") < 3:
+            threading.Event().wait(0.01)
+        for transcription_id in ("old", "older", "new"):
+            self.service.set_status(transcription_id, "Succeeded")
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual({t: r.status for t, r in results.items()},
+                         {"old": "Succeeded", "older": "Succeeded", "new": "Succeeded"})
+
+    def test_list_filter_uses_creation_time(self):
+        now = datetime.now(timezone.utc)
+        self.service.add("a", created=_iso(now - timedelta(hours=2)))
+        self.service.add("b", created=_iso(now - timedelta(hours=1)))
+        threads, _ = self.wait_all(["a", "b"])
+        while not any(path == "/transcriptions" for path, _ in self.service.requests):
+            threading.Event().wait(0.01)
+        self.service.set_status("a", "Failed")
+        self.service.set_status("b", "Failed")
+        for thread in threads:
+            thread.join()
+
+        filters = [params["filter"] for path, params in self.service.requests if path == "/transcriptions"]
+        self.assertEqual(filters[0], f"createdDateTime ge {_iso(now - timedelta(hours=2))}")
+
+    def test_missing_from_listing_falls_back_to_get(self):
+        self.service.add("a", created=_iso(datetime.now(timezone.utc)))
+        self.service.add("b", created=_iso(datetime.now(timezone.utc)))
+        threads, results = self.wait_all(["a", "b"])
+        while not any(path == "/transcriptions" for path, _ in self.service.requests):
+            threading.Event().wait(0.01)
+        # Listed with a creation time the filter excludes, e.g. after clock skew
+        self.service.transcriptions["b"]["createdDateTime"] = "2000-01-01T00:00:00Z"
+        self.service.set_status("a", "Succeeded")
+        self.service.set_status("b", "Succeeded")
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results["b"].status, "Succeeded")
+
+    def test_listing_stops_at_the_page_with_the_last_id(self):
+        self.poller.stop()
+        self.poller = TranscriptionPoller(self.api, min_interval=0.02, max_interval=0.05, page_size=1).start()
+        now = datetime.now(timezone.utc)
+        for transcription_id in ("a", "b", "c", "d"):
+            self.service.add(transcription_id, created=_iso(now))
+        threads, _ = self.wait_all(["a", "b"])
+        while sum(1 for path, _ in self.service.requests if path == "/transcriptions") < 4:
+            threading.Event().wait(0.01)
+        self.service.set_status("a", "Succeeded")
+        self.service.set_status("b", "Succeeded")
+        for thread in threads:
+            thread.join()
+
+        # a and b are on the first two pages; the pages of c and d are never requested, not even prefetched
+        skips = {params.get("skip", "0") for path, params in self.service.requests if path == "/transcriptions"}
+        self.assertEqual(skips, {"0", "1"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import base64
+import unittest
+from datetime import timedelta
+from urllib.parse import parse_qs, urlparse
+
+from azure.core.credentials import AccessToken
+from azure.storage.blob import BlobServiceClient, UserDelegationKey
+
+from sas import SasIssuer
+
+CONNECTION_STRING = (
+    "DefaultEndpointsProtocol=https;AccountName=speechtest;"
+    f"AccountKey={base64.b64encode(b'not-a-real-key').decode()};EndpointSuffix=core.windows.net"
+)
+
+
+class TestSasIssuer(unittest.TestCase):
+
+    def issuer(self, **kwargs):
+        return SasIssuer(BlobServiceClient.from_connection_string(CONNECTION_STRING), **kwargs)
+
+    def test_reuses_signed_url(self):
+        issuer = self.issuer()
+        url = issuer.blob_sas_url("input", "a.wav", "r", 48)
+        self.assertEqual(issuer.blob_sas_url("input", "a.wav", "r", 48), url)
+        self.assertNotEqual(issuer.blob_sas_url("input", "b.wav", "r", 48), url)
+        self.assertTrue(url.startswith("https://speechtest.blob.core.windows.net/input/a.wav?"))
+        self.assertIn("se", parse_qs(urlparse(url).query))
+
+    def test_expired_urls_are_dropped(self):
+        # Signed for exactly the validity asked for, so no URL can ever be handed out again
+        issuer = self.issuer(reuse_window=timedelta(0))
+        for index in range(100):
+            issuer.blob_sas_url("input", f"{index}.wav", "r", 1)
+        self.assertLessEqual(len(issuer._cache), 1)
+
+    def test_bounded_least_recently_used(self):
+        issuer = self.issuer(max_entries=3)
+        first = issuer.blob_sas_url("input", "0.wav", "r", 48)
+        for index in (1, 2):
+            issuer.blob_sas_url("input", f"{index}.wav", "r", 48)
+        # Using 0 makes 1 the least recently used
+        issuer.blob_sas_url("input", "0.wav", "r", 48)
+        issuer.container_sas_url("input", "rl", 48)
+        self.assertEqual(len(issuer._cache), 3)
+        self.assertEqual([key[1] for key in issuer._cache], ["2.wav", "0.wav", None])
+        self.assertEqual(issuer.blob_sas_url("input", "0.wav", "r", 48), first)
+
+
+
+class _TokenCredential:
+
+    def get_token(self, *scopes, **kwargs):
+        return AccessToken("token", 2 ** 31)
+
+
+class TestSasIssuerWithoutAccountKey(unittest.TestCase):
+
+    def test_connection_string_with_sas_token(self):
+        issuer = SasIssuer(BlobServiceClient.from_connection_string(
+            "BlobEndpoint=https://speechtest.blob.core.windows.net/;SharedAccessSignature=sv=2022-11-02&sp=rl&sig=abc"
+        ))
+        self.assertEqual(issuer.blob_sas_url("input", "a.wav", "r", 48),
+                         "https://speechtest.blob.core.windows.net/input/a.wav?sv=2022-11-02&sp=rl&sig=abc")
+        self.assertEqual(issuer.container_sas_url("output", "rl", 48),
+                         "https://speechtest.blob.core.windows.net/output?sv=2022-11-02&sp=rl&sig=abc")
+
+    def test_token_credential_signs_with_a_user_delegation_key(self):
+        blob_service_client = BlobServiceClient("https://speechtest.blob.core.windows.net", credential=_TokenCredential())
+        requested = []
+
+        def get_user_delegation_key(key_start_time, key_expiry_time):
+            requested.append((key_start_time, key_expiry_time))
+            key = UserDelegationKey()
+            key.signed_oid, key.signed_tid, key.signed_service, key.signed_version = "oid", "tid", "b", "2021-08-06"
+            key.signed_start, key.signed_expiry = "2026-01-01T00:00:00Z", "2026-01-08T00:00:00Z"
+            key.value = base64.b64encode(b"not-a-real-key").decode()
+            return key
+
+        blob_service_client.get_user_delegation_key = get_user_delegation_key
+        issuer = SasIssuer(blob_service_client)
+        url = issuer.blob_sas_url("input", "a.wav", "r", 48)
+        issuer.container_sas_url("output", "rl", 48)
+        query = parse_qs(urlparse(url).query)
+        self.assertEqual(query["skoid"], ["oid"])
+        self.assertIn("sig", query)
+        # One key serves every URL it outlives
+        self.assertEqual(len(requested), 1)
+        with self.assertRaises(ValueError):
+            issuer.blob_sas_url("input", "a.wav", "r", 24 * 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
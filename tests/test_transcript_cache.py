@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from transcript_cache import TranscriptCache, _entry_size
+
+
+def _fingerprint(recording):
+    return hashlib.sha256(recording).hexdigest()
+
+
+class TestTranscriptCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.directory.name, "cache")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def conversation(self, name, size=1000):
+        path = os.path.join(self.directory.name, f"{name}_speaker_conversation.json")
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump([{"speaker": 1, "text": name * (size // len(name))}], file)
+        return path
+
+    def put(self, cache, recording):
+        cache.put(_fingerprint(recording), self.conversation(recording.decode()),
+                  transcription_id=f"t-{recording.decode()}", transcript_blob="output/t.json")
+        # mtimes order the entries across restarts
+        time.sleep(0.01)
+
+    def test_hit_and_miss_by_sha256(self):
+        cache = TranscriptCache(self.cache_dir)
+        self.put(cache, b"recording-a")
+        entry = cache.get(_fingerprint(b"recording-a"))
+        self.assertEqual(entry["transcription_id"], "t-recording-a")
+        self.assertIsNone(cache.get(_fingerprint(b"recording-b")))
+        self.assertIsNone(cache.restore(_fingerprint(b"recording-b"), os.path.join(self.directory.name, "out.json")))
+
+        restored = os.path.join(self.directory.name, "out", "conversation.json")
+        self.assertEqual(cache.restore(_fingerprint(b"recording-a"), restored)["transcript_blob"], "output/t.json")
+        with open(restored, encoding="utf-8") as file, open(self.conversation("recording-a"), encoding="utf-8") as original:
+            self.assertEqual(file.read(), original.read())
+
+    def test_lru_eviction_at_size_limit(self):
+        probe = TranscriptCache(os.path.join(self.directory.name, "probe"))
+        self.put(probe, b"probe-entry")
+        entry_size = probe.size
+
+        cache = TranscriptCache(self.cache_dir, max_bytes=int(entry_size * 2.5))
+        self.put(cache, b"entry-aaaaa")
+        self.put(cache, b"entry-bbbbb")
+        # Using a makes b the least recently used
+        self.assertIsNotNone(cache.get(_fingerprint(b"entry-aaaaa")))
+        self.put(cache, b"entry-ccccc")
+
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn(_fingerprint(b"entry-bbbbb"), cache)
+        self.assertFalse(os.path.exists(os.path.join(self.cache_dir, _fingerprint(b"entry-bbbbb"))))
+        self.assertIn(_fingerprint(b"entry-aaaaa"), cache)
+        self.assertLessEqual(cache.size, cache.max_bytes)
+
+        # Recency survives a restart: a is now older than c
+        reopened = TranscriptCache(self.cache_dir, max_bytes=cache.max_bytes)
+        self.assertEqual(reopened.size, cache.size)
+        self.put(reopened, b"entry-ddddd")
+        self.assertNotIn(_fingerprint(b"entry-aaaaa"), reopened)
+        self.assertIn(_fingerprint(b"entry-ccccc"), reopened)
+
+    def test_entry_larger_than_limit_is_kept(self):
+        cache = TranscriptCache(self.cache_dir, max_bytes=10)
+        self.put(cache, b"entry-aaaaa")
+        self.assertIn(_fingerprint(b"entry-aaaaa"), cache)
+        self.put(cache, b"entry-bbbbb")
+        self.assertEqual(len(cache), 1)
+        self.assertIn(_fingerprint(b"entry-bbbbb"), cache)
+
+    def test_replacing_an_entry_keeps_size(self):
+        cache = TranscriptCache(self.cache_dir)
+        self.put(cache, b"entry-aaaaa")
+        self.put(cache, b"entry-aaaaa")
+        # Counted once, as the replacement (whose cached_at may differ in length by a digit)
+        self.assertEqual((len(cache), cache.size), (1, _entry_size(os.path.join(self.cache_dir, _fingerprint(b"entry-aaaaa")))))
+
+    def test_leftover_staging_is_removed_on_load(self):
+        cache = TranscriptCache(self.cache_dir)
+        self.put(cache, b"recording-a")
+        stale, in_progress = (os.path.join(self.cache_dir, f".{_fingerprint(b'recording-b')}.{n}") for n in (1, 2))
+        for staging in (stale, in_progress):
+            os.makedirs(staging)
+            with open(os.path.join(staging, "conversation.json"), "w") as file:
+                file.write("[]")
+        hour_ago = time.time() - 2 * 60 * 60
+        os.utime(stale, (hour_ago, hour_ago))
+
+        cache = TranscriptCache(self.cache_dir)
+        self.assertFalse(os.path.exists(stale))
+        # Possibly another process's put, still under way
+        self.assertTrue(os.path.exists(in_progress))
+        self.assertEqual(len(cache), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import io
+import os
+import tempfile
+import unittest
+import wave
+import warnings
+
+import numpy as np
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    from pydub import AudioSegment
+    from pydub.utils import audioop
+
+from wav_stream import MonoWavStream, UnsupportedWavError, convert_wav, probe_wav, resampled_nframes
+
+
+def _write_wav(path, channels, sample_width, frame_rate, nframes, seed=0):
+    rng = np.random.default_rng(seed)
+    if sample_width == 1:
+        samples = rng.integers(0, 256, nframes * channels, dtype=np.uint8)
+    else:
+        dtype = {2: "<i2", 4: "<i4"}[sample_width]
+        info = np.iinfo(dtype)
+        samples = rng.integers(info.min, info.max, nframes * channels, dtype=np.int64, endpoint=True).astype(dtype)
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(sample_width)
+        wav.setframerate(frame_rate)
+        wav.writeframes(samples.tobytes())
+
+
+def _pydub_mono(path, frame_rate=None):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        audio = AudioSegment.from_wav(path).set_channels(1)
+        if frame_rate:
+            audio = audio.set_frame_rate(frame_rate)
+        output = io.BytesIO()
+        audio.export(output, format="wav")
+    return output.getvalue()
+
+
+class TestConvertWav(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_matches_pydub(self):
+        cases = [
+            (channels, sample_width, in_rate, out_rate)
+            for channels in (1, 2, 3, 6)
+            for sample_width in (1, 2, 4)
+            for in_rate, out_rate in ((16000, None), (44100, 16000), (8000, 16000), (22050, 16000), (48000, 44100))
+        ]
+        for channels, sample_width, in_rate, out_rate in cases:
+            with self.subTest(channels=channels, sample_width=sample_width, in_rate=in_rate, out_rate=out_rate):
+                source = self.path(f"in_{channels}_{sample_width}_{in_rate}.wav")
+                _write_wav(source, channels, sample_width, in_rate, nframes=in_rate // 10 + 7)
+                output = self.path("out.wav")
+                # Small blocks, so resampling state is carried across many block boundaries
+                convert_wav(source, output, frame_rate=out_rate, block_frames=509)
+                with open(output, "rb") as file:
+                    self.assertEqual(file.read(), _pydub_mono(source, out_rate))
+
+    def test_probe_wav(self):
+        source = self.path("in.wav")
+        _write_wav(source, 1, 2, 16000, nframes=8000)
+        wav_format = probe_wav(source)
+        self.assertEqual((wav_format.channels, wav_format.sample_width, wav_format.frame_rate, wav_format.nframes),
+                         (1, 2, 16000, 8000))
+        self.assertEqual(wav_format.duration, 0.5)
+        self.assertTrue(wav_format.is_speech_ready)
+        for channels, sample_width, frame_rate in ((2, 2, 16000), (1, 1, 16000), (1, 2, 44100)):
+            with self.subTest(channels=channels, sample_width=sample_width, frame_rate=frame_rate):
+                _write_wav(source, channels, sample_width, frame_rate, nframes=100)
+                self.assertFalse(probe_wav(source).is_speech_ready)
+
+        with open(source, "wb") as file:
+            file.write(b"ID3\x03" + bytes(100))
+        with self.assertRaises(UnsupportedWavError):
+            probe_wav(source)
+
+    def test_stream_length_and_nframes(self):
+        source = self.path("in.wav")
+        _write_wav(source, 2, 2, 44100, nframes=44100 + 123)
+        stream = MonoWavStream(source, frame_rate=16000, block_frames=1000)
+        data = b"".join(stream)
+        self.assertEqual(len(data), stream.length)
+        with wave.open(io.BytesIO(data)) as wav:
+            self.assertEqual(wav.getnframes(), stream.nframes)
+            self.assertEqual(len(wav.readframes(wav.getnframes())), stream.nframes * 2)
+        self.assertEqual(probe_wav(source).nframes, 44100 + 123)
+
+    def test_truncated_file(self):
+        source, complete = self.path("in.wav"), self.path("complete.wav")
+        _write_wav(source, 2, 2, 44100, nframes=5000)
+        with open(source, "rb") as file:
+            data = file.read()
+        # Cut off part way through a frame; the header still claims all 5000
+        with open(source, "wb") as file:
+            file.write(data[:44 + 3000 * 4 + 3])
+        with wave.open(complete, "wb") as wav:
+            wav.setnchannels(2)
+            wav.setsampwidth(2)
+            wav.setframerate(44100)
+            wav.writeframes(data[44:44 + 3000 * 4])
+
+        self.assertEqual(probe_wav(source).nframes, 3000)
+        for frame_rate in (None, 16000):
+            with self.subTest(frame_rate=frame_rate), self.assertLogs(level="WARNING"):
+                stream = MonoWavStream(source, frame_rate=frame_rate, block_frames=1000)
+                converted = b"".join(stream)
+                self.assertEqual(len(converted), stream.length)
+                self.assertEqual(converted, b"".join(MonoWavStream(complete, frame_rate=frame_rate)))
+
+
+class TestResampledNframes(unittest.TestCase):
+
+    def test_matches_ratecv(self):
+        rng = np.random.default_rng(1)
+        for in_rate, out_rate in ((44100, 16000), (8000, 16000), (22050, 16000), (48000, 44100), (11025, 16000)):
+            for nframes in (0, 1, 2, 3, 159, 160, 441, 1000, 4410, 12345):
+                data = rng.integers(-1000, 1000, nframes, dtype=np.int16).tobytes()
+                with self.subTest(in_rate=in_rate, out_rate=out_rate, nframes=nframes):
+                    # ratecv is fed in uneven blocks, as iter_mono_blocks does
+                    state, produced = None, 0
+                    for offset in range(0, len(data), 2 * 377):
+                        converted, state = audioop.ratecv(data[offset:offset + 2 * 377], 2, 1, in_rate, out_rate, state)
+                        produced += len(converted) // 2
+                    self.assertEqual(resampled_nframes(nframes, in_rate, out_rate), produced)
+
+    def test_same_rate(self):
+        self.assertEqual(resampled_nframes(12345, 16000, 16000), 12345)
+
+
+if __name__ == "__main__":
+    unittest.main()
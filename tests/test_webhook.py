@@ -0,0 +1,122 @@
+import threading
+import unittest
+
+import requests
+
+from tests.speech_service import SpeechService
+from webhook import WebhookReceiver, send_webhook_event, stop_webhook_receiver
+
+SECRET = "s3cret"
+
+
+class TestWebhookReceiver(unittest.TestCase):
+
+    def setUp(self):
+        self.service = SpeechService()
+        self.service.add("abc", status="Running")
+        self.api = self.service.api()
+        self.receiver = WebhookReceiver(port=0, secret=SECRET, poll_interval=30).start()
+        self.url = f"http://127.0.0.1:{self.receiver.port}/"
+        self.result = {}
+        self.waiter = threading.Thread(target=self.wait)
+
+    def tearDown(self):
+        self.receiver.stop()
+
+    def wait(self):
+        self.result["transcription"] = self.receiver.wait_for_transcription(self.api, "abc", max_retries=2)
+
+    def checks(self):
+        return sum(1 for path, _ in self.service.requests if path == "/transcriptions/abc")
+
+    def wait_for_checks(self, count):
+        while self.checks() < count and self.waiter.is_alive():
+            threading.Event().wait(0.01)
+
+    def test_event_wakes_waiter(self):
+        self.waiter.start()
+        self.service.set_status("abc", "Succeeded")
+        send_webhook_event(self.url, "abc", secret=SECRET)
+        self.waiter.join(timeout=5)
+        self.assertFalse(self.waiter.is_alive())
+        self.assertEqual(self.result["transcription"].status, "Succeeded")
+
+    def test_invalid_signature_is_rejected(self):
+        self.waiter.start()
+        self.service.set_status("abc", "Succeeded")
+        with self.assertRaises(requests.HTTPError) as raised:
+            send_webhook_event(self.url, "abc", secret="wrong")
+        self.assertEqual(raised.exception.response.status_code, 401)
+        with self.assertRaises(requests.HTTPError):
+            send_webhook_event(self.url, "abc")
+        self.waiter.join(timeout=0.2)
+        self.assertTrue(self.waiter.is_alive())
+        # Only the check made when the waiter started
+        self.assertEqual(self.checks(), 1)
+
+        send_webhook_event(self.url, "abc", secret=SECRET)
+        self.waiter.join(timeout=5)
+        self.assertEqual(self.result["transcription"].status, "Succeeded")
+
+    def test_event_before_final_status_keeps_waiting(self):
+        self.waiter.start()
+        self.wait_for_checks(1)
+        send_webhook_event(self.url, "abc", secret=SECRET)
+        self.wait_for_checks(2)
+        self.waiter.join(timeout=0.2)
+        self.assertTrue(self.waiter.is_alive())
+
+        self.service.set_status("abc", "Failed")
+        send_webhook_event(self.url, "abc", secret=SECRET)
+        self.waiter.join(timeout=5)
+        self.assertEqual(self.result["transcription"].status, "Failed")
+        self.assertEqual(self.checks(), 3)
+
+    def test_already_finished_returns_without_an_event(self):
+        self.service.set_status("abc", "Succeeded")
+        self.waiter.start()
+        self.waiter.join(timeout=5)
+        self.assertFalse(self.waiter.is_alive())
+        self.assertEqual(self.result["transcription"].status, "Succeeded")
+        self.assertEqual(self.checks(), 1)
+
+    def test_events_without_a_waiter_are_not_kept(self):
+        for index in range(10):
+            send_webhook_event(self.url, f"other-{index}", secret=SECRET)
+        self.assertEqual(self.receiver._completions, {})
+
+    def test_polls_without_events(self):
+        self.receiver.poll_interval = 0.05
+        self.waiter.start()
+        self.wait_for_checks(2)
+        self.service.set_status("abc", "Succeeded")
+        self.waiter.join(timeout=5)
+        self.assertEqual(self.result["transcription"].status, "Succeeded")
+
+    def test_stop_deletes_the_web_hook(self):
+        self.receiver.web_hook_id = "hook-1"
+        stop_webhook_receiver(self.receiver, self.api.api_client)
+        self.assertEqual(self.service.deleted, ["/webhooks/hook-1"])
+        with self.assertRaises(requests.ConnectionError):
+            send_webhook_event(self.url, "abc", secret=SECRET)
+
+    def test_validation_handshake(self):
+        response = requests.post(self.url + "?validationToken=token-1")
+        self.assertEqual(response.text, "token-1")
+
+    def test_listens_on_localhost(self):
+        receiver = WebhookReceiver(port=0, secret=SECRET)
+        try:
+            self.assertEqual(receiver._server.server_address[0], "127.0.0.1")
+        finally:
+            receiver.stop()
+
+    def test_warns_without_secret(self):
+        with self.assertLogs(level="WARNING") as logs:
+            receiver = WebhookReceiver(port=0)
+        receiver.stop()
+        self.assertIn("NO SECRET", logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+DEFAULT_CACHE_DIR = ".transcript_cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# A staging directory older than this was left by a put that never finished, not one in progress
+STALE_STAGING_AFTER = 60 * 60
+
+CONVERSATION_FILE = "conversation.json"
+ENTRY_FILE = "entry.json"
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def _entry_size(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+class TranscriptCache:
+    """
+    Completed transcriptions on local disk, keyed by the SHA-256 fingerprint of the recording.
+
+    Each entry is a directory holding the speaker conversation JSON and a small record of
+    where the full transcript lives (transcription id and result blob). A recording that has
+    been transcribed before can then be answered from the cache, without uploading it or
+    paying for another transcription. Entries are evicted least recently used first once the
+    cache holds more than `max_bytes`; use is tracked through each entry's mtime, so recency
+    survives restarts.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        # fingerprint -> size in bytes, least recently used first
+        self._entries = OrderedDict()
+        self._size = 0
+        self._load()
+
+    def _path(self, fingerprint):
+        return os.path.join(self.directory, fingerprint)
+
+    def _load(self):
+        found = []
+        now = time.time()
+        for entry in os.scandir(self.directory):
+            if not entry.is_dir():
+                continue
+            if entry.name.startswith("."):
+                # Half-written entries (see put); those of a process that stopped mid-put are removed
+                if now - entry.stat().st_mtime > STALE_STAGING_AFTER:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                continue
+            found.append((entry.stat().st_mtime, entry.name, _entry_size(entry.path)))
+        for _, fingerprint, size in sorted(found):
+            self._entries[fingerprint] = size
+            self._size += size
+
+    def get(self, fingerprint):
+        """The entry record for `fingerprint` (a dict), marking it recently used, or None."""
+        path = self._path(fingerprint)
+        try:
+            with open(os.path.join(path, ENTRY_FILE), "r", encoding="utf-8") as file:
+                entry = json.load(file)
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            with self._lock:
+                self._size -= self._entries.pop(fingerprint, 0)
+            return None
+        with self._lock:
+            if fingerprint in self._entries:
+                self._entries.move_to_end(fingerprint)
+        entry["conversation_path"] = os.path.join(path, CONVERSATION_FILE)
+        return entry
+
+    def restore(self, fingerprint, conversation_path):
+        """Copy the cached conversation for `fingerprint` to `conversation_path` and return its entry, or None."""
+        entry = self.get(fingerprint)
+        if entry is None:
+            return None
+        os.makedirs(os.path.dirname(conversation_path) or ".", exist_ok=True)
+        try:
+            shutil.copyfile(entry["conversation_path"], conversation_path)
+        except FileNotFoundError:
+            # Evicted by another process in the meantime
+            return None
+        logging.info(f"Restored the transcript of {fingerprint[:12]} from the cache to {conversation_path}")
+        return entry
+
+    def put(self, fingerprint, conversation_path, transcription_id=None, transcript_blob=None):
+        """Cache the conversation at `conversation_path` for the recording with `fingerprint`."""
+        entry = {
+            "fingerprint": fingerprint,
+            "transcription_id": transcription_id,
+            "transcript_blob": transcript_blob,
+            "cached_at": time.time(),
+        }
+        # Written under a hidden name and renamed into place, so readers never see half an entry
+        staging = os.path.join(self.directory, f".{fingerprint}.{uuid.uuid4().hex}")
+        os.makedirs(staging)
+        try:
+            shutil.copyfile(conversation_path, os.path.join(staging, CONVERSATION_FILE))
+            with open(os.path.join(staging, ENTRY_FILE), "w", encoding="utf-8") as file:
+                json.dump(entry, file)
+            size = _entry_size(staging)
+            path = self._path(fingerprint)
+            with self._lock:
+                shutil.rmtree(path, ignore_errors=True)
+                os.replace(staging, path)
+                self._size += size - self._entries.pop(fingerprint, 0)
+                self._entries[fingerprint] = size
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        logging.info(f"Cached the transcript of {fingerprint[:12]} ({size} bytes)")
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache is within `max_bytes`."""
+        with self._lock:
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                fingerprint, size = self._entries.popitem(last=False)
+                self._size -= size
+                shutil.rmtree(self._path(fingerprint), ignore_errors=True)
+                logging.info(f"Evicted {fingerprint[:12]} from the transcript cache")
+
+    @property
+    def size(self):
+        return self._size
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, fingerprint):
+        return fingerprint in self._entries
+
+
+def open_transcript_cache(config):
+    """
+    The process-wide TranscriptCache in the config's `transcript_cache_dir`, bounded by
+    `transcript_cache_max_bytes`; None when `transcript_cache_dir` is set to an empty value.
+    """
+    directory = config.get("transcript_cache_dir", DEFAULT_CACHE_DIR)
+    if not directory:
+        return None
+    directory = os.path.abspath(directory)
+    with _caches_lock:
+        cache = _caches.get(directory)
+        if cache is None:
+            cache = _caches[directory] = TranscriptCache(
+                directory, max_bytes=config.get("transcript_cache_max_bytes", DEFAULT_MAX_BYTES)
+            )
+        return cache
@@ -0,0 +1,246 @@
+import logging
+import math
+import os
+import struct
+import wave
+from collections import namedtuple
+
+import numpy as np
+from pydub.utils import audioop
+
+# Frames read per block; memory use is bounded by this, not by the recording's duration
+BLOCK_FRAMES = 1 << 16
+
+# numpy dtype for each supported sample width. 8-bit WAV is unsigned, wider widths are signed.
+SAMPLE_DTYPES = {1: np.uint8, 2: np.dtype("<i2"), 4: np.dtype("<i4")}
+
+# What the Speech API wants: 16 kHz, mono, 16-bit PCM
+SPEECH_FRAME_RATE = 16000
+SPEECH_CHANNELS = 1
+SPEECH_SAMPLE_WIDTH = 2
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+# KSDATAFORMAT_SUBTYPE_PCM, the sub-format GUID of PCM data in an extensible fmt chunk
+_PCM_SUBFORMAT = b"\x01\x00\x00\x00\x00\x00\x10\x00\x80\x00\x00\xaa\x00\x38\x9b\x71"
+
+
+class UnsupportedWavError(ValueError):
+    """The WAV file is in a layout the streaming converter does not handle (e.g. 24-bit or extensible)."""
+
+
+class WavFormat(namedtuple("WavFormat", "format_tag channels frame_rate sample_width nframes")):
+    """Audio format of a WAV file, as read from its header by `probe_wav`."""
+
+    @property
+    def is_pcm(self):
+        return self.format_tag == WAVE_FORMAT_PCM
+
+    @property
+    def duration(self):
+        return self.nframes / self.frame_rate
+
+    @property
+    def is_speech_ready(self):
+        """Already 16 kHz mono 16-bit PCM, so it can be uploaded as is."""
+        return (self.is_pcm and self.channels == SPEECH_CHANNELS
+                and self.frame_rate == SPEECH_FRAME_RATE and self.sample_width == SPEECH_SAMPLE_WIDTH)
+
+
+def probe_wav(path):
+    """
+    Read the format of a WAV file from its RIFF header without touching the audio data.
+
+    Only the `fmt ` chunk and the `data` chunk header are read; any other chunks are seeked
+    past. `nframes` counts the frames the file actually holds, which is fewer than the header
+    says when the file is truncated. Raises UnsupportedWavError if the file is not a RIFF/WAVE file.
+    """
+    with open(path, "rb") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:] != b"WAVE":
+            raise UnsupportedWavError(f"{path}: not a RIFF/WAVE file")
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise UnsupportedWavError(f"{path}: no data chunk")
+            chunk_id, size = struct.unpack("<4sI", header)
+            if chunk_id == b"fmt ":
+                chunk = f.read(size)
+                if len(chunk) < 16:
+                    raise UnsupportedWavError(f"{path}: truncated fmt chunk")
+                format_tag, channels, frame_rate, _, block_align, bits = struct.unpack("<HHIIHH", chunk[:16])
+                if format_tag == WAVE_FORMAT_EXTENSIBLE and chunk[24:40] == _PCM_SUBFORMAT:
+                    format_tag = WAVE_FORMAT_PCM
+                fmt = (format_tag, channels, frame_rate, (bits + 7) // 8, block_align)
+                f.seek(size & 1, 1)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise UnsupportedWavError(f"{path}: data chunk before fmt chunk")
+                format_tag, channels, frame_rate, sample_width, block_align = fmt
+                size = min(size, os.fstat(f.fileno()).st_size - f.tell())
+                return WavFormat(format_tag, channels, frame_rate, sample_width, size // max(block_align, 1))
+            else:
+                # Chunks are word aligned
+                f.seek(size + (size & 1), 1)
+
+
+def downmix(data, sample_width, channels):
+    """
+    Downmix a block of interleaved PCM frames to mono, sample for sample the way pydub's
+    `set_channels(1)` does: floor of the average for stereo, sum of per-channel floor divisions
+    for more channels. 8-bit data is returned signed, as pydub holds it internally.
+    """
+    samples = np.frombuffer(data, dtype=SAMPLE_DTYPES[sample_width]).astype(np.int64)
+    if sample_width == 1:
+        samples -= 128
+    frames = samples.reshape(-1, channels)
+    if channels == 1:
+        mono = frames[:, 0]
+    elif channels == 2:
+        mono = (frames[:, 0] + frames[:, 1]) >> 1
+    else:
+        mono = (frames // channels).sum(axis=1)
+    signed_dtype = np.int8 if sample_width == 1 else SAMPLE_DTYPES[sample_width]
+    return mono.astype(signed_dtype).tobytes()
+
+
+def iter_mono_blocks(wav_file, frame_rate=None, block_frames=BLOCK_FRAMES, nframes=None):
+    """
+    Yield the mono, optionally resampled, PCM data of an open `wave` reader one block at a time,
+    stopping after `nframes` frames if given.
+
+    Resampling carries `audioop.ratecv` state across blocks, so the result matches resampling the
+    whole recording at once.
+    """
+    channels = wav_file.getnchannels()
+    sample_width = wav_file.getsampwidth()
+    in_rate = wav_file.getframerate()
+    remaining = wav_file.getnframes() if nframes is None else nframes
+    resample_state = None
+
+    while remaining > 0:
+        data = wav_file.readframes(min(block_frames, remaining))
+        if not data:
+            break
+        remaining -= len(data) // (channels * sample_width)
+        if channels == 1 and sample_width != 1:
+            mono = data
+        else:
+            mono = downmix(data, sample_width, channels)
+        if frame_rate and frame_rate != in_rate:
+            mono, resample_state = audioop.ratecv(mono, sample_width, 1, in_rate, frame_rate, resample_state)
+        if sample_width == 1:
+            # back to unsigned for the WAV file
+            mono = audioop.bias(mono, 1, 128)
+        yield mono
+
+
+def open_wav(input_file):
+    """Open `input_file` for streaming, raising UnsupportedWavError if this module cannot handle it."""
+    try:
+        wav_file = wave.open(input_file, "rb")
+    except (wave.Error, EOFError) as e:
+        raise UnsupportedWavError(f"{getattr(input_file, 'name', input_file)}: {e}")
+    if wav_file.getsampwidth() not in SAMPLE_DTYPES:
+        wav_file.close()
+        raise UnsupportedWavError(f"{getattr(input_file, 'name', input_file)}: {wav_file.getsampwidth() * 8}-bit samples")
+    return wav_file
+
+
+def stored_nframes(wav_file, f):
+    """
+    The frames `f`, just opened as `wav_file`, actually holds: the header's count, or fewer if
+    the file was cut short (e.g. a recorder that wrote the header first and then stopped).
+    """
+    frame_size = wav_file.getnchannels() * wav_file.getsampwidth()
+    available = (os.fstat(f.fileno()).st_size - f.tell()) // frame_size
+    if available < wav_file.getnframes():
+        logging.warning(f"{f.name}: header says {wav_file.getnframes()} frames but only {available} are stored")
+        return available
+    return wav_file.getnframes()
+
+
+def resampled_nframes(nframes, in_rate, out_rate):
+    """Number of frames `audioop.ratecv` produces from `nframes` input frames, however they are blocked."""
+    if nframes == 0 or in_rate == out_rate:
+        return nframes
+    divisor = math.gcd(in_rate, out_rate)
+    return (nframes - 1) * (out_rate // divisor) // (in_rate // divisor) + 1
+
+
+def wav_header(channels, sample_width, frame_rate, nframes):
+    """The 44-byte PCM WAV header the `wave` module writes for these parameters."""
+    data_length = nframes * channels * sample_width
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_length, b"WAVE",
+        b"fmt ", 16, WAVE_FORMAT_PCM, channels, frame_rate,
+        frame_rate * channels * sample_width, channels * sample_width, sample_width * 8,
+        b"data", data_length,
+    )
+
+
+class MonoWavStream:
+    """
+    The bytes of a mono (optionally resampled) copy of a PCM WAV file, produced block by block.
+
+    The output size is known up front (`length`), so the header is final before any audio is
+    converted and the stream can be handed straight to an upload without a temp file. It is
+    computed from the frames the file holds rather than from its header, so a truncated file
+    still produces exactly `length` bytes. Iterating yields the header followed by the converted
+    blocks, and closes the input at the end. Raises UnsupportedWavError on construction if the
+    file needs the pydub path instead.
+    """
+
+    def __init__(self, input_file, frame_rate=None, block_frames=BLOCK_FRAMES):
+        self.input_file = input_file
+        self.block_frames = block_frames
+        self._file = open(input_file, "rb")
+        try:
+            self._wav_in = open_wav(self._file)
+            # Read before any frames: the file is positioned at the start of the data
+            self._input_nframes = stored_nframes(self._wav_in, self._file)
+        except BaseException:
+            self._file.close()
+            raise
+        self.sample_width = self._wav_in.getsampwidth()
+        self.frame_rate = frame_rate or self._wav_in.getframerate()
+        self._resample_to = frame_rate
+        self.nframes = resampled_nframes(self._input_nframes, self._wav_in.getframerate(), self.frame_rate)
+        self.header = wav_header(1, self.sample_width, self.frame_rate, self.nframes)
+        self.length = len(self.header) + self.nframes * self.sample_width
+
+    def __iter__(self):
+        try:
+            yield self.header
+            yield from iter_mono_blocks(self._wav_in, frame_rate=self._resample_to, block_frames=self.block_frames,
+                                        nframes=self._input_nframes)
+        finally:
+            self.close()
+
+    def close(self):
+        # A reader given a file object leaves closing it to the caller
+        self._wav_in.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def convert_wav(input_file, output_file, frame_rate=None, block_frames=BLOCK_FRAMES):
+    """
+    Write a mono (and, if `frame_rate` is given, resampled) copy of a PCM WAV file block by block.
+
+    The output is byte-identical to `AudioSegment.from_wav(...).set_channels(1)
+    [.set_frame_rate(frame_rate)].export(output_file, format="wav")`, but only one block of
+    frames is held in memory at a time.
+    """
+    with MonoWavStream(input_file, frame_rate=frame_rate, block_frames=block_frames) as stream, \
+            open(output_file, "wb") as f:
+        for chunk in stream:
+            f.write(chunk)
+    logging.info(f"Streamed {input_file} to mono{f' {stream.frame_rate} Hz' if frame_rate else ''} WAV {output_file}")
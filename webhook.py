@@ -0,0 +1,237 @@
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+import swagger_client
+
+from poller import FINAL_STATUSES
+
+EVENT_HEADER = "X-MicrosoftSpeechServices-Event"
+SIGNATURE_HEADER = "X-MicrosoftSpeechServices-Signature"
+
+# Events after which a transcription will not change state again
+COMPLETION_EVENTS = ("transcriptioncompletion", "transcriptiondeletion")
+
+WEBHOOK_DISPLAY_NAME = "Transcription completion"
+
+
+def sign(secret, body):
+    """Signature the Speech service sends with each event: base64 HMAC-SHA256 of the body."""
+    digest = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+class _WebhookHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        receiver = self.server.receiver
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        # Registration handshake: echo the validation token back
+        validation_token = parse_qs(urlparse(self.path).query).get("validationToken")
+        if validation_token:
+            self._respond(200, validation_token[0])
+            return
+
+        if receiver.secret:
+            signature = self.headers.get(SIGNATURE_HEADER, "")
+            if not hmac.compare_digest(signature, sign(receiver.secret, body)):
+                logging.warning("Rejected web hook event with an invalid signature")
+                self._respond(401)
+                return
+
+        event = (self.headers.get(EVENT_HEADER) or "").lower()
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            self._respond(400)
+            return
+
+        receiver.handle_event(event, payload)
+        self._respond(200)
+
+    def _respond(self, status, text=""):
+        data = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logging.debug("Web hook receiver: " + format, *args)
+
+
+class WebhookReceiver:
+    """
+    Local HTTP endpoint the Speech service calls when a transcription changes state.
+
+    Pipeline threads block in `wait_for_transcription` on a per-transcription event instead of
+    polling `transcriptions_get` every few seconds; a completion callback wakes them up. An event
+    is only a hint: the transcription's status is checked with the Speech API, and checked again
+    every `poll_interval` seconds in case an event is lost.
+
+    The receiver listens on localhost by default, behind whatever forwards `webhook_url` to it.
+    Without a `secret` anyone who can reach it can post events.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, secret=None, poll_interval=60):
+        self.secret = secret
+        self.poll_interval = poll_interval
+        if not secret:
+            logging.warning(
+                "WEB HOOK RECEIVER HAS NO SECRET: events posted to it are not authenticated. "
+                "Set `webhook_secret` so events from anyone but the Speech service are rejected."
+            )
+        self._server = ThreadingHTTPServer((host, port), _WebhookHandler)
+        self._server.receiver = self
+        self._thread = None
+        self._lock = threading.Lock()
+        # transcription id -> threading.Event, set once a completion event arrives; only
+        # transcriptions with a waiter have one
+        self._completions = {}
+        # Set by start_webhook_receiver to the web hook registered for this receiver
+        self.web_hook_id = None
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="webhook-receiver", daemon=True)
+        self._thread.start()
+        logging.info(f"Web hook receiver listening on port {self.port}")
+        return self
+
+    def stop(self):
+        # shutdown() waits for serve_forever, so it would block on a receiver never started
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+        self._server.server_close()
+
+    def _completion(self, transcription_id):
+        with self._lock:
+            return self._completions.setdefault(transcription_id, threading.Event())
+
+    def handle_event(self, event, payload):
+        logging.info(f"Web hook event {event}: {payload.get('self')}")
+        if event in COMPLETION_EVENTS and payload.get("self"):
+            transcription_id = payload["self"].rstrip("/").split("/")[-1]
+            # Events for transcriptions nobody waits for are dropped; a waiter checks once
+            # right after it starts, so it does not miss one that arrived before it
+            with self._lock:
+                completion = self._completions.get(transcription_id)
+            if completion is not None:
+                completion.set()
+
+    def wait_for_transcription(self, api, transcription_id, max_retries=180):
+        """
+        Drop-in replacement for main_transcribe.check_transcription_status.
+
+        Waits up to the same time budget the poller would use (`max_retries` * 5 s) for the
+        transcription to reach a final state, checking its status right away, on every event and
+        at least every `poll_interval` seconds. Returns None on timeout.
+        """
+        completion = self._completion(transcription_id)
+        deadline = time.monotonic() + max_retries * 5
+        try:
+            while True:
+                # Cleared before the check, so an event arriving during it triggers another one
+                completion.clear()
+                transcription = api.transcriptions_get(transcription_id)
+                logging.info("Transcriptions status: %s", transcription.status)
+                if transcription.status in FINAL_STATUSES:
+                    return transcription
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logging.warning(f"Transcription {transcription_id} did not finish while waiting for its events")
+                    return None
+                completion.wait(timeout=min(remaining, self.poll_interval))
+        finally:
+            with self._lock:
+                self._completions.pop(transcription_id, None)
+
+
+def register_webhook(api_client, web_url, secret=None):
+    """
+    Register `web_url` for transcription completion events, reusing an existing registration
+    for the same URL. Returns the web hook id.
+    """
+    api = swagger_client.CustomSpeechWebHooksApi(api_client=api_client)
+
+    for web_hook in swagger_client.Paginator(api.web_hooks_list):
+        if web_hook.web_url == web_url:
+            web_hook_id = web_hook._self.split("/")[-1]
+            logging.info(f"Reusing web hook {web_hook_id} for {web_url}")
+            return web_hook_id
+
+    web_hook = swagger_client.WebHook(
+        web_url=web_url,
+        display_name=WEBHOOK_DISPLAY_NAME,
+        events=swagger_client.WebHookEvents(transcription_completion=True, transcription_deletion=True),
+        properties=swagger_client.WebHookProperties(secret=secret),
+    )
+    created, status, headers = api.web_hooks_create_with_http_info(web_hook)
+    web_hook_id = headers["location"].split("/")[-1]
+    logging.info(f"Registered web hook {web_hook_id} for {web_url}")
+
+    # Ask the service to call us once so a misconfigured URL shows up now, not after a batch
+    api.web_hooks_ping(web_hook_id)
+    return web_hook_id
+
+
+def start_webhook_receiver(config, api_client):
+    """
+    Start a receiver on `webhook_host`:`webhook_port` (default 127.0.0.1:8765) and register
+    `webhook_url` with the Speech service. Pair with `stop_webhook_receiver`.
+    """
+    secret = config.get("webhook_secret")
+    receiver = WebhookReceiver(
+        host=config.get("webhook_host", "127.0.0.1"), port=config.get("webhook_port", 8765), secret=secret,
+        poll_interval=config.get("webhook_poll_interval", 60),
+    ).start()
+    try:
+        receiver.web_hook_id = register_webhook(api_client, config["webhook_url"], secret=secret)
+    except Exception:
+        receiver.stop()
+        raise
+    return receiver
+
+
+def stop_webhook_receiver(receiver, api_client):
+    """Stop `receiver` and delete the web hook registered for it, so the service stops calling it."""
+    receiver.stop()
+    if receiver.web_hook_id is not None:
+        api = swagger_client.CustomSpeechWebHooksApi(api_client=api_client)
+        try:
+            api.web_hooks_delete(receiver.web_hook_id)
+            logging.info(f"Deleted web hook {receiver.web_hook_id}")
+        except swagger_client.rest.ApiException as e:
+            logging.warning(f"Could not delete web hook {receiver.web_hook_id}: {e}")
+
+
+def send_webhook_event(url, transcription_id, event="TranscriptionCompletion", secret=None,
+                       host="https://localhost/speechtotext/v3.1"):
+    """
+    Local stand-in for the Speech service: post a web hook event for `transcription_id` to `url`.
+
+    Useful for exercising a receiver without a public endpoint.
+    """
+    body = json.dumps({
+        "self": f"{host}/transcriptions/{transcription_id}",
+        "invocationId": f"local-{time.time()}",
+    }).encode("utf-8")
+    headers = {"Content-Type": "application/json", EVENT_HEADER: event}
+    if secret:
+        headers[SIGNATURE_HEADER] = sign(secret, body)
+    response = requests.post(url, data=body, headers=headers)
+    response.raise_for_status()
+    return response